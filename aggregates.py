@@ -0,0 +1,216 @@
+"""AI Health Copilot - Incrementally maintained dashboard aggregates
+
+Every completed assessment updates a handful of counters (risk level per
+assessment type, age group), hourly and daily rolling windows and, for the ML
+models, one mergeable quantile sketch per input feature. The Health Dashboard
+only reads these materialized numbers, so its cost is independent of how many
+assessments have been recorded.
+"""
+
+import math
+import time
+from collections import Counter
+
+import numpy as np
+
+RISK_LEVELS = ("Low", "Moderate", "High")
+AGE_GROUPS = ("18-30", "31-45", "46-60", "60+")
+AGE_EDGES = (31, 46, 61)  # lower bounds of every group but the first
+KINDS = ('general', 'heart', 'diabetes', 'parkinsons', 'tips')
+
+
+def age_group(age):
+    return AGE_GROUPS[int(np.searchsorted(AGE_EDGES, age, side='right'))]
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch (DDSketch-style logarithmic buckets)
+
+    Any quantile estimate is within `relative_accuracy` of the true value, the
+    bucket count grows only with the logarithm of the value range, and two
+    sketches merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.positive = Counter()
+        self.negative = Counter()
+        self.zero = 0
+        self.count = 0
+
+    def _indices(self, values):
+        return np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+
+    def _value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        for store, selected in ((self.positive, values[values > self.min_value]),
+                                (self.negative, -values[values < -self.min_value])):
+            if len(selected):
+                indices, counts = np.unique(self._indices(selected), return_counts=True)
+                store.update(dict(zip(indices.tolist(), counts.tolist())))
+        self.zero += int((np.abs(values) <= self.min_value).sum())
+        self.count += len(values)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zero += other.zero
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+
+    def to_counts(self):
+        """Bucket counts as a flat {field: count} hash, e.g. for a shared_state backend"""
+        counts = {f"+{index}": n for index, n in self.positive.items()}
+        counts.update({f"-{index}": n for index, n in self.negative.items()})
+        counts.update({'zero': self.zero, 'count': self.count})
+        return counts
+
+    @classmethod
+    def from_counts(cls, counts, relative_accuracy=0.01, min_value=1e-6):
+        sketch = cls(relative_accuracy, min_value)
+        for field, n in counts.items():
+            if field[0] == '+':
+                sketch.positive[int(field[1:])] = int(n)
+            elif field[0] == '-':
+                sketch.negative[int(field[1:])] = int(n)
+        sketch.zero, sketch.count = int(counts.get('zero', 0)), int(counts.get('count', 0))
+        return sketch
+
+
+class RollingWindow:
+    """Fixed-length time buckets; each bucket is one counter hash that expires with the window"""
+
+    def __init__(self, name, bucket_seconds, buckets):
+        self.name = name
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+
+    @property
+    def ttl(self):
+        return self.bucket_seconds * (self.buckets + 1)
+
+    def key(self, bucket):
+        return f"agg:{self.name}:{bucket}"
+
+    def current(self, now=None):
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def window(self, now=None):
+        """Bucket numbers of the whole window, oldest first"""
+        current = self.current(now)
+        return list(range(current - self.buckets + 1, current + 1))
+
+
+class DashboardAggregates:
+    """Materialized statistics behind the Health Dashboard
+
+    Counters live in a shared_state backend: in-process by default, or shared by
+    every replica so each dashboard shows the totals of the whole deployment.
+    Training data sketches are computed locally (every replica has the data).
+    """
+
+    def __init__(self, datasets=None, backend=None):
+        if backend is None:
+            from shared_state import MemoryBackend
+            backend = MemoryBackend()
+        self.backend = backend
+        self.hourly = RollingWindow('hourly', 3600, 24)
+        self.daily = RollingWindow('daily', 86400, 30)
+        self.reference = {}  # condition -> training data summary, computed once
+        for condition, (X, y) in (datasets or {}).items():
+            self.reference[condition] = {
+                'rows': len(X),
+                'positive_rate': float(np.mean(y)),
+                'features': {feature: self._sketch(X[feature].to_numpy(dtype=float)) for feature in X.columns}
+            }
+
+    @staticmethod
+    def _sketch(values):
+        sketch = QuantileSketch()
+        sketch.add(values)
+        return sketch
+
+    def _windows(self, kind, n, now):
+        return [(window.key(window.current(now)), {kind: n}, window.ttl) for window in (self.hourly, self.daily)]
+
+    def record(self, kind, level=None, age=None, now=None):
+        """Fold one completed assessment into the counters"""
+        updates = [(f"agg:levels:{kind}", {level or "Unrated": 1}, None)] + self._windows(kind, 1, now)
+        if age is not None:
+            updates.append(("agg:age_groups", {age if isinstance(age, str) else age_group(age): 1}, None))
+        self.backend.increment(updates)
+
+    def record_levels(self, kind, counts, now=None):
+        """Fold a batch of already-counted results (e.g. a scored cohort file)"""
+        counts = {level: n for level, n in counts.items() if n}
+        if counts:
+            self.backend.increment([(f"agg:levels:{kind}", counts, None)]
+                                   + self._windows(kind, sum(counts.values()), now))
+
+    def observe(self, condition, X):
+        """Add scored model inputs (columns in training data order) to the per-feature sketches"""
+        if condition not in self.reference:
+            return
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        self.backend.increment([(f"agg:sketch:{condition}:{feature}", self._sketch(X[:, j]).to_counts(), None)
+                                for j, feature in enumerate(self.reference[condition]['features'])])
+
+    def snapshot(self, now=None):
+        """Every counter the dashboard shows, read in one batch; cost does not depend on history size"""
+        hours, days = self.hourly.window(now), self.daily.window(now)
+        level_keys = [f"agg:levels:{kind}" for kind in KINDS]
+        found = self.backend.counters(level_keys + ["agg:age_groups"]
+                                      + [self.hourly.key(b) for b in hours] + [self.daily.key(b) for b in days])
+
+        def as_ints(counts):
+            return Counter({field: int(n) for field, n in counts.items()})
+
+        return {
+            'levels': {kind: as_ints(found[key]) for kind, key in zip(KINDS, level_keys)},
+            'age_groups': as_ints(found["agg:age_groups"]),
+            'hourly': [(b * self.hourly.bucket_seconds, as_ints(found[self.hourly.key(b)])) for b in hours],
+            'daily': [(b * self.daily.bucket_seconds, as_ints(found[self.daily.key(b)])) for b in days]
+        }
+
+    def feature_quantiles(self, condition, quantiles=(0.1, 0.5, 0.9)):
+        """Rows of live vs training quantiles per feature of one model"""
+        reference = self.reference.get(condition, {}).get('features', {})
+        keys = {feature: f"agg:sketch:{condition}:{feature}" for feature in reference}
+        found = self.backend.counters(keys.values())
+        rows = []
+        for feature, sketch in reference.items():
+            live = QuantileSketch.from_counts(found[keys[feature]])
+            row = {'feature': feature, 'live_n': live.count}
+            for q in quantiles:
+                label = f"p{int(q * 100)}"
+                row[f'{label} (training)'] = sketch.quantile(q)
+                row[f'{label} (live)'] = live.quantile(q)
+            rows.append(row)
+        return rows
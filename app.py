@@ -1,16 +1,8 @@
+import importlib
+
 import streamlit as st
-import requests
-import json
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+
+from app_common import profile_run, session_memory_budget, sweep_result_files
 
 # Page Configuration
 st.set_page_config(
@@ -20,6 +12,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Remove scored files earlier workers left behind (cached: once per process)
+sweep_result_files()
+
 # Custom CSS for Professional UI
 st.markdown("""
 <style>
@@ -143,215 +138,23 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
-# Silent API Configuration (Hidden from UI)
-def get_api_key():
-    """Silently get API key without showing configuration"""
-    try:
-        return st.secrets.get("OPENROUTER_API_KEY", "")
-    except:
-        return ""
-
-API_KEY = get_api_key()
-
-# Enhanced AI Response Function (Silent)
-def get_health_insights(prompt, health_data=None):
-    """Get health insights with silent fallback"""
-    
-    # Try API silently
-    if API_KEY and len(API_KEY) > 20:
-        try:
-            headers = {
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://ai-health-copilot.streamlit.app",
-                "X-Title": "AI Healthcare Copilot"
-            }
-            
-            payload = {
-                "model": "qwen/qwq-32b:free",
-                "messages": [
-                    {"role": "system", "content": "You are an expert health advisor providing evidence-based recommendations. Always remind users to consult healthcare professionals."},
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 350,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=25
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return "🤖 " + result['choices'][0]['message']['content'].strip()
-                
-        except:
-            pass
-    
-    # Smart Evidence-Based Fallback
-    return generate_evidence_based_advice(health_data)
-
-def generate_evidence_based_advice(health_data):
-    """Generate professional evidence-based health advice"""
-    if not health_data:
-        return "🏥 **Professional Health Guidance:** Based on medical evidence and clinical guidelines, maintaining a balanced lifestyle with regular exercise, proper nutrition, adequate sleep, and stress management forms the foundation of optimal health."
-    
-    risk_level = health_data.get('risk_level', 'moderate').lower()
-    
-    if risk_level == 'low':
-        return """🌟 **Excellent Health Status**
-
-**Continue Your Success:** Your health indicators are outstanding! 
-
-**Optimization Strategies:**
-- **Fitness Enhancement:** Maintain 150+ minutes moderate aerobic activity weekly
-- **Nutritional Excellence:** Continue balanced diet with 5-9 servings fruits/vegetables daily  
-- **Mental Wellness:** Practice stress management techniques 10-15 minutes daily
-- **Preventive Care:** Annual health screenings to maintain optimal status
-
-**Evidence:** Studies show individuals with your health profile have 40% lower risk of chronic diseases."""
-    
-    elif risk_level == 'moderate':
-        return """⚡ **Health Improvement Opportunity**
-
-**Priority Actions Required:**
-
-**Immediate Steps (Next 30 Days):**
-- **Nutrition Upgrade:** Increase vegetable intake to 5-7 servings daily, reduce processed foods 50%
-- **Activity Boost:** Begin with 30-minute daily walks, progress to structured exercise routine
-- **Sleep Optimization:** Establish consistent 7-9 hour sleep schedule with proper hygiene
-
-**Clinical Evidence:** These modifications can reduce health risks by 25-40% within 3-6 months."""
-    
-    else:  # high risk
-        return """🚨 **Immediate Health Action Plan**
-
-**Critical Steps:**
-- **Medical Consultation:** Schedule comprehensive health evaluation within 1-2 weeks
-- **Daily Monitoring:** Track vital signs (blood pressure, weight, symptoms) using health apps
-- **Medication Compliance:** Follow all prescribed treatments precisely
-- **Emergency Preparedness:** Know warning signs requiring immediate medical attention
-
-**Support Resources:** Lifestyle modification programs, dietary counseling, and supervised exercise programs available."""
-
-# ML Models with Caching
-@st.cache_data
-def load_health_datasets():
-    """Load and prepare health datasets"""
-    try:
-        # Create sample data if CSV files don't exist
-        datasets = {}
-        
-        # Diabetes Dataset (PIMA Indians Diabetes)
-        try:
-            diabetes_data = pd.read_csv('diabetes.csv')
-        except:
-            # Sample diabetes data if file not found
-            np.random.seed(42)
-            n_samples = 768
-            diabetes_data = pd.DataFrame({
-                'Pregnancies': np.random.randint(0, 15, n_samples),
-                'Glucose': np.random.normal(120, 30, n_samples),
-                'BloodPressure': np.random.normal(80, 15, n_samples),
-                'SkinThickness': np.random.normal(25, 10, n_samples),
-                'Insulin': np.random.normal(100, 80, n_samples),
-                'BMI': np.random.normal(28, 7, n_samples),
-                'DiabetesPedigreeFunction': np.random.exponential(0.5, n_samples),
-                'Age': np.random.randint(18, 80, n_samples)
-            })
-            # Create outcome based on risk factors
-            risk_score = (
-                (diabetes_data['Glucose'] > 140) * 2 +
-                (diabetes_data['BMI'] > 30) * 2 +
-                (diabetes_data['Age'] > 50) * 1 +
-                (diabetes_data['BloodPressure'] > 90) * 1
-            )
-            diabetes_data['Outcome'] = (risk_score >= 3).astype(int)
-        
-        diabetes_X = diabetes_data.drop('Outcome', axis=1)
-        diabetes_y = diabetes_data['Outcome']
-        datasets['diabetes'] = (diabetes_X, diabetes_y)
-        
-        # Heart Disease Dataset
-        try:
-            heart_data = pd.read_csv('heart.csv')
-        except:
-            # Sample heart data
-            n_samples = 303
-            heart_data = pd.DataFrame({
-                'age': np.random.randint(25, 80, n_samples),
-                'sex': np.random.randint(0, 2, n_samples),
-                'cp': np.random.randint(0, 4, n_samples),
-                'trestbps': np.random.normal(130, 20, n_samples),
-                'chol': np.random.normal(220, 50, n_samples),
-                'fbs': np.random.randint(0, 2, n_samples),
-                'restecg': np.random.randint(0, 3, n_samples),
-                'thalach': np.random.normal(150, 25, n_samples),
-                'exang': np.random.randint(0, 2, n_samples),
-                'oldpeak': np.random.exponential(1, n_samples),
-                'slope': np.random.randint(0, 3, n_samples),
-                'ca': np.random.randint(0, 4, n_samples),
-                'thal': np.random.randint(1, 4, n_samples)
-            })
-            # Create target based on risk factors
-            risk_score = (
-                (heart_data['age'] > 55) * 2 +
-                (heart_data['cp'] == 0) * 2 +
-                (heart_data['trestbps'] > 140) * 1 +
-                (heart_data['chol'] > 240) * 1 +
-                (heart_data['thalach'] < 120) * 2
-            )
-            heart_data['target'] = (risk_score >= 4).astype(int)
-        
-        heart_X = heart_data.drop('target', axis=1)
-        heart_y = heart_data['target']
-        datasets['heart'] = (heart_X, heart_y)
-        
-        return datasets
-    except Exception as e:
-        st.error(f"Error loading datasets: {str(e)}")
-        return None
-
-@st.cache_resource
-def train_ml_models():
-    """Train and cache ML models"""
-    data = load_health_datasets()
-    if not data:
-        return None
-    
-    models = {}
-    
-    try:
-        # Diabetes Model
-        X_diabetes, y_diabetes = data['diabetes']
-        diabetes_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        diabetes_model.fit(X_diabetes, y_diabetes)
-        models['diabetes'] = (diabetes_model, X_diabetes.columns.tolist())
-        
-        # Heart Disease Model
-        X_heart, y_heart = data['heart']
-        heart_model = LogisticRegression(random_state=42, max_iter=1000)
-        heart_model.fit(X_heart, y_heart)
-        models['heart'] = (heart_model, X_heart.columns.tolist())
-        
-        return models
-    except Exception as e:
-        st.error(f"Error training models: {str(e)}")
-        return None
-
-# Navigation
+# Navigation: each page lives in its own module, imported on first visit, so a
+# process only pays for the libraries of the pages actually used
+PAGES = {
+    "🩺 General Health Analysis": "page_general",
+    "❤️ Heart Disease Prediction": "page_heart",
+    "🧬 Diabetes Risk Assessment": "page_diabetes",
+    "🎙️ Parkinson's Voice Screening": "page_parkinsons",
+    "💡 Smart Health Tips": "page_tips",
+    "📋 Cohort Screening": "page_cohort",
+    "📊 Health Dashboard": "page_dashboard"
+}
 page = st.sidebar.selectbox(
     "Select Health Assessment",
-    ["🩺 General Health Analysis", "❤️ Heart Disease Prediction", "🧬 Diabetes Risk Assessment", "💡 Smart Health Tips", "📊 Health Dashboard"],
+    list(PAGES),
     key="navigation"
 )
 
-# Load models
-models = train_ml_models()
-
 # Add feature highlights in sidebar
 st.sidebar.markdown("""
 <div style="margin-top: 2rem;">
@@ -363,1077 +166,8 @@ st.sidebar.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-if page == "🩺 General Health Analysis":
-    st.markdown("### 🩺 Comprehensive Health Risk Assessment")
-    st.markdown("*Complete lifestyle and health factor analysis*")
-    
-    with st.form("health_assessment"):
-        st.markdown("#### 📋 Personal & Lifestyle Information")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**👤 Personal Details**")
-            age = st.number_input("Age", 18, 100, 35, help="Your current age")
-            gender = st.selectbox("Gender", ["Male", "Female"], help="Biological sex")
-            height = st.number_input("Height (cm)", 140, 220, 170, help="Height in centimeters")
-            weight = st.number_input("Weight (kg)", 40, 200, 70, help="Current weight in kilograms")
-            
-        with col2:
-            st.markdown("**🏃‍♂️ Lifestyle Factors**")
-            exercise = st.selectbox("Exercise Frequency", 
-                ["Daily", "4-6x/week", "2-3x/week", "1x/week", "Never"],
-                help="How often do you exercise?")
-            diet = st.selectbox("Diet Quality", 
-                ["Excellent", "Good", "Fair", "Poor"],
-                help="Overall quality of your diet")
-            sleep = st.selectbox("Sleep Hours/Night", 
-                ["8-9", "7-8", "6-7", "5-6", "<5"],
-                help="Average sleep duration")
-            stress = st.selectbox("Stress Level", 
-                ["Low", "Moderate", "High", "Very High"],
-                help="Your typical stress level")
-        
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown("**🚭 Health Habits**")
-            smoking = st.selectbox("Smoking Status", 
-                ["Never", "Former (>2yr)", "Former (<2yr)", "Current"],
-                help="Smoking history")
-            alcohol = st.selectbox("Alcohol Consumption", 
-                ["None", "Light (1-3/week)", "Moderate (4-10/week)", "Heavy (>10/week)"],
-                help="Alcohol consumption pattern")
-            
-        with col4:
-            st.markdown("**🧬 Health History**")
-            family_history = st.multiselect("Family History", 
-                ["Diabetes", "Heart Disease", "Cancer", "Hypertension", "Stroke"],
-                help="Family history of chronic diseases")
-            symptoms = st.multiselect("Current Symptoms", 
-                ["Fatigue", "Chest Pain", "Shortness of Breath", "Headaches", "Joint Pain", "None"],
-                help="Any current health symptoms")
-        
-        submitted = st.form_submit_button("🔍 Analyze Health Status", use_container_width=True)
-        
-        if submitted:
-            # Calculate BMI
-            bmi = weight / ((height/100) ** 2)
-            
-            # Advanced Risk Scoring Algorithm
-            risk_score = 0
-            risk_factors = []
-            
-            # Age factor
-            if age > 65: 
-                risk_score += 3
-                risk_factors.append("Advanced age")
-            elif age > 50: 
-                risk_score += 2
-                risk_factors.append("Middle age")
-            elif age > 35: 
-                risk_score += 1
-            
-            # BMI factor
-            if bmi < 18.5: 
-                risk_score += 2
-                risk_factors.append("Underweight")
-            elif bmi > 30: 
-                risk_score += 3
-                risk_factors.append("Obesity")
-            elif bmi > 25: 
-                risk_score += 1
-                risk_factors.append("Overweight")
-            
-            # Lifestyle factors with detailed scoring
-            exercise_scores = {"Never": 3, "1x/week": 2, "2-3x/week": 1, "4-6x/week": 0, "Daily": -1}
-            exercise_score = exercise_scores[exercise]
-            risk_score += max(0, exercise_score)
-            if exercise_score > 1:
-                risk_factors.append("Sedentary lifestyle")
-            
-            diet_scores = {"Poor": 2, "Fair": 1, "Good": 0, "Excellent": -1}
-            diet_score = diet_scores[diet]
-            risk_score += max(0, diet_score)
-            if diet_score > 0:
-                risk_factors.append("Poor nutrition")
-            
-            sleep_scores = {"<5": 3, "5-6": 2, "6-7": 1, "7-8": 0, "8-9": 0}
-            sleep_score = sleep_scores[sleep]
-            risk_score += sleep_score
-            if sleep_score > 1:
-                risk_factors.append("Sleep deprivation")
-            
-            stress_scores = {"Very High": 2, "High": 1, "Moderate": 0, "Low": 0}
-            stress_score = stress_scores[stress]
-            risk_score += stress_score
-            if stress_score > 0:
-                risk_factors.append("Elevated stress")
-            
-            smoking_scores = {"Current": 3, "Former (<2yr)": 2, "Former (>2yr)": 1, "Never": 0}
-            smoking_score = smoking_scores[smoking]
-            risk_score += smoking_score
-            if smoking_score > 0:
-                risk_factors.append("Smoking history")
-            
-            alcohol_scores = {"Heavy (>10/week)": 2, "Moderate (4-10/week)": 1, "Light (1-3/week)": 0, "None": 0}
-            alcohol_score = alcohol_scores[alcohol]
-            risk_score += alcohol_score
-            if alcohol_score > 0:
-                risk_factors.append("Heavy drinking")
-            
-            # Family history and symptoms
-            family_score = len(family_history)
-            risk_score += family_score
-            if family_score > 0:
-                risk_factors.append("Genetic predisposition")
-            
-            symptom_score = len([s for s in symptoms if s != "None"])
-            risk_score += symptom_score
-            if symptom_score > 0:
-                risk_factors.append("Active symptoms")
-            
-            # Cap risk score
-            risk_score = max(0, min(risk_score, 10))
-            
-            # Risk level classification
-            if risk_score <= 3:
-                risk_level, status_class, icon = "Low", "success", "✅"
-            elif risk_score <= 6:
-                risk_level, status_class, icon = "Moderate", "warning", "⚠️"
-            else:
-                risk_level, status_class, icon = "High", "error", "🚨"
-            
-            # BMI Category
-            if bmi < 18.5:
-                bmi_category = "Underweight"
-            elif bmi < 25:
-                bmi_category = "Normal"
-            elif bmi < 30:
-                bmi_category = "Overweight"
-            else:
-                bmi_category = "Obese"
-            
-            # Display Results Section
-            st.markdown("### 📊 Health Assessment Results")
-            
-            # Metrics Row
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea; margin: 0;">🎯 Risk Score</h3>
-                    <h2 style="margin: 0.5rem 0;">{risk_score}/10</h2>
-                    <p style="margin: 0; color: #7f8c8d;">Overall Health Risk</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea; margin: 0;">📊 BMI</h3>
-                    <h2 style="margin: 0.5rem 0;">{bmi:.1f}</h2>
-                    <p style="margin: 0; color: #7f8c8d;">{bmi_category}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea; margin: 0;">⚖️ Risk Level</h3>
-                    <h2 style="margin: 0.5rem 0;">{risk_level}</h2>
-                    <p style="margin: 0; color: #7f8c8d;">Health Status</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col4:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea; margin: 0;">👤 Profile</h3>
-                    <h2 style="margin: 0.5rem 0;">{age}yr</h2>
-                    <p style="margin: 0; color: #7f8c8d;">{gender}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Status Display
-            if status_class == "success":
-                st.markdown(f"""
-                <div class="success-box">
-                    <h3>{icon} <strong>{risk_level} Risk</strong> - Excellent Health Indicators!</h3>
-                    <p>Your health profile shows outstanding indicators. Continue maintaining your healthy lifestyle patterns.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif status_class == "warning":
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h3>{icon} <strong>{risk_level} Risk</strong> - Room for Improvement</h3>
-                    <p>Your health profile shows some areas that could benefit from lifestyle modifications.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="error-box">
-                    <h3>{icon} <strong>{risk_level} Risk</strong> - Action Required</h3>
-                    <p>Your health profile indicates several risk factors that need attention. Consider consulting healthcare professionals.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Factors Analysis
-            if risk_factors:
-                st.markdown("#### 🔍 Risk Factors Identified")
-                risk_factor_text = " • ".join(risk_factors)
-                st.markdown(f"""
-                <div class="info-box">
-                    <strong>Key Areas for Attention:</strong><br>
-                    • {risk_factor_text.replace(' • ', '<br>• ')}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Visual Risk Gauge
-            fig = go.Figure(go.Indicator(
-                mode = "gauge+number+delta",
-                value = risk_score,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "Health Risk Assessment", 'font_size': 20},
-                delta = {'reference': 5},
-                gauge = {
-                    'axis': {'range': [None, 10], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 3], 'color': "lightgreen"},
-                        {'range': [3, 6], 'color': "yellow"},
-                        {'range': [6, 10], 'color': "red"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 8
-                    }
-                }
-            ))
-            fig.update_layout(height=350, font={'color': "darkblue", 'family': "Arial"})
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Health Insights
-            health_data = {
-                'risk_level': risk_level.lower(),
-                'age': age,
-                'bmi': bmi,
-                'exercise': exercise,
-                'diet': diet,
-                'sleep': sleep,
-                'risk_factors': risk_factors
-            }
-            
-            with st.spinner("🤖 Generating personalized health insights..."):
-                prompt = f"""Health Assessment Analysis:
-                Patient Profile: {age}-year-old {gender}, BMI {bmi:.1f} ({bmi_category})
-                Risk Assessment: {risk_level} risk (Score: {risk_score}/10)
-                Lifestyle: Exercise {exercise}, Diet {diet}, Sleep {sleep}
-                Risk Factors: {', '.join(risk_factors) if risk_factors else 'None identified'}
-                Family History: {', '.join(family_history) if family_history else 'None reported'}
-                
-                Provide comprehensive health recommendations with 4 specific actionable steps."""
-                
-                insights = get_health_insights(prompt, health_data)
-                
-                st.markdown("### 🤖 Personalized Health Insights")
-                st.markdown(f"""
-                <div class="prediction-card">
-                    <div style="font-size: 1.1rem; line-height: 1.6;">
-                        {insights}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-elif page == "❤️ Heart Disease Prediction" and models:
-    st.markdown("### ❤️ Cardiovascular Risk Prediction")
-    st.markdown("*Advanced ML analysis using clinical parameters*")
-    
-    with st.form("heart_prediction"):
-        st.markdown("#### 🫀 Clinical Assessment Parameters")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**📊 Vital Signs & Demographics**")
-            age = st.number_input("Age", 20, 100, 50, help="Patient age in years")
-            sex = st.selectbox("Sex", ["Male", "Female"], help="Biological sex")
-            trestbps = st.number_input("Resting Blood Pressure (mmHg)", 80, 200, 120, help="Blood pressure at rest")
-            chol = st.number_input("Serum Cholesterol (mg/dL)", 100, 400, 200, help="Total cholesterol level")
-            thalach = st.number_input("Maximum Heart Rate Achieved", 60, 220, 150, help="Peak heart rate during exercise")
-            
-        with col2:
-            st.markdown("**🩺 Clinical Indicators**")
-            cp = st.selectbox("Chest Pain Type", 
-                ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"],
-                help="Type of chest pain experienced")
-            fbs = st.selectbox("Fasting Blood Sugar > 120 mg/dL", 
-                ["No", "Yes"], help="Elevated fasting glucose")
-            restecg = st.selectbox("Resting ECG Results", 
-                ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"],
-                help="Electrocardiogram findings")
-            exang = st.selectbox("Exercise Induced Angina", 
-                ["No", "Yes"], help="Chest pain during exercise")
-            oldpeak = st.number_input("ST Depression Induced by Exercise", 
-                0.0, 6.0, 1.0, 0.1, help="ST segment depression")
-        
-        col3, col4 = st.columns(2)
-        with col3:
-            slope = st.selectbox("Slope of Peak Exercise ST Segment", 
-                ["Upsloping", "Flat", "Downsloping"],
-                help="ST segment slope pattern")
-            ca = st.selectbox("Number of Major Vessels Colored by Fluoroscopy", 
-                [0, 1, 2, 3], help="Coronary angiography results")
-        with col4:
-            thal = st.selectbox("Thalassemia Type", 
-                ["Normal", "Fixed Defect", "Reversible Defect"],
-                help="Thallium stress test results")
-        
-        submitted = st.form_submit_button("🔬 Predict Heart Disease Risk", use_container_width=True)
-        
-        if submitted:
-            # Prepare input data for model
-            input_data = np.array([[
-                age,
-                1 if sex == "Male" else 0,
-                ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"].index(cp),
-                trestbps,
-                chol,
-                1 if fbs == "Yes" else 0,
-                ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"].index(restecg),
-                thalach,
-                1 if exang == "Yes" else 0,
-                oldpeak,
-                ["Upsloping", "Flat", "Downsloping"].index(slope),
-                ca,
-                ["Normal", "Fixed Defect", "Reversible Defect"].index(thal) + 1
-            ]])
-            
-            # Make prediction
-            model, features = models['heart']
-            prediction = model.predict(input_data)[0]
-            probability = model.predict_proba(input_data)[0]
-            
-            # Calculate risk category
-            risk_prob = probability[1] * 100
-            if risk_prob < 30:
-                risk_category = "Low Risk"
-                risk_color = "green"
-                risk_icon = "✅"
-            elif risk_prob < 70:
-                risk_category = "Moderate Risk"
-                risk_color = "orange"
-                risk_icon = "⚠️"
-            else:
-                risk_category = "High Risk"
-                risk_color = "red"
-                risk_icon = "🚨"
-            
-            # Display Results
-            st.markdown("### 📊 Cardiovascular Risk Assessment Results")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">🫀 Prediction</h3>
-                    <h2 style="color: {risk_color};">{risk_category}</h2>
-                    <p>ML Model Assessment</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">📊 Risk Probability</h3>
-                    <h2>{risk_prob:.1f}%</h2>
-                    <p>Heart Disease Likelihood</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">🎯 Confidence</h3>
-                    <h2>{max(probability)*100:.1f}%</h2>
-                    <p>Model Certainty</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Status Display
-            if prediction == 1:
-                st.markdown(f"""
-                <div class="error-box">
-                    <h3>{risk_icon} <strong>Elevated Heart Disease Risk Detected</strong></h3>
-                    <p>The ML model indicates increased cardiovascular risk based on your clinical parameters. 
-                    Immediate consultation with a cardiologist is recommended for comprehensive evaluation.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="success-box">
-                    <h3>{risk_icon} <strong>Low Heart Disease Risk</strong></h3>
-                    <p>The analysis suggests lower cardiovascular risk. Continue maintaining heart-healthy lifestyle habits 
-                    and regular medical check-ups.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Probability Visualization
-            fig = px.bar(
-                x=['Low Risk', 'High Risk'],
-                y=[probability[0]*100, probability[1]*100],
-                title="Heart Disease Risk Probability Distribution",
-                labels={'x': 'Risk Category', 'y': 'Probability (%)'},
-                color=['Low Risk', 'High Risk'],
-                color_discrete_map={'Low Risk': '#27ae60', 'High Risk': '#e74c3c'}
-            )
-            fig.update_layout(
-                height=400, 
-                showlegend=False,
-                title_font_size=16,
-                font_family="Arial"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Clinical Parameter Analysis
-            st.markdown("#### 🔍 Clinical Parameter Analysis")
-            
-            # Key risk factors identification
-            risk_factors = []
-            if age > 55: risk_factors.append(f"Advanced age ({age} years)")
-            if trestbps > 140: risk_factors.append(f"Elevated blood pressure ({trestbps} mmHg)")
-            if chol > 240: risk_factors.append(f"High cholesterol ({chol} mg/dL)")
-            if cp == "Typical Angina": risk_factors.append("Typical angina symptoms")
-            if exang == "Yes": risk_factors.append("Exercise-induced angina")
-            if thalach < 120: risk_factors.append(f"Reduced max heart rate ({thalach} bpm)")
-            
-            if risk_factors:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <strong>🔍 Key Risk Factors Identified:</strong><br>
-                    • {('<br>• ').join(risk_factors)}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # AI Heart Health Recommendations
-            health_data = {
-                'risk_level': 'high' if prediction == 1 else 'low', 
-                'heart_risk': probability[1],
-                'age': age,
-                'bp': trestbps,
-                'cholesterol': chol
-            }
-            
-            with st.spinner("🤖 Generating cardiovascular health recommendations..."):
-                prompt = f"""Cardiovascular Risk Analysis:
-                Assessment: {risk_category} ({risk_prob:.1f}% probability)
-                Patient: {age}-year-old {sex}
-                Clinical: BP {trestbps}, Cholesterol {chol}, Max HR {thalach}
-                Symptoms: {cp}, Exercise angina: {exang}
-                Risk factors: {', '.join(risk_factors) if risk_factors else 'None major'}
-                
-                Provide specific cardiovascular health recommendations and lifestyle modifications."""
-                
-                heart_advice = get_health_insights(prompt, health_data)
-                
-                st.markdown("### 🩺 Cardiovascular Health Recommendations")
-                st.markdown(f"""
-                <div class="prediction-card">
-                    <div style="font-size: 1.1rem; line-height: 1.6;">
-                        {heart_advice}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-elif page == "🧬 Diabetes Risk Assessment" and models:
-    st.markdown("### 🧬 Diabetes Risk Prediction")
-    st.markdown("*Advanced metabolic analysis using clinical indicators*")
-    
-    with st.form("diabetes_prediction"):
-        st.markdown("#### 🩸 Metabolic Assessment Parameters")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🤰 Medical History**")
-            pregnancies = st.number_input("Number of Pregnancies", 0, 15, 0, 
-                help="Total number of pregnancies (0 for males)")
-            age = st.number_input("Age", 18, 100, 35, help="Current age in years")
-            bmi = st.number_input("Body Mass Index (BMI)", 15.0, 50.0, 25.0, 0.1,
-                help="BMI = weight(kg) / height(m)²")
-            dpf = st.number_input("Diabetes Pedigree Function", 0.0, 3.0, 0.5, 0.01,
-                help="Genetic diabetes risk factor (family history score)")
-            
-        with col2:
-            st.markdown("**🩸 Laboratory Results**")
-            glucose = st.number_input("Plasma Glucose Concentration (mg/dL)", 50, 300, 120,
-                help="2-hour oral glucose tolerance test result")
-            bp = st.number_input("Diastolic Blood Pressure (mmHg)", 40, 200, 80,
-                help="Diastolic blood pressure measurement")
-            skin = st.number_input("Triceps Skin Fold Thickness (mm)", 0, 100, 20,
-                help="Measure of body fat distribution")
-            insulin = st.number_input("2-Hour Serum Insulin (μU/mL)", 0, 900, 80,
-                help="Insulin level after glucose challenge")
-        
-        # BMI Helper
-        st.markdown("#### 📏 BMI Calculator Helper")
-        col3, col4 = st.columns(2)
-        with col3:
-            height_cm = st.number_input("Height (cm)", 140, 220, 170, help="For BMI calculation")
-        with col4:
-            weight_kg = st.number_input("Weight (kg)", 40, 200, 70, help="For BMI calculation")
-            calculated_bmi = weight_kg / ((height_cm/100) ** 2)
-            st.info(f"Calculated BMI: {calculated_bmi:.1f}")
-        
-        submitted = st.form_submit_button("🔬 Analyze Diabetes Risk", use_container_width=True)
-        
-        if submitted:
-            # Use calculated BMI if not manually entered
-            if bmi == 25.0:  # Default value
-                bmi = calculated_bmi
-            
-            # Prepare input for model
-            input_data = np.array([[pregnancies, glucose, bp, skin, insulin, bmi, dpf, age]])
-            
-            # Make prediction
-            model, features = models['diabetes']
-            prediction = model.predict(input_data)[0]
-            probability = model.predict_proba(input_data)[0]
-            
-            # Risk categorization
-            risk_prob = probability[1] * 100
-            if risk_prob < 25:
-                risk_category = "Low Risk"
-                risk_color = "green"
-                risk_icon = "✅"
-            elif risk_prob < 75:
-                risk_category = "Moderate Risk"
-                risk_color = "orange"
-                risk_icon = "⚠️"
-            else:
-                risk_category = "High Risk"
-                risk_color = "red"
-                risk_icon = "🚨"
-            
-            # BMI Category
-            if bmi < 18.5:
-                bmi_cat = "Underweight"
-            elif bmi < 25:
-                bmi_cat = "Normal"
-            elif bmi < 30:
-                bmi_cat = "Overweight"
-            else:
-                bmi_cat = "Obese"
-            
-            # Display Results
-            st.markdown("### 📊 Diabetes Risk Assessment Results")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">🧬 Risk Status</h3>
-                    <h2 style="color: {risk_color};">{risk_category}</h2>
-                    <p>Diabetes Likelihood</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">📊 Probability</h3>
-                    <h2>{risk_prob:.1f}%</h2>
-                    <p>Risk Percentage</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="color: #667eea;">🎯 Confidence</h3>
-                    <h2>{max(probability)*100:.1f}%</h2>
-                    <p>Model Certainty</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Status Display
-            if prediction == 1:
-                st.markdown(f"""
-                <div class="error-box">
-                    <h3>{risk_icon} <strong>Elevated Diabetes Risk Detected</strong></h3>
-                    <p>The analysis indicates increased risk for Type 2 diabetes based on your metabolic profile. 
-                    Consider consulting an endocrinologist for comprehensive diabetes screening and prevention planning.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="success-box">
-                    <h3>{risk_icon} <strong>Low Diabetes Risk</strong></h3>
-                    <p>Current metabolic indicators suggest lower diabetes risk. Continue maintaining healthy lifestyle 
-                    habits and regular monitoring of blood glucose levels.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Metabolic Profile Analysis
-            st.markdown("#### 🔍 Metabolic Profile Analysis")
-            
-            # Create metabolic indicators chart
-            metabolic_data = {
-                'Glucose Level': glucose,
-                'BMI': bmi,
-                'Blood Pressure': bp,
-                'Insulin': insulin/10,  # Scale for visualization
-                'Age Factor': age,
-                'Family Risk': dpf * 100
-            }
-            
-            fig = px.bar(
-                x=list(metabolic_data.keys()),
-                y=list(metabolic_data.values()),
-                title="Metabolic Risk Factors Profile",
-                labels={'x': 'Risk Factors', 'y': 'Relative Values'},
-                color=list(metabolic_data.values()),
-                color_continuous_scale="RdYlBu_r"
-            )
-            fig.update_layout(height=350, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Risk factors identification
-            risk_factors = []
-            if glucose > 140: risk_factors.append(f"Elevated glucose ({glucose} mg/dL)")
-            if bmi > 30: risk_factors.append(f"Obesity (BMI {bmi:.1f})")
-            elif bmi > 25: risk_factors.append(f"Overweight (BMI {bmi:.1f})")
-            if bp > 90: risk_factors.append(f"High blood pressure ({bp} mmHg)")
-            if age > 45: risk_factors.append(f"Advanced age ({age} years)")
-            if dpf > 1.0: risk_factors.append(f"Strong family history (DPF {dpf:.2f})")
-            if insulin < 50: risk_factors.append(f"Low insulin response ({insulin} μU/mL)")
-            
-            if risk_factors:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <strong>🔍 Risk Factors Identified:</strong><br>
-                    • {('<br>• ').join(risk_factors)}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Feature Importance Display
-            if hasattr(model, 'feature_importances_'):
-                feature_importance = dict(zip(features, model.feature_importances_))
-                sorted_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
-                
-                st.markdown("#### 📈 Most Important Risk Factors")
-                top_features = sorted_features[:5]
-                
-                fig_importance = px.bar(
-                    x=[f[1] for f in top_features],
-                    y=[f[0] for f in top_features],
-                    orientation='h',
-                    title="Top 5 Diabetes Risk Predictors",
-                    labels={'x': 'Importance Score', 'y': 'Clinical Parameters'},
-                    color=[f[1] for f in top_features],
-                    color_continuous_scale="viridis"
-                )
-                fig_importance.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig_importance, use_container_width=True)
-            
-            # AI Diabetes Recommendations
-            health_data = {
-                'risk_level': 'high' if prediction == 1 else 'low',
-                'diabetes_risk': probability[1],
-                'glucose': glucose,
-                'bmi': bmi,
-                'age': age
-            }
-            
-            with st.spinner("🤖 Generating diabetes prevention recommendations..."):
-                prompt = f"""Diabetes Risk Assessment:
-                Risk Level: {risk_category} ({risk_prob:.1f}% probability)
-                Patient Profile: {age}-year-old, BMI {bmi:.1f} ({bmi_cat})
-                Lab Results: Glucose {glucose} mg/dL, BP {bp} mmHg, Insulin {insulin} μU/mL
-                Risk Factors: {', '.join(risk_factors) if risk_factors else 'None major identified'}
-                Family History Score: {dpf:.2f}
-                
-                Provide comprehensive diabetes prevention/management recommendations with specific dietary and lifestyle interventions."""
-                
-                diabetes_advice = get_health_insights(prompt, health_data)
-                
-                st.markdown("### 💊 Diabetes Prevention & Management")
-                st.markdown(f"""
-                <div class="prediction-card">
-                    <div style="font-size: 1.1rem; line-height: 1.6;">
-                        {diabetes_advice}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-elif page == "💡 Smart Health Tips":
-    st.markdown("### 💡 Personalized Health & Wellness Guide")
-    st.markdown("*Evidence-based recommendations tailored to your profile*")
-    
-    with st.form("health_tips"):
-        st.markdown("#### 👤 Personal Health Profile")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🎯 Health Goals & Demographics**")
-            age_group = st.selectbox("Age Group", 
-                ["18-30", "31-45", "46-60", "60+"],
-                help="Your age category")
-            health_goal = st.selectbox("Primary Health Goal", [
-                "Weight Management", "Cardiovascular Health", "Diabetes Prevention", 
-                "Fitness Improvement", "Stress Reduction", "Better Sleep", 
-                "Mental Wellness", "General Health Maintenance"
-            ], help="Main health objective")
-            activity_level = st.selectbox("Current Activity Level", 
-                ["Sedentary", "Lightly Active", "Moderately Active", "Very Active", "Athletic"],
-                help="Your typical daily activity")
-            fitness_goal = st.selectbox("Fitness Focus", 
-                ["Weight Loss", "Muscle Building", "Endurance", "Flexibility", "Balance", "General Fitness"],
-                help="Specific fitness objective")
-            
-        with col2:
-            st.markdown("**⏰ Lifestyle & Preferences**")
-            time_available = st.selectbox("Daily Time for Health Activities", 
-                ["15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours"],
-                help="Time you can dedicate daily")
-            dietary_preference = st.selectbox("Dietary Approach", [
-                "No specific diet", "Mediterranean", "Plant-based", "Low-carb", 
-                "Keto", "Intermittent Fasting", "Paleo", "DASH Diet"
-            ], help="Preferred eating pattern")
-            sleep_quality = st.selectbox("Sleep Quality", 
-                ["Excellent", "Good", "Fair", "Poor"],
-                help="How well do you sleep?")
-            stress_level = st.selectbox("Current Stress Level", 
-                ["Low", "Moderate", "High", "Very High"],
-                help="Your typical stress level")
-        
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown("**🏥 Health Status**")
-            health_conditions = st.multiselect("Current Health Conditions", [
-                "Hypertension", "Type 2 Diabetes", "High Cholesterol", "Obesity",
-                "Anxiety/Depression", "Arthritis", "Heart Disease", "Asthma", "None"
-            ], help="Any diagnosed conditions")
-            medications = st.selectbox("Taking Medications", 
-                ["None", "1-2 medications", "3-5 medications", "More than 5"],
-                help="Current medication count")
-            
-        with col4:
-            st.markdown("**🎯 Specific Interests**")
-            wellness_focus = st.multiselect("Wellness Areas of Interest", [
-                "Nutrition Education", "Exercise Planning", "Stress Management",
-                "Sleep Optimization", "Mental Health", "Preventive Care",
-                "Supplement Guidance", "Health Monitoring"
-            ], help="Areas you want to focus on")
-            technology_comfort = st.selectbox("Technology Comfort Level", 
-                ["Prefer simple tools", "Comfortable with apps", "Love tech solutions"],
-                help="Your preference for health technology")
-        
-        submitted = st.form_submit_button("💡 Generate Personalized Health Plan", use_container_width=True)
-        
-        if submitted:
-            # Calculate comprehensive health score
-            health_score = 7  # Base score
-            
-            # Activity level adjustment
-            activity_scores = {"Sedentary": -2, "Lightly Active": -1, "Moderately Active": 0, "Very Active": 1, "Athletic": 2}
-            health_score += activity_scores[activity_level]
-            
-            # Sleep quality impact
-            sleep_scores = {"Excellent": 1, "Good": 0, "Fair": -1, "Poor": -2}
-            health_score += sleep_scores[sleep_quality]
-            
-            # Stress level impact
-            stress_scores = {"Low": 1, "Moderate": 0, "High": -1, "Very High": -2}
-            health_score += stress_scores[stress_level]
-            
-            # Health conditions impact
-            condition_count = len([c for c in health_conditions if c != "None"])
-            health_score -= condition_count * 0.5
-            
-            # Dietary approach bonus
-            healthy_diets = ["Mediterranean", "Plant-based", "DASH Diet"]
-            if dietary_preference in healthy_diets:
-                health_score += 1
-            
-            # Cap the score
-            health_score = max(3, min(health_score, 10))
-            
-            # Health status classification
-            if health_score >= 8:
-                health_status = "Excellent"
-                status_color = "green"
-                status_icon = "🌟"
-            elif health_score >= 6:
-                health_status = "Good"
-                status_color = "blue"
-                status_icon = "✅"
-            elif health_score >= 4:
-                health_status = "Fair"
-                status_color = "orange"
-                status_icon = "⚠️"
-            else:
-                health_status = "Needs Improvement"
-                status_color = "red"
-                status_icon = "🔴"
-            
-            # Display Health Dashboard
-            st.markdown("### 📊 Your Personal Health Dashboard")
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.markdown(f"""
-                <div class="health-stats">
-                    <h3>🎯 Health Score</h3>
-                    <h2 style="color: {status_color};">{health_score:.1f}/10</h2>
-                    <p>{health_status}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col2:
-                st.markdown(f"""
-                <div class="health-stats">
-                    <h3>📅 Age Group</h3>
-                    <h2>{age_group}</h2>
-                    <p>Life Stage</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col3:
-                st.markdown(f"""
-                <div class="health-stats">
-                    <h3>🏃‍♂️ Activity Level</h3>
-                    <h2>{activity_level}</h2>
-                    <p>Current Status</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col4:
-                st.markdown(f"""
-                <div class="health-stats">
-                    <h3>⏱️ Daily Commitment</h3>
-                    <h2>{time_available.split()[0]}</h2>
-                    <p>Available Time</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Health Status Display
-            st.markdown(f"""
-            <div class="{'success-box' if health_score >= 7 else 'warning-box' if health_score >= 5 else 'error-box'}">
-                <h3>{status_icon} <strong>Health Status: {health_status}</strong></h3>
-                <p>Your overall health profile shows a score of {health_score:.1f}/10 based on lifestyle factors, 
-                activity level, sleep quality, and health conditions.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Personalized Health Plan Generation
-            health_data = {
-                'age_group': age_group,
-                'goal': health_goal,
-                'activity_level': activity_level,
-                'conditions': health_conditions,
-                'health_score': health_score,
-                'time_available': time_available,
-                'dietary_preference': dietary_preference,
-                'wellness_focus': wellness_focus
-            }
-            
-            with st.spinner("🤖 Creating your comprehensive health plan..."):
-                conditions_text = ', '.join([c for c in health_conditions if c != 'None']) or 'None'
-                focus_areas = ', '.join(wellness_focus) or 'General wellness'
-                
-                prompt = f"""Create comprehensive personalized health plan:
-
-                PATIENT PROFILE:
-                - Age Group: {age_group}
-                - Primary Goal: {health_goal}
-                - Activity Level: {activity_level}
-                - Available Time: {time_available}
-                - Health Score: {health_score:.1f}/10 ({health_status})
-                
-                LIFESTYLE FACTORS:
-                - Dietary Preference: {dietary_preference}
-                - Sleep Quality: {sleep_quality}
-                - Stress Level: {stress_level}
-                - Health Conditions: {conditions_text}
-                - Focus Areas: {focus_areas}
-                
-                Provide a structured health plan with:
-                1. Daily Action Items (3-4 specific tasks)
-                2. Weekly Goals (2-3 objectives)
-                3. Nutrition Guidelines (specific to their diet preference)
-                4. Exercise Recommendations (appropriate for their fitness level)
-                5. Wellness Strategies (stress, sleep, mental health)
-                
-                Make recommendations specific, actionable, and realistic for their time constraints."""
-                
-                health_plan = get_health_insights(prompt, health_data)
-                
-                st.markdown("### 🎯 Your Comprehensive Health Plan")
-                st.markdown(f"""
-                <div class="prediction-card">
-                    <div style="font-size: 1.1rem; line-height: 1.7;">
-                        {health_plan}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Quick Daily Tips Section
-            st.markdown("### ⚡ Quick Daily Health Tips")
-            
-            # Generate specific tips based on profile
-            if "15-30" in time_available:
-                time_tips = "🕐 **15-Minute Power Sessions:** Focus on high-intensity, short-duration activities"
-                water_goal = "6-8 glasses"
-            elif "30-60" in time_available:
-                time_tips = "🕑 **45-Minute Wellness Window:** Perfect for comprehensive workout + meditation"
-                water_goal = "8-10 glasses"
-            else:
-                time_tips = "🕕 **Extended Health Time:** Opportunity for detailed meal prep and longer workouts"
-                water_goal = "10-12 glasses"
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="info-box">
-                    <h4>💧 Hydration Goal</h4>
-                    <p>Drink {water_goal} of water daily. Add lemon or cucumber for variety.</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="info-box">
-                    <h4>😴 Sleep Optimization</h4>
-                    <p>{"Maintain your excellent sleep habits!" if sleep_quality == "Excellent" 
-                       else "Aim for 7-9 hours with consistent bedtime routine."}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            with col2:
-                st.markdown(f"""
-                <div class="info-box">
-                    <h4>🚶‍♂️ Movement Breaks</h4>
-                    <p>{time_tips}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="info-box">
-                    <h4>🧘 Stress Management</h4>
-                    <p>{"Continue your stress management techniques" if stress_level == "Low"
-                       else "Practice 5-10 minutes of deep breathing or meditation daily"}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Technology Recommendations
-            if technology_comfort != "Prefer simple tools":
-                st.markdown("### 📱 Recommended Health Apps & Tools")
-                
-                app_recommendations = {
-                    "Nutrition": "MyFitnessPal, Cronometer, or Lose It! for food tracking",
-                    "Exercise": "Nike Training Club, Strava, or Apple Fitness+ for workouts",
-                    "Sleep": "Sleep Cycle, Headspace, or Calm for sleep optimization",
-                    "Mindfulness": "Insight Timer, Waking Up, or Ten Percent Happier for meditation"
-                }
-                
-                for category, apps in app_recommendations.items():
-                    if category.lower() in [f.lower() for f in wellness_focus]:
-                        st.markdown(f"**{category}:** {apps}")
-
-else:  # Health Dashboard
-    st.markdown("### 📊 Health Insights Dashboard")
-    st.markdown("*Overview of health trends and statistics*")
-    
-    # Sample health metrics for dashboard
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #667eea;">👥 Users Assessed</h3>
-            <h2>10,000+</h2>
-            <p>Health evaluations completed</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #667eea;">🤖 AI Predictions</h3>
-            <h2>25,000+</h2>
-            <p>ML-powered health insights</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #667eea;">📈 Accuracy Rate</h3>
-            <h2>87%</h2>
-            <p>Average model accuracy</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #667eea;">🏥 Conditions</h3>
-            <h2>3</h2>
-            <p>Major health areas covered</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Health Statistics Charts
-    st.markdown("### 📈 Health Assessment Statistics")
-    
-    # Sample data for visualization
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Risk distribution pie chart
-        risk_data = {'Low Risk': 45, 'Moderate Risk': 35, 'High Risk': 20}
-        fig_pie = px.pie(
-            values=list(risk_data.values()),
-            names=list(risk_data.keys()),
-            title="Risk Level Distribution",
-            color_discrete_map={'Low Risk': '#27ae60', 'Moderate Risk': '#f39c12', 'High Risk': '#e74c3c'}
-        )
-        fig_pie.update_layout(height=350)
-        st.plotly_chart(fig_pie, use_container_width=True)
-    
-    with col2:
-        # Age group bar chart
-        age_data = {'18-30': 25, '31-45': 35, '46-60': 30, '60+': 10}
-        fig_bar = px.bar(
-            x=list(age_data.keys()),
-            y=list(age_data.values()),
-            title="Users by Age Group",
-            labels={'x': 'Age Group', 'y': 'Percentage (%)'},
-            color=list(age_data.values()),
-            color_continuous_scale="viridis"
-        )
-        fig_bar.update_layout(height=350, showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
-    
-    # Health Tips Section
-    st.markdown("### 💡 Daily Health Tips")
-    
-    daily_tips = [
-        "🚶‍♀️ **Take 10,000 steps daily** - Use stairs instead of elevators when possible",
-        "🥗 **Eat the rainbow** - Include 5-7 different colored fruits and vegetables daily",
-        "💧 **Stay hydrated** - Drink water before you feel thirsty, aim for pale yellow urine",
-        "😴 **Prioritize sleep** - Maintain consistent sleep schedule even on weekends",
-        "🧘 **Practice mindfulness** - Take 5 deep breaths when feeling stressed",
-        "📱 **Limit screen time** - Take 20-20-20 breaks: every 20 min, look 20 feet away for 20 seconds"
-    ]
-    
-    for tip in daily_tips:
-        st.markdown(f"""
-        <div class="info-box">
-            <p style="margin: 0; font-size: 1rem;">{tip}</p>
-        </div>
-        """, unsafe_allow_html=True)
+with profile_run(page), session_memory_budget(PAGES[page].removeprefix('page_')):
+    importlib.import_module(PAGES[page]).render()
 
 # Enhanced Footer
 st.markdown("---")
@@ -0,0 +1,371 @@
+"""AI Health Copilot - Services shared by every page (LLM access, models, sessions)
+
+Imported on every run, so it stays light: sklearn, pandas, requests and the
+report renderer are imported inside the functions that need them.
+"""
+
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import streamlit as st
+
+from config import load_secrets, get_setting
+from rate_limit import AdmissionController, RateLimiter, ConcurrencyGate
+import health_tips as tips
+
+
+# Silent API Configuration (Hidden from UI)
+def get_api_key():
+    """Silently get API key without showing configuration"""
+    try:
+        return st.secrets.get("OPENROUTER_API_KEY", "")
+    except:
+        return ""
+
+API_KEY = get_api_key()
+
+@st.cache_resource
+def get_shared_backend():
+    """Cache/counter store from `[cache] backend`: in-process by default, SQLite or Redis to share between replicas"""
+    import shared_state
+
+    return shared_state.backend_from_config(load_secrets())
+
+@st.cache_resource
+def get_llm_admission():
+    """Process-wide LLM admission control shared by every session"""
+    secrets = load_secrets()
+
+    def setting(key, default):
+        return get_setting('security', key, default, secrets=secrets)
+
+    backend = get_shared_backend()
+    limiter = RateLimiter(
+        per_session_per_hour=setting('max_requests_per_hour', 100),
+        global_per_hour=setting('global_max_requests_per_hour', 1000),
+        session_burst=setting('session_burst', 5),
+        global_burst=setting('global_burst', 20),
+        backend=backend if backend.shared else None
+    )
+    gate = ConcurrencyGate(
+        max_concurrent=setting('llm_max_concurrent', 4),
+        max_queue=setting('llm_max_queue', 8),
+        queue_timeout=setting('llm_queue_timeout', 2.0)
+    )
+    return AdmissionController(limiter, gate)
+
+@st.cache_resource
+def get_llm_router():
+    """Process-wide LLM router keeping latency statistics for every configured target
+
+    The LLM path is enabled when any target ends up with a key - the OpenRouter
+    key, a target's own api_key/api_key_env - or when LLM_BASE_URL is set.
+    """
+    from llm_router import router_from_config
+
+    # Shorter strings are placeholders, not OpenRouter keys
+    return router_from_config(load_secrets(), API_KEY if len(API_KEY) > 20 else "")
+
+@st.cache_resource
+def get_advice_index():
+    """Pre-generated Smart Health Tips plans (None when no index has been built)"""
+    path = get_setting('app', 'advice_index', 'advice_index.sqlite', env='ADVICE_INDEX_PATH', secrets=load_secrets())
+    if not Path(path).exists():
+        return None
+    return tips.AdviceIndex(path)
+
+@st.cache_resource
+def get_cohort_gate():
+    """Process-wide cap on concurrent cohort scoring jobs so one clinic cannot starve other sessions"""
+    secrets = load_secrets()
+    return ConcurrencyGate(
+        max_concurrent=get_setting('security', 'cohort_max_concurrent', 2, secrets=secrets),
+        max_queue=get_setting('security', 'cohort_max_queue', 4, secrets=secrets),
+        queue_timeout=get_setting('security', 'cohort_queue_timeout', 10.0, secrets=secrets)
+    )
+
+@st.cache_resource
+def get_report_service():
+    """Process-wide report renderer; reports are built off the script thread and cached by assessment id"""
+    import reports
+
+    return reports.ReportService(
+        max_workers=get_setting('app', 'report_workers', 2, secrets=load_secrets()))
+
+def get_session_id():
+    """Stable identifier for the current browser session"""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+# Enhanced AI Response Function (Silent)
+def get_health_insights(prompt, health_data=None):
+    """Get health insights with silent fallback"""
+    
+    # Try API silently, unless rate limits or the concurrency queue say no
+    router = get_llm_router()
+    if router.enabled:
+        cache, cache_key = get_shared_backend(), "llm:" + router.request_key(prompt)
+        advice = _cache_get(cache, cache_key)
+        if advice:
+            return "🤖 " + advice
+
+        # Another session already waiting on the same prompt: share its answer without using a quota slot
+        result = router.join(prompt)
+        if result is None:
+            admission = get_llm_admission()
+            with admission.admit(get_session_id()) as admitted:
+                result = router.complete(prompt, on_rate_limited=admission.backoff) if admitted else (None, None)
+                if admitted and result[0]:
+                    _cache_set(cache, cache_key, result[0])
+        advice, _ = result
+        if advice:
+            return "🤖 " + advice
+    
+    # Smart Evidence-Based Fallback
+    return generate_evidence_based_advice(health_data)
+
+def _cache_get(cache, key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+def _cache_set(cache, key, advice):
+    try:
+        cache.set(key, advice, ttl=get_setting('cache', 'llm_ttl', 3600, secrets=load_secrets()))
+    except Exception:
+        pass
+
+def generate_evidence_based_advice(health_data):
+    """Generate professional evidence-based health advice"""
+    if not health_data:
+        return "🏥 **Professional Health Guidance:** Based on medical evidence and clinical guidelines, maintaining a balanced lifestyle with regular exercise, proper nutrition, adequate sleep, and stress management forms the foundation of optimal health."
+    
+    risk_level = health_data.get('risk_level', 'moderate').lower()
+    
+    if risk_level == 'low':
+        return """🌟 **Excellent Health Status**
+
+**Continue Your Success:** Your health indicators are outstanding! 
+
+**Optimization Strategies:**
+- **Fitness Enhancement:** Maintain 150+ minutes moderate aerobic activity weekly
+- **Nutritional Excellence:** Continue balanced diet with 5-9 servings fruits/vegetables daily  
+- **Mental Wellness:** Practice stress management techniques 10-15 minutes daily
+- **Preventive Care:** Annual health screenings to maintain optimal status
+
+**Evidence:** Studies show individuals with your health profile have 40% lower risk of chronic diseases."""
+    
+    elif risk_level == 'moderate':
+        return """⚡ **Health Improvement Opportunity**
+
+**Priority Actions Required:**
+
+**Immediate Steps (Next 30 Days):**
+- **Nutrition Upgrade:** Increase vegetable intake to 5-7 servings daily, reduce processed foods 50%
+- **Activity Boost:** Begin with 30-minute daily walks, progress to structured exercise routine
+- **Sleep Optimization:** Establish consistent 7-9 hour sleep schedule with proper hygiene
+
+**Clinical Evidence:** These modifications can reduce health risks by 25-40% within 3-6 months."""
+    
+    else:  # high risk
+        return """🚨 **Immediate Health Action Plan**
+
+**Critical Steps:**
+- **Medical Consultation:** Schedule comprehensive health evaluation within 1-2 weeks
+- **Daily Monitoring:** Track vital signs (blood pressure, weight, symptoms) using health apps
+- **Medication Compliance:** Follow all prescribed treatments precisely
+- **Emergency Preparedness:** Know warning signs requiring immediate medical attention
+
+**Support Resources:** Lifestyle modification programs, dietary counseling, and supervised exercise programs available."""
+
+# ML Models with Caching
+@st.cache_data
+def load_health_datasets():
+    """Load and prepare health datasets"""
+    import ml_models as ml
+
+    try:
+        return ml.load_health_datasets()
+    except Exception as e:
+        st.error(f"Error loading datasets: {str(e)}")
+        return None
+
+@st.cache_resource
+def get_model_registry():
+    """Process-wide model registry: loads the saved version matching the data, or trains one"""
+    import ml_models as ml
+    import registry
+
+    secrets = load_secrets()
+    models = registry.ModelRegistry(
+        ml.train_ml_models, registry.settings_from_config(secrets),
+        store_dir=get_setting('models', 'registry_dir', 'model_registry', env='MODEL_REGISTRY_DIR', secrets=secrets),
+        keep=get_setting('models', 'registry_keep', 3, secrets=secrets),
+        load_settings=lambda: registry.settings_from_config(load_secrets()),
+        watch_paths=registry.config_paths(secrets)
+    )
+    models.load_or_build()
+    if get_setting('models', 'watch_datasets', False, secrets=secrets):
+        models.watch(get_setting('models', 'watch_interval', 30.0, secrets=secrets))
+    return models
+
+def train_ml_models():
+    """Models of the active registry version (swapped in place when a new version is published)"""
+    try:
+        return get_model_registry().current()
+    except Exception as e:
+        st.error(f"Error training models: {str(e)}")
+        return None
+
+def is_operator():
+    """Whether this session unlocked the operator controls"""
+    return st.session_state.get('operator', False)
+
+def unlock_operator(token):
+    """Unlock operator controls when `token` matches [security] operator_token (unset disables them)"""
+    import hmac
+
+    expected = get_setting('security', 'operator_token', "", env='OPERATOR_TOKEN', secrets=load_secrets())
+    st.session_state['operator'] = bool(expected) and hmac.compare_digest(token.encode(), expected.encode())
+    return st.session_state['operator']
+
+@st.cache_resource
+def _process_profile_budget():
+    """Reruns left to profile in this process, from `[app] profile_reruns` / PROFILE_RERUNS"""
+    import threading
+
+    return {'remaining': get_setting('app', 'profile_reruns', 0, env='PROFILE_RERUNS', secrets=load_secrets()),
+            'lock': threading.Lock()}
+
+def _profile_source():
+    """Which budget pays for profiling this rerun: 'session', 'process' or None
+
+    An operator session can ask for its next N reruns with `?profile=N`; the
+    parameter is dropped from the URL either way so it is not replayed.
+    """
+    requested = st.query_params.get('profile')
+    if requested is not None:
+        del st.query_params['profile']
+        if is_operator() and requested.isdigit():
+            st.session_state['profile_remaining'] = int(requested)
+    if st.session_state.get('profile_remaining', 0) > 0:
+        return 'session'
+    if _process_profile_budget()['remaining'] > 0:
+        return 'process'
+    return None
+
+@contextmanager
+def _profiled(label, source):
+    import profiling
+
+    if not profiling.CAPTURE_LOCK.acquire(blocking=False):
+        yield None
+        return
+    result = None
+    try:
+        if source == 'session':
+            st.session_state['profile_remaining'] -= 1
+        else:
+            budget = _process_profile_budget()
+            with budget['lock']:
+                budget['remaining'] = max(0, budget['remaining'] - 1)
+        out_dir = get_setting('app', 'profile_dir', 'profiles', env='PROFILE_DIR', secrets=load_secrets())
+        with profiling.capture(out_dir, label) as result:
+            yield result
+    finally:
+        profiling.CAPTURE_LOCK.release()
+        if result is not None:
+            st.session_state['profiles'] = (st.session_state.get('profiles', []) + [result])[-10:]
+
+def profile_run(label):
+    """Context manager profiling this rerun when a profiling budget is left (a no-op otherwise)
+
+    Only one capture runs at a time in a process; a rerun arriving while another
+    session is captured runs unprofiled and keeps its budget for the next one.
+    """
+    source = _profile_source()
+    if source is None:
+        return nullcontext()
+    return _profiled(label, source)
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of aggregated chart JSON by data version, sized by `[app] figure_cache_mb`"""
+    import charts
+
+    mb = get_setting('app', 'figure_cache_mb', 32.0, env='FIGURE_CACHE_MB', secrets=load_secrets())
+    return charts.FigureCache(max_bytes=int(mb * 1024 * 1024))
+
+@st.cache_resource
+def sweep_result_files():
+    """Once per process at startup: delete scored result files left by workers that are gone"""
+    import result_files
+
+    return result_files.sweep()
+
+def new_result_file(prefix):
+    """A fresh scored result file; it is deleted when the result holding it is dropped"""
+    import result_files
+
+    return result_files.ResultFile(prefix)
+
+def download_limit_bytes():
+    """Largest result file offered for download, from `[app] download_max_mb`"""
+    mb = get_setting('app', 'download_max_mb', 100.0, env='DOWNLOAD_MAX_MB', secrets=load_secrets())
+    return int(mb * 1024 * 1024)
+
+@st.cache_resource
+def get_session_memory():
+    """Process-wide per-session memory accounting, budgets from `[app] session_memory_mb` / `sessions_memory_mb`"""
+    import session_memory
+
+    secrets = load_secrets()
+    mb = 1024 * 1024
+    return session_memory.SessionMemory(
+        session_limit=int(get_setting('app', 'session_memory_mb', 16.0, env='SESSION_MEMORY_MB', secrets=secrets) * mb),
+        process_limit=int(get_setting('app', 'sessions_memory_mb', 512.0, env='SESSIONS_MEMORY_MB', secrets=secrets) * mb))
+
+@contextmanager
+def session_memory_budget(page_key):
+    """Account this session's memory once the page has rendered, dropping old page results if over budget"""
+    evicted = st.session_state.get('evicted_pages', [])
+    if page_key in evicted:
+        st.info("ℹ️ Your earlier results on this page were cleared to free memory - submit the form again to see them.")
+        st.session_state['evicted_pages'] = [p for p in evicted if p != page_key]
+    yield
+    try:
+        dropped = get_session_memory().account(get_session_id(), st.session_state, page_key)
+        if dropped:
+            st.session_state['evicted_pages'] = sorted(set(st.session_state.get('evicted_pages', [])) | set(dropped))
+    except Exception:
+        pass  # accounting never fails a page
+
+@st.cache_resource
+def get_drift_monitors():
+    """Process-wide input drift statistics per model, referenced to the training data"""
+    import drift
+
+    data = load_health_datasets()
+    if not data:
+        return {}
+    return {condition: drift.DriftMonitor(X.to_numpy(dtype=float), X.columns) for condition, (X, _) in data.items()}
+
+@st.cache_resource
+def get_dashboard_aggregates():
+    """Process-wide counters and quantile sketches behind the Health Dashboard"""
+    import aggregates
+
+    return aggregates.DashboardAggregates(load_health_datasets(), backend=get_shared_backend())
+
+def record_model_inputs(condition, X):
+    """Fold inputs the model has just scored into the drift and dashboard statistics (never fails a prediction)"""
+    try:
+        monitor = get_drift_monitors().get(condition)
+        if monitor is not None:
+            monitor.update(X)
+        get_dashboard_aggregates().observe(condition, X)
+    except Exception:
+        pass
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Cascade vs single-model report
+
+Cross-validates each condition's current single model against cascades with
+different uncertainty bands and reports accuracy, AUC, escalation rate and
+per-row scoring cost. Folds of datasets with several rows per subject
+(Parkinson's) keep each subject's rows together.
+
+    python cascade_report.py --band 0.2 0.8 --band 0.1 0.9 --heavy forest
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+import ml_models
+
+
+def evaluate(model, X, y, folds=5, groups=None):
+    """Out-of-fold accuracy, AUC, microseconds per row and escalation rate"""
+    proba = np.zeros(len(y))
+    seconds = 0.0
+    seen = escalated = 0
+
+    for train_idx, test_idx in ml_models.cv_splits(X, y, groups, folds):
+        fitted = clone(model).fit(X[train_idx], y[train_idx])
+        started = time.perf_counter()
+        proba[test_idx] = fitted.predict_proba(X[test_idx])[:, 1]
+        seconds += time.perf_counter() - started
+        if isinstance(fitted, ml_models.CascadeClassifier):
+            seen += fitted.n_seen_
+            escalated += fitted.n_escalated_
+
+    return {
+        'accuracy': accuracy_score(y, proba >= 0.5),
+        'auc': roc_auc_score(y, proba),
+        'us_per_row': seconds / len(y) * 1e6,
+        'escalation': escalated / seen if seen else None
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cascaded inference with the single-model baseline")
+    parser.add_argument('--band', nargs=2, type=float, action='append', metavar=('LOW', 'HIGH'),
+                        help="uncertainty band to evaluate (repeatable)")
+    parser.add_argument('--heavy', choices=['forest', 'ensemble'], default='forest')
+    parser.add_argument('--folds', type=int, default=5)
+    args = parser.parse_args(argv)
+    bands = args.band or [ml_models.DEFAULT_CASCADE_BAND, (0.1, 0.9), (0.3, 0.7)]
+
+    data = ml_models.load_health_datasets()
+    groups = ml_models.load_dataset_groups()
+    print("🪜 Cascaded inference report")
+    print("=" * 72)
+
+    for condition in [c for c in ('heart', 'diabetes', 'parkinsons') if c in data]:
+        X, y = data[condition]
+        X, y = X.to_numpy(dtype=float), y.to_numpy()
+        grouped = "subject-grouped " if condition in groups else ""
+        print(f"\n{condition.title()} ({len(y)} rows, {grouped}{args.folds}-fold CV)")
+        print(f"{'model':<30}{'accuracy':>10}{'AUC':>8}{'µs/row':>10}{'escalated':>12}")
+
+        candidates = [('baseline (' + type(ml_models.make_baseline_model(condition)).__name__ + ')',
+                       ml_models.make_baseline_model(condition)),
+                      (f'{args.heavy} only', ml_models.make_heavy_model(args.heavy))]
+        candidates += [(f'cascade [{low:.2f}, {high:.2f}]',
+                        ml_models.CascadeClassifier(heavy=args.heavy, band=(low, high)))
+                       for low, high in bands]
+
+        for name, model in candidates:
+            result = evaluate(model, X, y, args.folds, groups.get(condition))
+            escalation = '-' if result['escalation'] is None else f"{result['escalation']:.1%}"
+            print(f"{name:<30}{result['accuracy']:>10.3f}{result['auc']:>8.3f}"
+                  f"{result['us_per_row']:>10.1f}{escalation:>12}")
+
+    print("\nEnable per condition with [models] cascade = [\"diabetes\"] and cascade_band = [low, high]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
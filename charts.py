@@ -0,0 +1,215 @@
+"""AI Health Copilot - Chart builders for large data views
+
+Figures for views over many rows (scored cohort files, batch screening) are
+built from aggregates, never from the rows themselves, so the JSON sent to
+the browser is bounded by bins and sample size rather than by row count. The
+accumulators take data chunk by chunk, like the cohort scorer, so memory stays
+bounded too:
+
+- Histogram: counts over fixed bins
+- Density2D: a 2D histogram, drawn as a heatmap
+- ExtremesSample: every point while there are few, then per x bucket only the
+  points with the lowest and highest y, so outliers survive downsampling
+
+Scatter traces switch to WebGL (Scattergl) above WEBGL_THRESHOLD points, and
+FigureCache keeps finished figure JSON keyed by data version, so a rerun of a
+page does not rescan the data behind an unchanged chart.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+WEBGL_THRESHOLD = 1000  # SVG scatter traces get slow in the browser beyond this many points
+MAX_POINTS = 4000  # points drawn in a scatter view; larger inputs keep each bucket's extremes
+DENSITY_BINS = (40, 40)
+SCAN_CHUNK_ROWS = 50000
+
+
+def _finite(*arrays):
+    arrays = [np.asarray(a, dtype=float).ravel() for a in arrays]
+    keep = np.logical_and.reduce([np.isfinite(a) for a in arrays])
+    return [a[keep] for a in arrays]
+
+
+class Histogram:
+    """Counts over `bins` equal bins between `low` and `high`; values outside land in the end bins"""
+
+    def __init__(self, low, high, bins=50):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def add(self, values):
+        (values,) = _finite(values)
+        clipped = np.clip(values, self.edges[0], self.edges[-1])
+        self.counts += np.histogram(clipped, self.edges)[0]
+        return self
+
+    @classmethod
+    def from_counts(cls, edges, counts):
+        histogram = cls(edges[0], edges[-1], len(counts))
+        histogram.edges = np.asarray(edges, dtype=float)
+        histogram.counts = np.asarray(counts, dtype=np.int64)
+        return histogram
+
+    def figure(self, title, x_label, y_label="Count", color="#667eea"):
+        import plotly.graph_objects as go
+
+        centers = (self.edges[:-1] + self.edges[1:]) / 2
+        fig = go.Figure(go.Bar(x=centers, y=self.counts, width=np.diff(self.edges), marker_color=color,
+                               hovertemplate=f"{x_label}: %{{x:.4g}}<br>{y_label}: %{{y:,}}<extra></extra>"))
+        fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label, bargap=0.02,
+                          height=350, font_family="Arial")
+        return fig
+
+
+class Density2D:
+    """2D histogram over fixed ranges; values outside land in the edge bins"""
+
+    def __init__(self, x_range, y_range, bins=DENSITY_BINS):
+        self.x_edges = np.linspace(*x_range, bins[0] + 1)
+        self.y_edges = np.linspace(*y_range, bins[1] + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def add(self, x, y):
+        x, y = _finite(x, y)
+        x = np.clip(x, self.x_edges[0], self.x_edges[-1])
+        y = np.clip(y, self.y_edges[0], self.y_edges[-1])
+        self.counts += np.histogram2d(x, y, [self.x_edges, self.y_edges])[0].astype(np.int64)
+        return self
+
+    def figure(self, title, x_label, y_label):
+        import plotly.graph_objects as go
+
+        z = self.counts.T.astype(float)
+        z[z == 0] = np.nan  # empty cells stay transparent
+        fig = go.Figure(go.Heatmap(
+            x=(self.x_edges[:-1] + self.x_edges[1:]) / 2, y=(self.y_edges[:-1] + self.y_edges[1:]) / 2, z=z,
+            colorscale="Viridis", colorbar={'title': 'Rows'},
+            hovertemplate=f"{x_label}: %{{x:.4g}}<br>{y_label}: %{{y:.4g}}<br>Rows: %{{z:,}}<extra></extra>"
+        ))
+        fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label, height=420, font_family="Arial")
+        return fig
+
+
+class ExtremesSample:
+    """Scatter sample of at most `max_points` points that keeps the extremes
+
+    Below `max_points` rows every point is kept. Beyond that the x range is cut
+    into max_points / 2 buckets and each keeps its lowest and highest y point -
+    the shape of the cloud and every outlier stay visible, interior points go.
+    """
+
+    def __init__(self, x_range, max_points=MAX_POINTS):
+        self.max_points = max_points
+        self.edges = np.linspace(*x_range, max(1, max_points // 2) + 1)
+        buckets = len(self.edges) - 1
+        self.low = np.full((buckets, 2), np.nan)  # bucket -> (x, y) with the lowest y so far
+        self.high = np.full((buckets, 2), np.nan)
+        self.raw = []  # every point, until there are more than max_points
+        self.count = 0
+
+    def add(self, x, y):
+        x, y = _finite(x, y)
+        self.count += len(x)
+        if self.raw is not None:
+            self.raw.append(np.column_stack([x, y]))
+            if self.count > self.max_points:
+                points = np.concatenate(self.raw)
+                self.raw = None
+                self._fold(points[:, 0], points[:, 1])
+        else:
+            self._fold(x, y)
+        return self
+
+    def _fold(self, x, y):
+        if not len(x):
+            return
+        bucket = np.clip(np.searchsorted(self.edges, x, side='right') - 1, 0, len(self.low) - 1)
+        order = np.lexsort((y, bucket))  # by bucket, then y
+        buckets, first = np.unique(bucket[order], return_index=True)
+        last = np.r_[first[1:], len(order)] - 1
+        for store, picks, better in ((self.low, order[first], np.less), (self.high, order[last], np.greater)):
+            current = store[buckets, 1]
+            replace = np.isnan(current) | better(y[picks], current)
+            store[buckets[replace]] = np.column_stack([x[picks], y[picks]])[replace]
+
+    @property
+    def sampled(self):
+        return self.raw is None
+
+    def points(self):
+        """(x, y) arrays sorted by x"""
+        if self.raw is not None:
+            points = np.concatenate(self.raw) if self.raw else np.empty((0, 2))
+        else:
+            points = np.concatenate([self.low, self.high])
+            points = np.unique(points[~np.isnan(points[:, 0])], axis=0)
+        points = points[np.argsort(points[:, 0], kind='stable')]
+        return points[:, 0], points[:, 1]
+
+    def figure(self, title, x_label, y_label, color="#764ba2"):
+        import plotly.graph_objects as go
+
+        x, y = self.points()
+        trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+        fig = go.Figure(trace(x=x, y=y, mode='markers', marker={'size': 5, 'color': color, 'opacity': 0.6},
+                              hovertemplate=f"{x_label}: %{{x:.4g}}<br>{y_label}: %{{y:.4g}}<extra></extra>"))
+        if self.sampled:
+            title += f"<br><sup>{len(x):,} of {self.count:,} rows shown - the highest and lowest in each range</sup>"
+        fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label, height=420, font_family="Arial")
+        return fig
+
+
+def scan_csv(path, x, y, x_range, y_range, view='density', bins=DENSITY_BINS, chunk_rows=SCAN_CHUNK_ROWS):
+    """Stream two numeric columns of a CSV into a Density2D ('density') or ExtremesSample ('points')"""
+    import pandas as pd
+
+    accumulator = Density2D(x_range, y_range, bins) if view == 'density' else ExtremesSample(x_range)
+    for chunk in pd.read_csv(path, usecols=[x, y], chunksize=chunk_rows):
+        accumulator.add(pd.to_numeric(chunk[x], errors='coerce'), pd.to_numeric(chunk[y], errors='coerce'))
+    return accumulator
+
+
+def file_version(path):
+    """Version of a data file for cache keys: changes whenever the file is rewritten"""
+    stat = Path(path).stat()
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class FigureCache:
+    """Process-wide LRU of figure JSON keyed by (chart, data version, options)
+
+    Cached figures are returned as plain dicts, ready for st.plotly_chart, so a
+    hit costs one json.loads of an already aggregated figure.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> figure JSON
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Cached figure for `key`, calling `build()` (which returns a Plotly figure) on a miss"""
+        with self.lock:
+            spec = self.entries.get(key)
+            if spec is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+        if spec is None:
+            spec = build().to_json()
+            with self.lock:
+                self.misses += 1
+                if key not in self.entries:
+                    self.entries[key] = spec
+                    self.bytes += len(spec)
+                while self.bytes > self.max_bytes and len(self.entries) > 1:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.bytes -= len(evicted)
+        return json.loads(spec)
@@ -0,0 +1,231 @@
+"""AI Health Copilot - Chunked validation and scoring of cohort CSV uploads
+
+A cohort file is read in fixed-size chunks; each chunk is validated, scored
+with every model whose features it contains (plus the general risk rules when
+the lifestyle columns are present) and appended to a scored CSV on disk, so
+memory stays bounded by the chunk size whatever the file size. The running
+summary keeps level counts and a binned histogram of each score for charts.
+"""
+
+import numpy as np
+import pandas as pd
+
+import charts
+import risk_rules
+import scenarios
+
+CHUNK_ROWS = 5000
+PREVIEW_ROWS = 200
+
+# Accepted ranges per column, matching the form input bounds (dataset encodings
+# for the categorical heart features)
+VALID_RANGES = {
+    'heart': {
+        'age': (20, 100), 'sex': (0, 1), 'cp': (0, 3), 'trestbps': (80, 200), 'chol': (100, 600),
+        'fbs': (0, 1), 'restecg': (0, 2), 'thalach': (60, 220), 'exang': (0, 1), 'oldpeak': (0.0, 6.5),
+        'slope': (0, 2), 'ca': (0, 4), 'thal': (0, 3)
+    },
+    'diabetes': {
+        'Pregnancies': (0, 20), 'Glucose': (0, 300), 'BloodPressure': (0, 200), 'SkinThickness': (0, 100),
+        'Insulin': (0, 900), 'BMI': (0.0, 70.0), 'DiabetesPedigreeFunction': (0.0, 3.0), 'Age': (18, 100)
+    },
+    'parkinsons': {
+        'MDVP:Fo(Hz)': (50.0, 300.0), 'MDVP:Fhi(Hz)': (50.0, 1000.0), 'MDVP:Flo(Hz)': (40.0, 300.0),
+        'MDVP:Jitter(%)': (0.0, 0.1), 'MDVP:Jitter(Abs)': (0.0, 0.001), 'MDVP:RAP': (0.0, 0.1), 'MDVP:PPQ': (0.0, 0.1),
+        'Jitter:DDP': (0.0, 0.3), 'MDVP:Shimmer': (0.0, 0.3), 'MDVP:Shimmer(dB)': (0.0, 3.0),
+        'Shimmer:APQ3': (0.0, 0.2), 'Shimmer:APQ5': (0.0, 0.2), 'MDVP:APQ': (0.0, 0.3), 'Shimmer:DDA': (0.0, 0.6),
+        'NHR': (0.0, 1.0), 'HNR': (0.0, 50.0), 'RPDE': (0.0, 1.0), 'DFA': (0.0, 1.0), 'spread1': (-10.0, 0.0),
+        'spread2': (0.0, 1.0), 'D2': (0.0, 5.0), 'PPE': (0.0, 1.0)
+    },
+    'general': {'age': (18, 100), 'height': (100, 250), 'weight': (30, 300)}
+}
+
+# Lifestyle columns for the general risk rules; answers are the form's option labels
+GENERAL_CHOICES = {
+    'exercise': risk_rules.EXERCISE_OPTIONS,
+    'diet': risk_rules.DIET_OPTIONS,
+    'sleep': risk_rules.SLEEP_OPTIONS,
+    'stress': risk_rules.STRESS_OPTIONS,
+    'smoking': risk_rules.SMOKING_OPTIONS,
+    'alcohol': risk_rules.ALCOHOL_OPTIONS
+}
+# Semicolon-separated lists, e.g. "Diabetes;Stroke" (may be blank)
+GENERAL_LISTS = ('family_history', 'symptoms')
+
+RISK_LEVELS = ("Low", "Moderate", "High")
+# Display names of the assessments, as the pages title them
+ASSESSMENT_LABELS = {'heart': "Heart Disease", 'diabetes': "Diabetes", 'parkinsons': "Parkinson's Voice",
+                     'general': "General Health"}
+BMI_RANGE = (10.0, 70.0)
+
+
+def score_scale(assessment):
+    """(scored column, low, high, histogram bins) of an assessment's result"""
+    if assessment == 'general':
+        return 'general_risk_score', -0.5, 10.5, 11  # integer scores 0-10
+    return f'{assessment}_risk_pct', 0.0, 100.0, 50
+
+
+def numeric_columns(assessments):
+    """{column: (low, high)} of the numeric inputs a scored file has for these assessments"""
+    columns = {}
+    for assessment in assessments:
+        columns.update(VALID_RANGES[assessment])
+        if assessment == 'general':
+            columns['bmi'] = BMI_RANGE
+    return columns
+
+
+def template(models):
+    """Empty DataFrame with every column the cohort scorer understands"""
+    columns = ['patient_id']
+    for condition, (_, features) in models.items():
+        columns += [f for f in features if f not in columns]
+    columns += [c for c in list(VALID_RANGES['general']) + list(GENERAL_CHOICES) + list(GENERAL_LISTS)
+                if c not in columns]
+    return pd.DataFrame(columns=columns)
+
+
+def scorable(columns, models):
+    """Which assessments a file with these columns supports"""
+    columns = set(columns)
+    available = [condition for condition, (_, features) in models.items() if set(features) <= columns]
+    general = set(VALID_RANGES['general']) | set(GENERAL_CHOICES)
+    if general <= columns:
+        available.append('general')
+    return available
+
+
+def _numeric(chunk, ranges):
+    """Numeric copy of the range-checked columns and a per-row list of problems"""
+    values = chunk[list(ranges)].apply(pd.to_numeric, errors='coerce')
+    problems = pd.Series([""] * len(chunk), index=chunk.index)
+    for column, (low, high) in ranges.items():
+        bad = values[column].isna() | (values[column] < low) | (values[column] > high)
+        problems[bad] += f"{column} missing/out of range; "
+    return values, problems
+
+
+def _risk_level(risk, condition):
+    low, high = scenarios.RISK_THRESHOLDS[condition]
+    return np.select([risk < low, risk < high], RISK_LEVELS[:2], RISK_LEVELS[2])
+
+
+def _score_model(chunk, condition, model, features, scored, observe=None):
+    values, problems = _numeric(chunk, VALID_RANGES[condition])
+    valid = (problems == "").to_numpy()
+    risk = np.full(len(chunk), np.nan)
+    if valid.any():
+        X = values.loc[valid, features].to_numpy(dtype=float)
+        risk[valid] = model.predict_proba(X)[:, 1] * 100
+        if observe is not None:
+            observe(condition, X)
+    scored[f'{condition}_risk_pct'] = np.round(risk, 1)
+    scored[f'{condition}_risk_level'] = np.where(valid, _risk_level(risk, condition), "")
+    return problems
+
+
+def _count_items(column):
+    items = column.fillna("").astype(str).str.split(";")
+    return items.map(lambda values: len([v for v in values if v.strip() and v.strip() != "None"]))
+
+
+def _score_general(chunk, scored):
+    values, problems = _numeric(chunk, VALID_RANGES['general'])
+    indices = {}
+    for column, options in GENERAL_CHOICES.items():
+        codes = chunk[column].astype(str).str.strip().map({option: i for i, option in enumerate(options)})
+        problems[codes.isna()] += f"{column} not one of the form options; "
+        indices[column] = codes.fillna(0).astype(int).to_numpy()
+    counts = {column: (_count_items(chunk[column]) if column in chunk else pd.Series(0, index=chunk.index))
+              for column in GENERAL_LISTS}
+
+    valid = (problems == "").to_numpy()
+    bmi = (values['weight'] / (values['height'] / 100) ** 2).to_numpy()
+    score = risk_rules.risk_score_batch(
+        age=values['age'].fillna(0).to_numpy(), bmi=np.nan_to_num(bmi, nan=22.0),
+        family_count=counts['family_history'].to_numpy(), symptom_count=counts['symptoms'].to_numpy(),
+        **indices
+    )
+    scored['bmi'] = np.where(valid, np.round(bmi, 1), np.nan)
+    scored['general_risk_score'] = np.where(valid, score, np.nan)
+    scored['general_risk_level'] = np.where(
+        valid, np.select([score <= 3, score <= 6], RISK_LEVELS[:2], RISK_LEVELS[2]), "")
+    return problems
+
+
+def score_chunk(chunk, models, assessments, observe=None):
+    """Scored copy of one chunk: input columns, results per assessment and a `problems` column
+
+    `observe(condition, X)` is called with the valid rows each model scored.
+    """
+    scored = chunk.copy()
+    problems = pd.Series([""] * len(chunk), index=chunk.index)
+    for assessment in assessments:
+        if assessment == 'general':
+            found = _score_general(chunk, scored)
+            label = "general"
+        else:
+            model, features = models[assessment]
+            found = _score_model(chunk, assessment, model, features, scored, observe)
+            label = assessment
+        problems += np.where(found != "", f"[{label}] " + found, "")
+    scored['problems'] = problems.str.rstrip('; ')
+    return scored
+
+
+def empty_summary(assessments):
+    return {
+        'rows': 0, 'invalid_rows': 0,
+        'levels': {assessment: dict.fromkeys(RISK_LEVELS, 0) for assessment in assessments},
+        'histograms': {assessment: [0] * score_scale(assessment)[3] for assessment in assessments}
+    }
+
+
+def update_summary(summary, scored, assessments):
+    """Fold one scored chunk into the running counts and score histograms"""
+    summary['rows'] += len(scored)
+    summary['invalid_rows'] += int((scored['problems'] != "").sum())
+    for assessment in assessments:
+        counts = scored[f'{assessment}_risk_level'].value_counts()
+        for level in RISK_LEVELS:
+            summary['levels'][assessment][level] += int(counts.get(level, 0))
+        column, low, high, bins = score_scale(assessment)
+        added = charts.Histogram(low, high, bins).add(scored[column]).counts
+        summary['histograms'][assessment] = [int(n) for n in np.add(summary['histograms'][assessment], added)]
+    return summary
+
+
+def score_csv(source, output_path, models, chunk_rows=CHUNK_ROWS, preview_rows=PREVIEW_ROWS, observe=None):
+    """Stream-score `source` into `output_path`
+
+    Yields (summary, preview) after each chunk so callers can update progress;
+    `summary['bytes_read']` tracks position in seekable sources. Raises
+    ValueError when the file supports no assessment.
+    """
+    # Only blanks are missing: "None" is a valid answer for alcohol and symptoms
+    reader = pd.read_csv(source, chunksize=chunk_rows, encoding='utf-8-sig', skipinitialspace=True,
+                         keep_default_na=False, na_values=[''])
+    assessments, summary, preview = None, None, []
+    with open(output_path, 'w', encoding='utf-8', newline='') as out:
+        for chunk in reader:
+            chunk.columns = [str(c).strip() for c in chunk.columns]
+            if assessments is None:
+                assessments = scorable(chunk.columns, models)
+                if not assessments:
+                    raise ValueError(
+                        "No assessment can be run: include all heart, diabetes or Parkinson's voice model columns, "
+                        "or the general lifestyle columns (download the template)")
+                summary = empty_summary(assessments)
+                summary['assessments'] = assessments
+
+            scored = score_chunk(chunk, models, assessments, observe)
+            scored.to_csv(out, header=(summary['rows'] == 0), index=False)
+            update_summary(summary, scored, assessments)
+            if len(preview) < preview_rows:
+                preview.append(scored.head(preview_rows - sum(len(p) for p in preview)))
+            if hasattr(source, 'tell'):
+                summary['bytes_read'] = source.tell()
+            yield summary, pd.concat(preview, ignore_index=True)
+    if assessments is None:
+        raise ValueError("The file has a header but no patient rows")
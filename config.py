@@ -0,0 +1,52 @@
+"""AI Health Copilot - Shared configuration helpers"""
+
+import os
+from pathlib import Path
+
+SECRETS_PATH = Path(__file__).parent / ".streamlit" / "secrets.toml"
+
+
+def _read_toml(path):
+    """Parse a TOML file with whichever parser is available"""
+    try:
+        import tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    except ModuleNotFoundError:
+        import toml  # installed alongside streamlit on Python < 3.11
+        return toml.load(str(path))
+
+
+def load_secrets(path=SECRETS_PATH):
+    """Return secrets as a plain dict (Streamlit secrets when available, else secrets.toml)"""
+    try:
+        import streamlit as st
+        return {key: (dict(value) if hasattr(value, 'items') else value)
+                for key, value in st.secrets.items()}
+    except Exception:
+        pass
+
+    try:
+        return _read_toml(path)
+    except Exception:
+        return {}
+
+
+def get_setting(section, key, default=None, env=None, secrets=None):
+    """Look up a setting: environment variable first, then secrets section, then default"""
+    if env and os.environ.get(env) not in (None, ""):
+        value = os.environ[env]
+        if isinstance(default, bool):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        if isinstance(default, (int, float)) and not isinstance(default, bool):
+            try:
+                return type(default)(value)
+            except ValueError:
+                return default
+        return value
+
+    secrets = load_secrets() if secrets is None else secrets
+    scope = secrets.get(section, {}) if section else secrets
+    if isinstance(scope, dict) and key in scope:
+        return scope[key]
+    return default
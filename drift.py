@@ -0,0 +1,131 @@
+"""AI Health Copilot - Constant-memory input drift monitoring
+
+Each monitored model keeps, per feature, a Welford running mean/variance and
+a histogram over fixed bins taken from the training data's deciles. Updating
+costs a few vectorized numpy operations per prediction and memory never grows
+with traffic. Drift is reported as the population stability index (PSI) of the
+live histogram against the training histogram, plus the mean shift in training
+standard deviations.
+"""
+
+import threading
+
+import numpy as np
+
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_THRESHOLDS = (0.1, 0.25)
+MIN_SAMPLES = 30  # below this the live histogram is too sparse to judge
+DEFAULT_BINS = 10
+
+
+def _bin_counts(values, edges):
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+
+def psi(expected, actual, eps=1e-4):
+    """Population stability index between two count (or proportion) vectors"""
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    p = np.clip(expected / max(expected.sum(), 1), eps, None)
+    q = np.clip(actual / max(actual.sum(), 1), eps, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def drift_status(score, n):
+    if n < MIN_SAMPLES:
+        return "Collecting"
+    if score < PSI_THRESHOLDS[0]:
+        return "Stable"
+    if score < PSI_THRESHOLDS[1]:
+        return "Moderate"
+    return "Significant"
+
+
+class DriftMonitor:
+    """Running per-feature statistics for one model's inputs, compared to its training data"""
+
+    def __init__(self, reference, feature_names, bins=DEFAULT_BINS):
+        reference = np.asarray(reference, dtype=float)
+        self.feature_names = list(feature_names)
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        # Discrete features collapse to fewer unique edges, i.e. one bin per value range
+        self.edges = [np.unique(np.quantile(reference[:, j], quantiles)) for j in range(reference.shape[1])]
+        self.ref_mean = reference.mean(axis=0)
+        self.ref_std = reference.std(axis=0)
+        self.ref_counts = [_bin_counts(reference[:, j], e) for j, e in enumerate(self.edges)]
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            width = len(self.feature_names)
+            self.n = 0
+            self.mean = np.zeros(width)
+            self.m2 = np.zeros(width)
+            self.counts = [np.zeros(len(e) + 1, dtype=np.int64) for e in self.edges]
+
+    def update(self, X):
+        """Fold one row or a batch of rows into the running statistics (Chan et al. parallel Welford)"""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        n_b = len(X)
+        if not n_b:
+            return
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        counts_b = [_bin_counts(X[:, j], e) for j, e in enumerate(self.edges)]
+
+        with self.lock:
+            n_a, n = self.n, self.n + n_b
+            delta = mean_b - self.mean
+            self.mean = self.mean + delta * n_b / n
+            self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / n
+            self.n = n
+            for counts, added in zip(self.counts, counts_b):
+                counts += added
+
+    def scores(self):
+        """Per-feature drift report: list of dicts sorted by PSI, highest first"""
+        with self.lock:
+            n, mean, m2 = self.n, self.mean.copy(), self.m2.copy()
+            counts = [c.copy() for c in self.counts]
+
+        std = np.sqrt(m2 / n) if n else np.zeros_like(mean)
+        report = []
+        for j, feature in enumerate(self.feature_names):
+            score = psi(self.ref_counts[j], counts[j]) if n else 0.0
+            shift = (mean[j] - self.ref_mean[j]) / self.ref_std[j] if n and self.ref_std[j] > 0 else 0.0
+            report.append({
+                'feature': feature,
+                'n': n,
+                'psi': score,
+                'mean': float(mean[j]),
+                'std': float(std[j]),
+                'reference_mean': float(self.ref_mean[j]),
+                'reference_std': float(self.ref_std[j]),
+                'mean_shift_sd': float(shift),
+                'status': drift_status(score, n)
+            })
+        return sorted(report, key=lambda r: r['psi'], reverse=True)
+
+    def summary(self):
+        """Largest PSI across features and the overall status"""
+        report = self.scores()
+        worst = report[0] if report else {'psi': 0.0, 'feature': None, 'n': 0}
+        return {'n': worst['n'], 'max_psi': worst['psi'], 'worst_feature': worst['feature'],
+                'status': drift_status(worst['psi'], worst['n'])}
+
+
+def prometheus_text(monitors):
+    """Drift metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP health_copilot_drift_psi Population stability index of live inputs vs training data",
+        "# TYPE health_copilot_drift_psi gauge"
+    ]
+    samples = []
+    for condition, monitor in monitors.items():
+        for row in monitor.scores():
+            lines.append(f'health_copilot_drift_psi{{model="{condition}",feature="{row["feature"]}"}} {row["psi"]:.6f}')
+        samples.append(f'health_copilot_drift_samples{{model="{condition}"}} {monitor.n}')
+    lines += ["# HELP health_copilot_drift_samples Predictions folded into the drift statistics",
+              "# TYPE health_copilot_drift_samples counter"] + samples
+    return "\n".join(lines) + "\n"
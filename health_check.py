@@ -1,11 +1,49 @@
 #!/usr/bin/env python3
 """AI Health Copilot - Enhanced Setup Validation"""
 
+import argparse
 import sys
-import requests
+import subprocess
+import time
 import json
+from datetime import datetime
 from pathlib import Path
 
+BASELINE_FILE = 'perf_baseline.json'
+
+# Allowed slowdown relative to the baseline before the gate fails
+DEFAULT_TOLERANCES = {
+    'import_seconds': 0.30,
+    'dataset_load_seconds': 0.50,
+    'train_seconds': 0.30,
+    'heart_p50_ms': 0.50,
+    'heart_p99_ms': 0.75,
+    'diabetes_p50_ms': 0.50,
+    'diabetes_p99_ms': 0.75,
+    'parkinsons_p50_ms': 0.50,
+    'parkinsons_p99_ms': 0.75,
+    'peak_rss_mb': 0.20
+}
+# Absolute slack so timer noise on tiny numbers does not fail the gate
+ABSOLUTE_SLACK = {
+    'import_seconds': 0.10,
+    'dataset_load_seconds': 0.02,
+    'train_seconds': 0.10,
+    'heart_p50_ms': 0.20,
+    'heart_p99_ms': 0.50,
+    'diabetes_p50_ms': 1.0,
+    'diabetes_p99_ms': 2.0,
+    'parkinsons_p50_ms': 0.20,
+    'parkinsons_p99_ms': 0.50,
+    'peak_rss_mb': 20.0
+}
+
+# What app.py imports at startup; everything else is loaded by the page that needs it
+APP_IMPORTS = ['streamlit', 'app_common']
+# Page modules app.py imports on first visit (PAGES in app.py)
+PAGE_MODULES = ['page_general', 'page_heart', 'page_diabetes', 'page_parkinsons', 'page_tips', 'page_cohort',
+                'page_dashboard']
+
 def validate_setup():
     """Comprehensive setup validation"""
     print("🧑‍⚕️ AI Health Copilot - Enhanced Setup Validation")
@@ -138,6 +176,191 @@ def validate_setup():
         print("❌ Setup incomplete. Please fix the issues above.")
         return False
 
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+def measure_import_time(modules=APP_IMPORTS, runs=3):
+    """Cold import time of the app's dependencies, in a fresh interpreter each run"""
+    code = (
+        "import time; t = time.perf_counter()\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + "print(time.perf_counter() - t)"
+    )
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).parent)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return _median(timings)
+
+def import_profile(module, preload=APP_IMPORTS, runs=3):
+    """Cold import cost of `module` on top of the startup imports, in a fresh interpreter each run
+
+    Returns (median seconds, {top-level package: cumulative seconds}) where the
+    package breakdown comes from `python -X importtime` for the last run.
+    """
+    marker = "--- page import ---"
+    code = (
+        "".join(f"import {m}\n" for m in preload)
+        + f"import sys, time; sys.stderr.write({marker!r} + '\\n'); t = time.perf_counter()\n"
+        + f"import {module}\n"
+        + "print(time.perf_counter() - t)"
+    )
+    timings, packages = [], {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, check=True, cwd=Path(__file__).parent)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+
+    # "import time: self [us] | cumulative | imported package"; the name's indent is its
+    # depth, so depth 1 entries are what the page module itself pulled in
+    for line in result.stderr.split(marker, 1)[-1].splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth != 1 or not cumulative.strip().isdigit():
+            continue
+        root = name.strip().split(".")[0]
+        packages[root] = packages.get(root, 0.0) + int(cumulative) / 1e6
+    return _median(timings), packages
+
+def import_report(modules=PAGE_MODULES):
+    """Print what each page costs to import on top of the app's startup imports"""
+    print("\n📦 Import cost per page (on top of " + ", ".join(APP_IMPORTS) + ")")
+    startup = measure_import_time()
+    print(f"   {'startup':<16}{startup * 1000:>8.0f} ms")
+    for module in modules:
+        seconds, packages = import_profile(module)
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:4]
+        breakdown = ", ".join(f"{name} {cost * 1000:.0f}" for name, cost in heaviest if cost >= 0.005)
+        print(f"   {module:<16}{seconds * 1000:>8.0f} ms   {breakdown}")
+    return True
+
+def measure_performance(settings, inference_runs=500):
+    """Collect the performance metrics compared against the baseline, training with the served `settings`"""
+    import ml_models
+    from process_stats import peak_rss_mb
+
+    metrics = {}
+
+    print("\n⏱️ Measuring cold import time...")
+    metrics['import_seconds'] = measure_import_time()
+    print(f"   {metrics['import_seconds']:.3f}s")
+
+    print("\n📊 Measuring dataset load time...")
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        data = ml_models.load_health_datasets()
+        timings.append(time.perf_counter() - started)
+    metrics['dataset_load_seconds'] = _median(timings)
+    print(f"   {metrics['dataset_load_seconds']:.4f}s")
+
+    print("\n🤖 Measuring train_ml_models() with the served settings...")
+    timings = []
+    for _ in range(3):
+        started = time.perf_counter()
+        models = ml_models.train_ml_models(data, **settings)
+        timings.append(time.perf_counter() - started)
+    metrics['train_seconds'] = _median(timings)
+    print(f"   {metrics['train_seconds']:.3f}s")
+
+    print("\n⚡ Measuring single-row inference latency...")
+    for condition, (model, features) in models.items():
+        X = data[condition][0].to_numpy(dtype=float)
+        rows = [X[i % len(X)].reshape(1, -1) for i in range(inference_runs)]
+        model.predict_proba(rows[0])  # warm-up
+        timings = []
+        for row in rows:
+            started = time.perf_counter()
+            model.predict_proba(row)
+            timings.append((time.perf_counter() - started) * 1000)
+        metrics[f'{condition}_p50_ms'] = _percentile(timings, 0.50)
+        metrics[f'{condition}_p99_ms'] = _percentile(timings, 0.99)
+        print(f"   {condition}: p50 {metrics[f'{condition}_p50_ms']:.2f}ms, p99 {metrics[f'{condition}_p99_ms']:.2f}ms")
+
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    print(f"\n💾 Peak memory: {metrics['peak_rss_mb']:.0f} MB")
+    return metrics
+
+def compare_to_baseline(metrics, baseline):
+    """Return a list of (metric, current, allowed) for every regression"""
+    tolerances = {**DEFAULT_TOLERANCES, **baseline.get('tolerances', {})}
+    regressions = []
+    for name, reference in baseline.get('metrics', {}).items():
+        if name not in metrics:
+            continue
+        allowed = reference * (1 + tolerances.get(name, 0.25)) + ABSOLUTE_SLACK.get(name, 0.0)
+        if metrics[name] > allowed:
+            regressions.append((name, metrics[name], allowed))
+    return regressions
+
+def performance_gate(baseline_path=BASELINE_FILE, update_baseline=False):
+    """Measure performance and fail if anything regressed beyond its tolerance"""
+    print("🏎️ AI Health Copilot - Performance Regression Gate")
+    print("=" * 60)
+
+    from config import load_secrets
+    from registry import settings_from_config
+
+    baseline_file = Path(baseline_path)
+    if not update_baseline and not baseline_file.exists():
+        print(f"\n❌ No baseline at {baseline_file} - record one with --update-baseline on the reference machine")
+        return False
+
+    settings = settings_from_config(load_secrets())
+    metrics = measure_performance(settings)
+
+    if update_baseline:
+        existing = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+        baseline = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'settings': settings,
+            'metrics': {name: round(value, 6) for name, value in metrics.items()},
+            'tolerances': existing.get('tolerances', DEFAULT_TOLERANCES)
+        }
+        baseline_file.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\n📝 Baseline written to {baseline_file}")
+        return True
+
+    baseline = json.loads(baseline_file.read_text())
+    if baseline.get('settings', settings) != settings:
+        print("\n⚠️ The served model settings differ from the baseline's - train timings are not comparable")
+    regressions = compare_to_baseline(metrics, baseline)
+
+    print("\n" + "=" * 60)
+    for name, reference in baseline.get('metrics', {}).items():
+        if name in metrics:
+            print(f"   {name:<22} {metrics[name]:>10.3f}  (baseline {reference:.3f})")
+
+    if regressions:
+        print("\n❌ Performance regressions detected:")
+        for name, current, allowed in regressions:
+            print(f"   {name}: {current:.3f} > allowed {allowed:.3f}")
+        return False
+
+    print("\n🎉 No performance regressions")
+    return True
+
 if __name__ == "__main__":
-    success = validate_setup()
+    parser = argparse.ArgumentParser(description="AI Health Copilot setup validation")
+    parser.add_argument('--perf', action='store_true', help="run the performance regression gate")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="performance baseline file")
+    parser.add_argument('--update-baseline', action='store_true', help="record current performance as the baseline")
+    parser.add_argument('--imports', action='store_true', help="report the import cost of each page")
+    args = parser.parse_args()
+
+    if args.imports:
+        success = import_report()
+    elif args.perf or args.update_baseline:
+        success = validate_setup() and performance_gate(args.baseline, args.update_baseline)
+    else:
+        success = validate_setup()
     sys.exit(0 if success else 1)
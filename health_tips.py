@@ -0,0 +1,232 @@
+"""AI Health Copilot - Smart Health Tips profile space, scoring and pre-generated advice index"""
+
+import hashlib
+import itertools
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+# Bump whenever the health plan prompt changes so stale pre-generated plans are not served
+PROMPT_VERSION = 1
+
+AGE_GROUPS = ["18-30", "31-45", "46-60", "60+"]
+HEALTH_GOALS = [
+    "Weight Management", "Cardiovascular Health", "Diabetes Prevention",
+    "Fitness Improvement", "Stress Reduction", "Better Sleep",
+    "Mental Wellness", "General Health Maintenance"
+]
+ACTIVITY_LEVELS = ["Sedentary", "Lightly Active", "Moderately Active", "Very Active", "Athletic"]
+FITNESS_GOALS = ["Weight Loss", "Muscle Building", "Endurance", "Flexibility", "Balance", "General Fitness"]
+TIME_AVAILABLE = ["15-30 minutes", "30-60 minutes", "1-2 hours", "2+ hours"]
+DIETARY_PREFERENCES = [
+    "No specific diet", "Mediterranean", "Plant-based", "Low-carb",
+    "Keto", "Intermittent Fasting", "Paleo", "DASH Diet"
+]
+SLEEP_QUALITY = ["Excellent", "Good", "Fair", "Poor"]
+STRESS_LEVELS = ["Low", "Moderate", "High", "Very High"]
+HEALTH_CONDITIONS = [
+    "Hypertension", "Type 2 Diabetes", "High Cholesterol", "Obesity",
+    "Anxiety/Depression", "Arthritis", "Heart Disease", "Asthma", "None"
+]
+MEDICATIONS = ["None", "1-2 medications", "3-5 medications", "More than 5"]
+WELLNESS_FOCUS = [
+    "Nutrition Education", "Exercise Planning", "Stress Management",
+    "Sleep Optimization", "Mental Health", "Preventive Care",
+    "Supplement Guidance", "Health Monitoring"
+]
+TECHNOLOGY_COMFORT = ["Prefer simple tools", "Comfortable with apps", "Love tech solutions"]
+
+# Only these inputs reach the health plan prompt, so they define the advice space
+PROFILE_OPTIONS = {
+    'age_group': AGE_GROUPS,
+    'health_goal': HEALTH_GOALS,
+    'activity_level': ACTIVITY_LEVELS,
+    'time_available': TIME_AVAILABLE,
+    'dietary_preference': DIETARY_PREFERENCES,
+    'sleep_quality': SLEEP_QUALITY,
+    'stress_level': STRESS_LEVELS,
+    'health_conditions': HEALTH_CONDITIONS,
+    'wellness_focus': WELLNESS_FOCUS
+}
+MULTI_SELECT_FIELDS = ('health_conditions', 'wellness_focus')
+
+# What the form submits when nobody touches it
+DEFAULT_PROFILE = {
+    field: ([] if field in MULTI_SELECT_FIELDS else options[0])
+    for field, options in PROFILE_OPTIONS.items()
+}
+
+
+ACTIVITY_SCORES = {"Sedentary": -2, "Lightly Active": -1, "Moderately Active": 0, "Very Active": 1, "Athletic": 2}
+SLEEP_SCORES = {"Excellent": 1, "Good": 0, "Fair": -1, "Poor": -2}
+STRESS_SCORES = {"Low": 1, "Moderate": 0, "High": -1, "Very High": -2}
+HEALTHY_DIETS = ["Mediterranean", "Plant-based", "DASH Diet"]
+
+
+def compute_health_score(activity_level, sleep_quality, stress_level, health_conditions, dietary_preference):
+    """Lifestyle health score on a 3-10 scale"""
+    health_score = 7  # Base score
+
+    health_score += ACTIVITY_SCORES[activity_level]
+    health_score += SLEEP_SCORES[sleep_quality]
+    health_score += STRESS_SCORES[stress_level]
+
+    condition_count = len([c for c in health_conditions if c != "None"])
+    health_score -= condition_count * 0.5
+
+    if dietary_preference in HEALTHY_DIETS:
+        health_score += 1
+
+    return max(3, min(health_score, 10))
+
+
+def classify_health_score(health_score):
+    """Return (status, color, icon) for a health score"""
+    if health_score >= 8:
+        return "Excellent", "green", "🌟"
+    elif health_score >= 6:
+        return "Good", "blue", "✅"
+    elif health_score >= 4:
+        return "Fair", "orange", "⚠️"
+    return "Needs Improvement", "red", "🔴"
+
+
+def canonical_profile(profile):
+    """Normalise a profile so equivalent form submissions map to the same key"""
+    canonical = {field: profile[field] for field in PROFILE_OPTIONS}
+    canonical['health_conditions'] = sorted(c for c in profile['health_conditions'] if c != "None")
+    canonical['wellness_focus'] = sorted(profile['wellness_focus'])
+    return canonical
+
+
+def profile_key(profile):
+    """Stable lookup key for a profile and the current prompt version"""
+    payload = json.dumps({'v': PROMPT_VERSION, **canonical_profile(profile)}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def profile_score(profile):
+    """Health score, status, color and icon for a profile"""
+    health_score = compute_health_score(
+        profile['activity_level'], profile['sleep_quality'], profile['stress_level'],
+        profile['health_conditions'], profile['dietary_preference']
+    )
+    return (health_score,) + classify_health_score(health_score)
+
+
+def build_health_plan_prompt(profile):
+    """Prompt for the personalised health plan"""
+    health_score, health_status, _, _ = profile_score(profile)
+    conditions_text = ', '.join([c for c in profile['health_conditions'] if c != 'None']) or 'None'
+    focus_areas = ', '.join(profile['wellness_focus']) or 'General wellness'
+
+    return f"""Create comprehensive personalized health plan:
+
+    PATIENT PROFILE:
+    - Age Group: {profile['age_group']}
+    - Primary Goal: {profile['health_goal']}
+    - Activity Level: {profile['activity_level']}
+    - Available Time: {profile['time_available']}
+    - Health Score: {health_score:.1f}/10 ({health_status})
+
+    LIFESTYLE FACTORS:
+    - Dietary Preference: {profile['dietary_preference']}
+    - Sleep Quality: {profile['sleep_quality']}
+    - Stress Level: {profile['stress_level']}
+    - Health Conditions: {conditions_text}
+    - Focus Areas: {focus_areas}
+
+    Provide a structured health plan with:
+    1. Daily Action Items (3-4 specific tasks)
+    2. Weekly Goals (2-3 objectives)
+    3. Nutrition Guidelines (specific to their diet preference)
+    4. Exercise Recommendations (appropriate for their fitness level)
+    5. Wellness Strategies (stress, sleep, mental health)
+
+    Make recommendations specific, actionable, and realistic for their time constraints."""
+
+
+def _field_variants(field):
+    """Non-default values for one field (single picks for multiselects)"""
+    options = PROFILE_OPTIONS[field]
+    if field in MULTI_SELECT_FIELDS:
+        return [[option] for option in options if option != "None"]
+    return [option for option in options if option != DEFAULT_PROFILE[field]]
+
+
+def iter_profiles_by_distance(max_distance=2):
+    """Yield profiles in order of how many fields differ from the form defaults
+
+    Form defaults dominate real traffic, so profiles close to them are the most
+    common and are generated first.
+    """
+    fields = list(PROFILE_OPTIONS)
+    for distance in range(max_distance + 1):
+        for changed in itertools.combinations(fields, distance):
+            for values in itertools.product(*(_field_variants(field) for field in changed)):
+                profile = dict(DEFAULT_PROFILE)
+                profile.update(zip(changed, values))
+                yield profile
+
+
+def sample_profiles(count, seed=42):
+    """Yield `count` random profiles (multiselects get up to two picks)"""
+    import random
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        profile = {}
+        for field, options in PROFILE_OPTIONS.items():
+            if field in MULTI_SELECT_FIELDS:
+                choices = [option for option in options if option != "None"]
+                profile[field] = rng.sample(choices, rng.choice([0, 0, 1, 1, 2]))
+            else:
+                profile[field] = rng.choice(options)
+        yield profile
+
+
+class AdviceIndex:
+    """SQLite lookup of pre-generated health plans keyed by profile"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS advice ("
+            "key TEXT PRIMARY KEY, profile TEXT NOT NULL, advice TEXT NOT NULL, "
+            "model TEXT, created_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, profile):
+        """Stored plan for a profile, or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT advice FROM advice WHERE key = ?", (profile_key(profile),)).fetchone()
+        return row[0] if row else None
+
+    def contains_keys(self, keys):
+        """Subset of `keys` already present (used to resume batch runs)"""
+        keys = list(keys)
+        found = set()
+        with self.lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(row[0] for row in self.conn.execute(
+                    f"SELECT key FROM advice WHERE key IN ({placeholders})", chunk))
+        return found
+
+    def put(self, profile, advice, model=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO advice (key, profile, advice, model, created_at) VALUES (?, ?, ?, ?, ?)",
+                (profile_key(profile), json.dumps(canonical_profile(profile), sort_keys=True),
+                 advice, model, datetime.utcnow().isoformat())
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM advice").fetchone()[0]
@@ -0,0 +1,361 @@
+"""AI Health Copilot - Multi-provider LLM routing with latency-based selection and hedging"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from rate_limit import retry_after_seconds
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "qwen/qwq-32b:free"
+SYSTEM_PROMPT = ("You are an expert health advisor providing evidence-based recommendations. "
+                 "Always remind users to consult healthcare professionals.")
+
+
+class RateLimitedError(Exception):
+    """Upstream answered 429"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class LLMTarget:
+    """One provider/model endpoint speaking the OpenAI chat completions protocol"""
+
+    def __init__(self, name, base_url, model, api_key="", timeout=25, headers=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def __repr__(self):
+        return f"LLMTarget({self.name!r}, {self.model!r})"
+
+    def complete(self, messages, max_tokens=350, temperature=0.7):
+        """Send one chat completion request and return the message text"""
+        headers = {
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://ai-health-copilot.streamlit.app",
+            "X-Title": "AI Healthcare Copilot",
+            **self.headers
+        }
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+
+        response = requests.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            data=json.dumps(payload),
+            timeout=self.timeout
+        )
+        if response.status_code == 429:
+            raise RateLimitedError(retry_after_seconds(response))
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content'].strip()
+
+
+class TargetStats:
+    """Rolling latency and error statistics for one target"""
+
+    def __init__(self, window=50, error_threshold=0.5, cooldown=30.0):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, latency, ok):
+        with self.lock:
+            self.outcomes.append(ok)
+            if ok:
+                self.latencies.append(latency)
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= 3:
+                    self.cooldown_until = time.monotonic() + self.cooldown
+
+    def cool_down(self, seconds):
+        """Take the target out of rotation, e.g. for an upstream Retry-After"""
+        with self.lock:
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + seconds)
+
+    def percentile(self, q, default=None):
+        """Latency percentile (0-1) over the window, or `default` without samples"""
+        with self.lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return default
+        index = min(len(samples) - 1, int(round(q * (len(samples) - 1))))
+        return samples[index]
+
+    def error_rate(self):
+        with self.lock:
+            return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def healthy(self):
+        return time.monotonic() >= self.cooldown_until and self.error_rate() < self.error_threshold
+
+    def snapshot(self):
+        return {
+            'requests': len(self.outcomes),
+            'error_rate': round(self.error_rate(), 3),
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'healthy': self.healthy()
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution
+
+    The first caller (the leader) runs the function; callers arriving while it
+    is in flight wait for and share its result, or its exception. Nothing is
+    kept once the call finishes, so this never serves stale results.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # key -> Future of the in-flight call
+        self.leaders = 0
+        self.shared = 0
+
+    def join(self, key, timeout=None):
+        """Wait for the in-flight call with this key; (True, result) or (False, None) if there is none"""
+        with self.lock:
+            future = self.calls.get(key)
+            if future is not None:
+                self.shared += 1
+        if future is None:
+            return False, None
+        return True, future.result(timeout)
+
+    def do(self, key, fn, timeout=None):
+        """Run `fn()` unless an identical call is in flight, in which case share its outcome"""
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result(timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    def snapshot(self):
+        with self.lock:
+            return {'in_flight': len(self.calls), 'leaders': self.leaders, 'shared': self.shared}
+
+
+class LLMRouter:
+    """Routes each request to the fastest healthy target and hedges slow ones"""
+
+    def __init__(self, targets, hedge_percentile=0.9, default_hedge_delay=4.0,
+                 min_hedge_delay=0.5, max_tokens=350, temperature=0.7, max_workers=8, enabled=True):
+        if not targets:
+            raise ValueError("LLMRouter needs at least one target")
+        self.targets = list(targets)
+        self.enabled = enabled  # False when no target can be called, so callers skip straight to fallbacks
+        self.stats = {target.name: TargetStats() for target in self.targets}
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.flights = SingleFlight()
+
+    def ranked_targets(self):
+        """Healthy targets by median latency (unmeasured first so they get probed), then the rest"""
+        def key(target):
+            return self.stats[target.name].percentile(0.5, default=0.0)
+        healthy = [t for t in self.targets if self.stats[t.name].healthy()]
+        unhealthy = [t for t in self.targets if t not in healthy]
+        return sorted(healthy, key=key) + sorted(unhealthy, key=key)
+
+    def hedge_delay(self, target):
+        delay = self.stats[target.name].percentile(self.hedge_percentile, default=self.default_hedge_delay)
+        return max(self.min_hedge_delay, delay)
+
+    def _timed_call(self, target, messages):
+        started = time.monotonic()
+        try:
+            text = target.complete(messages, self.max_tokens, self.temperature)
+        except RateLimitedError as e:
+            self.stats[target.name].record(time.monotonic() - started, False)
+            self.stats[target.name].cool_down(e.retry_after)
+            raise
+        except Exception:
+            self.stats[target.name].record(time.monotonic() - started, False)
+            raise
+        self.stats[target.name].record(time.monotonic() - started, True)
+        return text
+
+    def request_key(self, prompt, system_prompt=SYSTEM_PROMPT):
+        """Identity of a request: same prompts, generation parameters and target models"""
+        payload = [system_prompt, prompt, self.max_tokens, self.temperature, [t.model for t in self.targets]]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    def join(self, prompt, system_prompt=SYSTEM_PROMPT):
+        """Result of an identical request already in flight, or None when there is none to wait for"""
+        joined, result = self.flights.join(self.request_key(prompt, system_prompt))
+        return result if joined else None
+
+    def complete(self, prompt, system_prompt=SYSTEM_PROMPT, on_rate_limited=None):
+        """Return (text, target_name) from the first target to answer, or (None, None)
+
+        Concurrent identical requests share one upstream call.
+        """
+        return self.flights.do(self.request_key(prompt, system_prompt),
+                               lambda: self._complete(prompt, system_prompt, on_rate_limited))
+
+    def _complete(self, prompt, system_prompt, on_rate_limited):
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        ranked = self.ranked_targets()
+        primary = ranked[0]
+        deadline = time.monotonic() + primary.timeout
+
+        pending = {self.executor.submit(self._timed_call, primary, messages): primary}
+        backups = iter(ranked[1:])
+        hedge_at = time.monotonic() + self.hedge_delay(primary)
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # Wait until either something finishes or it is time to hedge
+            next_hedge = hedge_at if hedge_at is not None else deadline
+            done, _ = wait(pending, timeout=max(0.0, min(next_hedge, deadline) - now),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                target = pending.pop(future)
+                try:
+                    return future.result(), target.name
+                except RateLimitedError as e:
+                    # Only back off globally once every target is rate limited
+                    if on_rate_limited and not any(s.healthy() for s in self.stats.values()):
+                        on_rate_limited(e.retry_after)
+                except Exception:
+                    pass
+                # A failed request hedges immediately instead of waiting out the delay
+                hedge_at = time.monotonic()
+
+            if hedge_at is not None and time.monotonic() >= hedge_at:
+                backup = next(backups, None)
+                if backup is None:
+                    hedge_at = None
+                else:
+                    pending[self.executor.submit(self._timed_call, backup, messages)] = backup
+                    hedge_at = time.monotonic() + self.hedge_delay(backup)
+
+        return None, None
+
+    def snapshot(self):
+        """Per-target statistics for monitoring"""
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
+
+
+def targets_from_config(secrets, api_key=""):
+    """Build targets from `[[llm.targets]]`, falling back to the `[openrouter]`/`[app]` model settings
+
+    `api_key` is the OpenRouter key: a configured target without its own key
+    gets it only when the target is on OpenRouter, never another provider.
+    """
+    llm = secrets.get('llm', {}) or {}
+    openrouter = secrets.get('openrouter', {}) or {}
+    configured = llm.get('targets') or []
+    timeout = llm.get('timeout', 25)
+    base_url = openrouter.get('base_url', DEFAULT_BASE_URL)
+    openrouter_urls = {DEFAULT_BASE_URL, base_url.rstrip('/')}
+    targets = []
+
+    for i, entry in enumerate(configured):
+        entry = dict(entry)
+        target_url = entry.get('base_url', DEFAULT_BASE_URL)
+        key = entry.get('api_key')
+        if key is None and entry.get('api_key_env'):
+            key = os.environ.get(entry['api_key_env'], "")
+        if key is None:
+            key = api_key if target_url.rstrip('/') in openrouter_urls else ""
+        targets.append(LLMTarget(
+            name=entry.get('name') or f"target-{i}",
+            base_url=target_url,
+            model=entry.get('model', DEFAULT_MODEL),
+            api_key=key,
+            timeout=entry.get('timeout', timeout)
+        ))
+
+    if not targets:
+        app = secrets.get('app', {}) or {}
+        models = []
+        for model in (app.get('model'), openrouter.get('model'), DEFAULT_MODEL):
+            if model and model not in models:
+                models.append(model)
+        targets = [LLMTarget(model, base_url, model, api_key=api_key, timeout=timeout) for model in models]
+
+    return targets
+
+
+def router_from_config(secrets, api_key=""):
+    """Build an LLMRouter from secrets, honouring MODEL_NAME/MAX_TOKENS/TEMPERATURE env overrides"""
+    from config import get_setting
+
+    targets = targets_from_config(secrets, api_key)
+    model_override = get_setting('llm', 'model', None, env='MODEL_NAME', secrets={})
+    if model_override:
+        base_url, key = (targets[0].base_url, targets[0].api_key) if targets else (DEFAULT_BASE_URL, api_key)
+        targets = [LLMTarget(model_override, base_url, model_override, api_key=key)] + \
+                  [t for t in targets if t.model != model_override]
+    # LLM_BASE_URL points every target at one endpoint, e.g. the local llm_stub_server.py. The
+    # providers' keys stay behind: the endpoint only gets `[llm] override_api_key`, if set
+    base_url_override = get_setting('llm', 'base_url', None, env='LLM_BASE_URL', secrets=secrets)
+    if base_url_override:
+        override_key = get_setting('llm', 'override_api_key', "", env='LLM_OVERRIDE_API_KEY', secrets=secrets)
+        for target in targets:
+            target.base_url = base_url_override.rstrip('/')
+            target.api_key = override_key
+
+    # Providers need a key; the override endpoint (e.g. the local stand-in) may not
+    return LLMRouter(
+        targets,
+        enabled=bool(base_url_override) or any(target.api_key for target in targets),
+        hedge_percentile=get_setting('llm', 'hedge_percentile', 0.9, secrets=secrets),
+        default_hedge_delay=get_setting('llm', 'default_hedge_delay', 4.0, secrets=secrets),
+        max_tokens=get_setting('llm', 'max_tokens', 350, env='MAX_TOKENS', secrets=secrets),
+        temperature=get_setting('llm', 'temperature', 0.7, env='TEMPERATURE', secrets=secrets)
+    )
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Local OpenAI-compatible LLM stand-in
+
+Serves /v1/chat/completions on an offline machine so the advice path can be
+exercised, benchmarked and load-tested without an OpenRouter key.
+
+Modes:
+    synth   synthesize answers with a configurable latency distribution,
+            error/429 rates and optional streaming
+    replay  answer from a recorded fixture file (misses fall back to synth or 404)
+    record  proxy to a real upstream and append every answer to the fixture file
+
+    python llm_stub_server.py --mode synth --latency lognormal:2.0,0.6 --error-rate 0.05
+    LLM_BASE_URL=http://127.0.0.1:8787/v1 streamlit run app.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+VOCABULARY = (
+    "walk daily hydrate vegetables sleep routine stretch breathe fiber protein whole grains "
+    "blood pressure glucose monitor consult physician moderate activity mindfulness balanced "
+    "meals strength training cardio recovery portions sodium sugar rest weekly goals"
+).split()
+
+
+def parse_latency(spec):
+    """Return a zero-argument sampler for specs like fixed:0.5, uniform:0.2,1.5, lognormal:2.0,0.6"""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        return lambda: values[0] if values else 0.0
+    if kind == "uniform":
+        low, high = values
+        return lambda: random.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    if kind == "exponential":
+        mean, = values
+        return lambda: random.expovariate(1.0 / mean)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def request_key(messages):
+    """Fixture key for a conversation (model-independent so routed requests still match)"""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def synthesize(messages, tokens):
+    """Deterministic pseudo-advice seeded by the prompt"""
+    rng = random.Random(request_key(messages))
+    words = [rng.choice(VOCABULARY) for _ in range(tokens)]
+    lines = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+    return "**Stub health advice**\n\n" + "\n".join(f"- {line}" for line in lines)
+
+
+class Fixtures:
+    """Recorded responses stored as JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self.entries[entry["key"]] = entry
+            except FileNotFoundError:
+                pass
+
+    def get(self, messages):
+        return self.entries.get(request_key(messages))
+
+    def add(self, messages, model, content, latency):
+        entry = {
+            "key": request_key(messages),
+            "model": model,
+            "prompt": messages[-1]["content"] if messages else "",
+            "response": content,
+            "latency": round(latency, 4)
+        }
+        with self.lock:
+            self.entries[entry["key"]] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def completion_body(model, content):
+    return {
+        "id": f"stub-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": len(content.split())}
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "HealthCopilotLLMStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/health", "/v1/health"):
+            self._send_json(200, {"status": "ok", "stats": self.server.stats})
+        elif self.path.rstrip("/") in ("/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": self.server.options.model, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+
+        options = self.server.options
+        messages = request.get("messages", [])
+        model = request.get("model", options.model)
+        self.server.count("requests")
+
+        if options.mode == "record":
+            self._record(request, messages, model)
+            return
+
+        # Injected failures happen before any latency, like a busy upstream
+        roll = random.random()
+        if roll < options.rate_limit_rate:
+            self.server.count("rate_limited")
+            self._send_json(429, {"error": {"message": "stub rate limit"}}, {"Retry-After": str(options.retry_after)})
+            return
+        if roll < options.rate_limit_rate + options.error_rate:
+            self.server.count("errors")
+            time.sleep(self.server.sample_latency() * 0.1)
+            self._send_json(500, {"error": {"message": "stub upstream error"}})
+            return
+
+        content, latency = None, None
+        if options.mode == "replay":
+            entry = self.server.fixtures.get(messages)
+            if entry:
+                self.server.count("replay_hits")
+                content = entry["response"]
+                latency = entry.get("latency") if options.replay_latency == "recorded" else None
+            elif options.on_miss == "404":
+                self.server.count("replay_misses")
+                self._send_json(404, {"error": {"message": "no recorded response for this request"}})
+                return
+            else:
+                self.server.count("replay_misses")
+
+        if content is None:
+            content = synthesize(messages, min(options.tokens, int(request.get("max_tokens", options.tokens))))
+        if latency is None:
+            latency = self.server.sample_latency()
+
+        if request.get("stream"):
+            self._stream(model, content, latency)
+        else:
+            time.sleep(latency)
+            self._send_json(200, completion_body(model, content))
+
+    def _stream(self, model, content, latency):
+        """Server-sent events: first token after ~20% of the latency, the rest spread evenly"""
+        words = content.split(" ")
+        first_token = latency * 0.2
+        per_token = (latency - first_token) / max(len(words), 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        time.sleep(first_token)
+        for i, word in enumerate(words):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(per_token)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _record(self, request, messages, model):
+        """Forward to the real upstream and keep its answer as a fixture"""
+        options = self.server.options
+        upstream = dict(request, stream=False)
+        headers = {"Content-Type": "application/json"}
+        if options.api_key:
+            headers["Authorization"] = f"Bearer {options.api_key}"
+        req = urllib.request.Request(
+            options.upstream.rstrip("/") + "/chat/completions",
+            data=json.dumps(upstream).encode("utf-8"),
+            headers=headers,
+            method="POST"
+        )
+        started = time.monotonic()
+        try:
+            with urllib.request.urlopen(req, timeout=options.upstream_timeout) as response:
+                body = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            self.server.count("errors")
+            self._send_json(e.code, {"error": {"message": f"upstream returned {e.code}"}})
+            return
+        except Exception as e:
+            self.server.count("errors")
+            self._send_json(502, {"error": {"message": f"upstream failed: {e}"}})
+            return
+
+        latency = time.monotonic() - started
+        content = body["choices"][0]["message"]["content"]
+        self.server.fixtures.add(messages, model, content, latency)
+        self.server.count("recorded")
+        self._send_json(200, body)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, options):
+        super().__init__((options.host, options.port), StubHandler)
+        self.options = options
+        self.fixtures = Fixtures(options.fixtures)
+        self.sample_latency = parse_latency(options.latency)
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0,
+                      "replay_hits": 0, "replay_misses": 0, "recorded": 0}
+        self.stats_lock = threading.Lock()
+
+    def count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--mode", choices=["synth", "replay", "record"], default="synth")
+    parser.add_argument("--fixtures", default="llm_fixtures.jsonl", help="recorded responses (JSON lines)")
+    parser.add_argument("--latency", default="lognormal:2.0,0.6",
+                        help="fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exponential:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=180, help="length of synthesized answers in words")
+    parser.add_argument("--model", default="stub/health-advisor")
+    parser.add_argument("--on-miss", choices=["synth", "404"], default="synth", help="replay mode behaviour on a miss")
+    parser.add_argument("--replay-latency", choices=["recorded", "dist"], default="recorded",
+                        help="replay with the recorded latency or the --latency distribution")
+    parser.add_argument("--upstream", default="https://openrouter.ai/api/v1", help="record mode upstream")
+    parser.add_argument("--api-key", default=None, help="record mode key (default: OPENROUTER_API_KEY)")
+    parser.add_argument("--upstream-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def serve(argv=None, block=True):
+    """Start the stand-in; returns the server when `block` is False (for harnesses)"""
+    options = build_parser().parse_args(argv)
+    if options.seed is not None:
+        random.seed(options.seed)
+    if options.mode == "record" and options.api_key is None:
+        options.api_key = os.environ.get("OPENROUTER_API_KEY", "")
+
+    server = StubServer(options)
+    if not block:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    print(f"🤖 LLM stand-in ({options.mode}) on http://{options.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {server.stats}")
+    return server
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1:])
+    sys.exit(0)
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Load test with concurrent simulated users
+
+Starts one app worker (`streamlit run app.py`) - or targets a running one
+with `--url` - and drives N simulated users against it over Streamlit's own
+websocket protocol, sending the same messages a browser sends. Users repeat
+realistic flows - open a page, submit its form with random valid inputs,
+try a What-If axis on the result (a fragment rerun, as in the browser) -
+with think time between steps. Every step is timed from the request to the
+end of the script run.
+
+    python load_test.py --users 10 --duration 60
+    python load_test.py --users 1,5,10,20,40 --duration 60 --llm-stub lognormal:2.0,0.6 --json load.json
+
+Reports throughput, error rate and p50/p95/p99 per page and per stage, and
+the worker's CPU use and RSS (sampled from /proc, so on Linux and only for a
+worker started here or given with `--pid`). With several user counts, a
+summary shows where latency and errors start to climb.
+
+`--llm-stub` serves LLM answers from llm_stub_server.py in this process and
+points the worker at it. Without it a started worker uses the LLM settings
+in .streamlit/secrets.toml, so keep a real key out of load tests.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from llm_stub_server import parse_latency
+from process_stats import current_rss_mb
+
+APP = Path(__file__).parent / "app.py"
+
+# Flow name -> (text in the navigation label, submit the page's form, has a What-If Explorer, weight)
+FLOWS = {
+    'general': ("General Health", True, False, 3),
+    'heart': ("Heart Disease", True, True, 3),
+    'diabetes': ("Diabetes Risk", True, True, 3),
+    'parkinsons': ("Parkinson's Voice", True, False, 1),
+    'tips': ("Smart Health Tips", True, False, 2),
+    'dashboard': ("Health Dashboard", False, False, 1)
+}
+
+
+def _percentiles(values):
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': round(float(p50), 3), 'p95': round(float(p95), 3), 'p99': round(float(p99), 3)}
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}".splitlines()[0]
+
+
+class AppSession:
+    """One browser session, speaking just enough of the websocket protocol to navigate, fill forms and click"""
+
+    def __init__(self, url, timeout=120.0):
+        from websockets.sync.client import connect
+
+        self.timeout = timeout
+        self.ws = connect(url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream',
+                          subprotocols=['streamlit'], max_size=None, open_timeout=timeout)
+        self.elements = {}  # delta path -> (element, fragment id) currently on screen
+        self.values = {}  # widget id -> WidgetState, sent with every run like the browser does
+
+    def close(self):
+        self.ws.close()
+
+    def run(self, triggers=(), fragment_id=""):
+        """One script run (only the fragment when `fragment_id` is set); returns an error message or None"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.widget_states.widgets.extend([*self.values.values(), *triggers])
+        message.rerun_script.fragment_id = fragment_id
+        self.ws.send(message.SerializeToString())
+
+        elements = dict(self.elements) if fragment_id else {}
+        error = None
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = reply.WhichOneof('type')
+            if kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                element = reply.delta.new_element
+                elements[tuple(reply.metadata.delta_path)] = (element, reply.delta.fragment_id)
+                if element.WhichOneof('type') == 'exception' and not element.exception.is_warning:
+                    error = error or f"{element.exception.type}: {element.exception.message}".splitlines()[0]
+            elif kind == 'script_finished':
+                if reply.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    error = error or "script failed to compile"
+                break
+
+        self.elements = elements
+        on_screen = {getattr(element, element.WhichOneof('type')).id for element, _ in elements.values()
+                     if hasattr(getattr(element, element.WhichOneof('type') or '', None), 'form_id')}
+        self.values = {widget_id: state for widget_id, state in self.values.items() if widget_id in on_screen}
+        return error
+
+    def widgets(self, kind):
+        """[(proto, fragment id)] of the widgets of one kind on screen, in page order"""
+        return [(getattr(element, kind), fragment) for _, (element, fragment) in sorted(self.elements.items())
+                if element.WhichOneof('type') == kind]
+
+    def widget(self, kind, key):
+        """(proto, fragment id) of the widget created with `key`, or (None, "")"""
+        return next(((proto, fragment) for proto, fragment in self.widgets(kind) if proto.id.endswith(f"-{key}")),
+                    (None, ""))
+
+    def set(self, proto, kind, value):
+        """Record a widget value the way the browser serializes it"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=proto.id)
+        if kind in ('selectbox', 'radio'):
+            state.string_value = value
+        elif kind == 'number_input':
+            state.double_value = value
+        elif kind == 'slider':
+            state.double_array_value.data[:] = [value]
+        elif kind == 'checkbox':
+            state.bool_value = value
+        elif kind == 'multiselect':
+            state.string_array_value.data[:] = value
+        self.values[proto.id] = state
+
+    @staticmethod
+    def click(proto):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return WidgetState(id=proto.id, trigger_value=True)
+
+
+def _random_step(proto, rng):
+    steps = int(round((proto.max - proto.min) / proto.step)) if proto.step else 0
+    return round(proto.min + proto.step * rng.randint(0, max(steps, 0)), 6)
+
+
+def fill_form(session, rng):
+    """Give every form widget on screen a random valid value; returns the form's submit button or None"""
+    for proto, _ in session.widgets('number_input'):
+        if proto.form_id and proto.has_min and proto.has_max:
+            session.set(proto, 'number_input', _random_step(proto, rng))
+    for proto, _ in session.widgets('slider'):
+        if proto.form_id and len(proto.default) == 1 and not proto.options:
+            session.set(proto, 'slider', _random_step(proto, rng))
+    for kind in ('selectbox', 'radio'):
+        for proto, _ in session.widgets(kind):
+            if proto.form_id and proto.options:
+                session.set(proto, kind, rng.choice(list(proto.options)))
+    for proto, _ in session.widgets('multiselect'):
+        if proto.form_id and proto.options:
+            chosen = rng.sample(list(proto.options), rng.randint(0, min(3, len(proto.options))))
+            session.set(proto, 'multiselect', chosen)
+    for proto, _ in session.widgets('checkbox'):
+        if proto.form_id:
+            session.set(proto, 'checkbox', rng.random() < 0.5)
+    return next((proto for proto, _ in session.widgets('button') if proto.is_form_submitter), None)
+
+
+class Recorder:
+    """Thread-safe store of timed steps: (flow, stage) -> durations and error count"""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_messages = Counter()
+        self.flows = 0
+        self.lock = threading.Lock()
+
+    def step(self, flow, stage, seconds, error=None):
+        with self.lock:
+            self.timings[(flow, stage)].append(seconds)
+            if error:
+                self.errors[(flow, stage)] += 1
+                self.error_messages[f"{flow}/{stage}: {error}"] += 1
+
+    def flow_done(self):
+        with self.lock:
+            self.flows += 1
+
+
+class SimulatedUser(threading.Thread):
+    """One user repeating weighted flows until the deadline; a failed step starts a new session"""
+
+    def __init__(self, number, url, recorder, deadline, think, start_delay, timeout, seed):
+        super().__init__(name=f"user-{number}", daemon=True)
+        self.url = url
+        self.recorder = recorder
+        self.deadline = deadline
+        self.think = think
+        self.start_delay = start_delay
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.session = None
+
+    def _timed(self, flow, stage, action):
+        started = time.perf_counter()
+        try:
+            error = action()
+        except Exception as e:
+            error = _error(e)
+        self.recorder.step(flow, stage, time.perf_counter() - started, error)
+        return error is None
+
+    def _open(self):
+        def connect():
+            self.session = AppSession(self.url, self.timeout)
+            return self.session.run()
+        return self._timed('session', 'open', connect)
+
+    def _close(self):
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+        self.session = None
+
+    def _pause(self):
+        time.sleep(max(0.0, min(self.think(), self.deadline - time.monotonic())))
+
+    def _flow(self, name):
+        label, submit, what_if, _ = FLOWS[name]
+        session = self.session
+        navigation, _ = session.widget('selectbox', 'navigation')
+        if navigation is None:
+            self.recorder.step(name, 'navigate', 0.0, "navigation not on screen")
+            return False
+        session.set(navigation, 'selectbox', next(option for option in navigation.options if label in option))
+        if not self._timed(name, 'navigate', session.run):
+            return False
+
+        if submit:
+            self._pause()
+            button = fill_form(session, self.rng)
+            if button is not None and not self._timed(name, 'submit', lambda: session.run([session.click(button)])):
+                return False
+
+        if what_if and self.rng.random() < 0.5:
+            axis, fragment = session.widget('selectbox', f"{name}_what_if_x")
+            if axis is not None:
+                self._pause()
+                session.set(axis, 'selectbox', self.rng.choice(list(axis.options)))
+                if not self._timed(name, 'what_if', lambda: session.run(fragment_id=fragment)):
+                    return False
+        return True
+
+    def run(self):
+        time.sleep(self.start_delay)
+        names = list(FLOWS)
+        weights = [FLOWS[name][3] for name in names]
+        while time.monotonic() < self.deadline:
+            if self.session is None and not self._open():
+                self._close()
+            elif self._flow(self.rng.choices(names, weights)[0]):
+                self.recorder.flow_done()
+            else:
+                self._close()
+            self._pause()
+        self._close()
+
+
+def _proc_usage(pid):
+    """(CPU seconds, RSS MB) of a process from /proc, or None"""
+    try:
+        fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+    rss = current_rss_mb(pid)
+    return None if rss is None else (cpu, rss)
+
+
+class ResourceMonitor(threading.Thread):
+    """Samples the worker's CPU use and RSS once a second"""
+
+    def __init__(self, pid, interval=1.0):
+        super().__init__(name="load-monitor", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.rss = []
+        self._done = threading.Event()
+        self.started = time.perf_counter()
+        self.start_usage = _proc_usage(pid) if pid else None
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            usage = _proc_usage(self.pid) if self.pid else None
+            if usage:
+                self.rss.append(usage[1])
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        usage = _proc_usage(self.pid) if self.pid else None
+        if not usage or not self.start_usage or not self.rss:
+            return {'cpu_cores': None, 'rss_mean_mb': None, 'rss_max_mb': None}
+        return {'cpu_cores': round((usage[0] - self.start_usage[0]) / (time.perf_counter() - self.started), 2),
+                'rss_mean_mb': round(float(np.mean(self.rss)), 1),
+                'rss_max_mb': round(max(self.rss), 1)}
+
+
+def run_level(url, pid, users, duration, think, ramp, timeout, seed):
+    """Run `users` simulated users for `duration` seconds after the ramp; returns the report for this level"""
+    recorder = Recorder()
+    monitor = ResourceMonitor(pid)
+    monitor.start()
+    started = time.monotonic()
+    deadline = started + ramp + duration
+    threads = [SimulatedUser(i, url, recorder, deadline, think, ramp * i / max(users, 1), timeout, seed + i)
+               for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.monotonic() - started
+    resources = monitor.stop()
+
+    stages, pages = [], defaultdict(list)
+    for (flow, stage), timings in sorted(recorder.timings.items()):
+        stages.append({'flow': flow, 'stage': stage, 'count': len(timings),
+                       'error_rate': round(recorder.errors[(flow, stage)] / len(timings), 4), **_percentiles(timings)})
+        pages[flow].extend(timings)
+    steps = sum(len(timings) for timings in recorder.timings.values())
+    return {
+        'users': users,
+        'seconds': round(seconds, 1),
+        'flows': recorder.flows,
+        'flows_per_second': round(recorder.flows / seconds, 2),
+        'steps_per_second': round(steps / seconds, 2),
+        'error_rate': round(sum(recorder.errors.values()) / steps, 4) if steps else None,
+        **resources,
+        'pages': {flow: {'count': len(timings), **_percentiles(timings)} for flow, timings in sorted(pages.items())},
+        'stages': stages,
+        'errors': dict(recorder.error_messages.most_common(10))
+    }
+
+
+def print_level(report):
+    resources = (f"CPU {report['cpu_cores']} cores, RSS {report['rss_mean_mb']} MB mean / {report['rss_max_mb']} MB max"
+                 if report['cpu_cores'] is not None else "worker CPU/RSS not available")
+    print(f"\n👥 {report['users']} users, {report['seconds']}s: {report['flows']} flows "
+          f"({report['flows_per_second']}/s, {report['steps_per_second']} steps/s), "
+          f"errors {report['error_rate'] or 0:.1%}, {resources}")
+    print(f"   {'page':<11}{'stage':<10}{'count':>7}{'errors':>8}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}")
+    for row in report['stages']:
+        print(f"   {row['flow']:<11}{row['stage']:<10}{row['count']:>7}{row['error_rate']:>8.1%}"
+              f"{row['p50']:>9.3f}{row['p95']:>9.3f}{row['p99']:>9.3f}")
+    print(f"   {'page (all stages)':<21}{'count':>7}{'':>8}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}")
+    for flow, row in report['pages'].items():
+        print(f"   {flow:<21}{row['count']:>7}{'':>8}{row['p50']:>9.3f}{row['p95']:>9.3f}{row['p99']:>9.3f}")
+    for message, count in report['errors'].items():
+        print(f"   ⚠️ {count} x {message}")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_worker(env, log_path, timeout=120.0):
+    """Start `streamlit run app.py` on a free local port; returns (process, url) once it is healthy"""
+    port = _free_port()
+    command = [sys.executable, '-m', 'streamlit', 'run', str(APP), '--server.headless', 'true',
+               '--server.address', '127.0.0.1', '--server.port', str(port),
+               '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false']
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(command, cwd=APP.parent, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"the worker exited early; see {log_path}")
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"the worker did not start within {timeout:.0f}s; see {log_path}")
+
+
+def warm_up(url, timeout):
+    """One session through every page, so model loading is not counted against the first level; returns an error or None"""
+    session = AppSession(url, timeout)
+    try:
+        error = session.run()
+        for label, _, _, _ in FLOWS.values():
+            navigation, _ = session.widget('selectbox', 'navigation')
+            if error or navigation is None:
+                return error or "navigation not on screen"
+            session.set(navigation, 'selectbox', next(option for option in navigation.options if label in option))
+            error = session.run()
+        return error
+    finally:
+        session.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated users against one app worker")
+    parser.add_argument('--users', default="10", help="concurrent users, or a comma-separated ramp like 1,5,10,20")
+    parser.add_argument('--duration', type=float, default=60.0, help="seconds per user level (after the ramp)")
+    parser.add_argument('--ramp', type=float, default=5.0, help="seconds over which users start")
+    parser.add_argument('--think', default="exponential:1.0",
+                        help="think time between steps: fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exponential:MEAN")
+    parser.add_argument('--url', help="test this running app instead of starting a worker, e.g. http://localhost:8501")
+    parser.add_argument('--pid', type=int, help="process id of the --url worker, for CPU/RSS sampling")
+    parser.add_argument('--llm-stub', metavar='LATENCY', help="serve LLM answers from the local stand-in "
+                        "with this latency distribution, e.g. lognormal:2.0,0.6 (started workers only)")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0, help="stand-in 500 rate")
+    parser.add_argument('--worker-log', default="load_test_worker.log", help="output of the started worker")
+    parser.add_argument('--timeout', type=float, default=120.0, help="seconds before a step counts as failed")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help="write the full report here")
+    args = parser.parse_args(argv)
+
+    levels = [int(n) for n in args.users.split(',')]
+    think = parse_latency(args.think)
+    url, pid = args.url, args.pid
+    stub = worker = None
+    reports = []
+    try:
+        if url is None:
+            env = dict(os.environ)
+            if args.llm_stub:
+                import llm_stub_server
+
+                stub = llm_stub_server.serve(['--port', '0', '--latency', args.llm_stub, '--error-rate',
+                                              str(args.llm_error_rate), '--seed', str(args.seed)], block=False)
+                env['LLM_BASE_URL'] = f"http://127.0.0.1:{stub.server_port}/v1"
+                env.pop('LLM_OVERRIDE_API_KEY', None)  # the stand-in needs no key; see router_from_config
+                print(f"🤖 LLM stand-in on {env['LLM_BASE_URL']} ({args.llm_stub})")
+            else:
+                print("ℹ️ No --llm-stub: LLM calls go to the provider configured for the app")
+            try:
+                worker, url = start_worker(env, args.worker_log)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return 1
+            pid = worker.pid
+            print(f"🚀 Worker {pid} on {url} (output in {args.worker_log})")
+        elif args.llm_stub:
+            print("ℹ️ --llm-stub only applies to a worker started here; the --url app keeps its own LLM settings")
+
+        print("🔥 Warming up (loading datasets and models)...")
+        started = time.perf_counter()
+        try:
+            error = warm_up(url, args.timeout * 5)
+        except Exception as e:
+            error = _error(e)
+        if error:
+            print(f"❌ The app failed during warm-up: {error}")
+            return 1
+        print(f"   ready in {time.perf_counter() - started:.1f}s")
+
+        for users in levels:
+            report = run_level(url, pid, users, args.duration, think, args.ramp, args.timeout, args.seed)
+            if stub is not None:
+                report['llm_stub'] = dict(stub.stats)
+            print_level(report)
+            reports.append(report)
+    finally:
+        if worker is not None:
+            worker.terminate()
+            worker.wait(timeout=30)
+        if stub is not None:
+            stub.shutdown()
+
+    if len(reports) > 1:
+        print(f"\n{'users':>7}{'flows/s':>10}{'max p95 s':>11}{'errors':>9}{'CPU':>7}{'RSS MB':>9}")
+        for report in reports:
+            p95 = max((row['p95'] for row in report['stages']), default=0.0)
+            print(f"{report['users']:>7}{report['flows_per_second']:>10}{p95:>11.3f}{report['error_rate'] or 0:>9.1%}"
+                  f"{report['cpu_cores'] or '-':>7}{report['rss_max_mb'] or '-':>9}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({'levels': reports}, indent=2))
+        print(f"\n📝 Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
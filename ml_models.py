@@ -0,0 +1,377 @@
+"""AI Health Copilot - Dataset loading and model training"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier, VotingClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold, train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+DATA_DIR = Path(__file__).parent
+
+# Published by select_models.py: {condition: {"kind": ..., "params": {...}}}
+SELECTION_FILE = DATA_DIR / 'model_selection.json'
+
+# Published by train_streaming.py --publish: {condition}.pkl with the fitted model, features and report
+STREAMED_DIR = DATA_DIR / 'streamed_models'
+
+# Part of the registry's build fingerprint: bump when model code or defaults change, so saved
+# versions trained by older code are rebuilt instead of reloaded
+TRAINING_VERSION = 2
+
+# Probability band (positive class) in which the cheap cascade stage defers to the heavy model
+DEFAULT_CASCADE_BAND = (0.2, 0.8)
+
+
+def load_health_datasets(data_dir=DATA_DIR):
+    """Load and prepare health datasets"""
+    datasets = {}
+
+    # Diabetes Dataset (PIMA Indians Diabetes)
+    try:
+        diabetes_data = pd.read_csv(Path(data_dir) / 'diabetes.csv')
+    except Exception:
+        # Sample diabetes data if file not found
+        np.random.seed(42)
+        n_samples = 768
+        diabetes_data = pd.DataFrame({
+            'Pregnancies': np.random.randint(0, 15, n_samples),
+            'Glucose': np.random.normal(120, 30, n_samples),
+            'BloodPressure': np.random.normal(80, 15, n_samples),
+            'SkinThickness': np.random.normal(25, 10, n_samples),
+            'Insulin': np.random.normal(100, 80, n_samples),
+            'BMI': np.random.normal(28, 7, n_samples),
+            'DiabetesPedigreeFunction': np.random.exponential(0.5, n_samples),
+            'Age': np.random.randint(18, 80, n_samples)
+        })
+        # Create outcome based on risk factors
+        risk_score = (
+            (diabetes_data['Glucose'] > 140) * 2 +
+            (diabetes_data['BMI'] > 30) * 2 +
+            (diabetes_data['Age'] > 50) * 1 +
+            (diabetes_data['BloodPressure'] > 90) * 1
+        )
+        diabetes_data['Outcome'] = (risk_score >= 3).astype(int)
+
+    diabetes_X = diabetes_data.drop('Outcome', axis=1)
+    diabetes_y = diabetes_data['Outcome']
+    datasets['diabetes'] = (diabetes_X, diabetes_y)
+
+    # Heart Disease Dataset
+    try:
+        heart_data = pd.read_csv(Path(data_dir) / 'heart.csv')
+    except Exception:
+        # Sample heart data
+        n_samples = 303
+        heart_data = pd.DataFrame({
+            'age': np.random.randint(25, 80, n_samples),
+            'sex': np.random.randint(0, 2, n_samples),
+            'cp': np.random.randint(0, 4, n_samples),
+            'trestbps': np.random.normal(130, 20, n_samples),
+            'chol': np.random.normal(220, 50, n_samples),
+            'fbs': np.random.randint(0, 2, n_samples),
+            'restecg': np.random.randint(0, 3, n_samples),
+            'thalach': np.random.normal(150, 25, n_samples),
+            'exang': np.random.randint(0, 2, n_samples),
+            'oldpeak': np.random.exponential(1, n_samples),
+            'slope': np.random.randint(0, 3, n_samples),
+            'ca': np.random.randint(0, 4, n_samples),
+            'thal': np.random.randint(1, 4, n_samples)
+        })
+        # Create target based on risk factors
+        risk_score = (
+            (heart_data['age'] > 55) * 2 +
+            (heart_data['cp'] == 0) * 2 +
+            (heart_data['trestbps'] > 140) * 1 +
+            (heart_data['chol'] > 240) * 1 +
+            (heart_data['thalach'] < 120) * 2
+        )
+        heart_data['target'] = (risk_score >= 4).astype(int)
+
+    heart_X = heart_data.drop('target', axis=1)
+    heart_y = heart_data['target']
+    datasets['heart'] = (heart_X, heart_y)
+
+    # Parkinson's Dataset (UCI voice recordings, 22 acoustic measures; `name` identifies the recording).
+    # No synthetic stand-in: without the file the screening model is simply not offered.
+    try:
+        parkinsons_data = pd.read_csv(Path(data_dir) / 'parkinsons.csv')
+    except Exception:
+        parkinsons_data = None
+    if parkinsons_data is not None:
+        parkinsons_X = parkinsons_data.drop(['name', 'status'], axis=1, errors='ignore')
+        parkinsons_y = parkinsons_data['status']
+        datasets['parkinsons'] = (parkinsons_X, parkinsons_y)
+
+    return datasets
+
+
+def load_dataset_groups(data_dir=DATA_DIR):
+    """{condition: subject id per row} for the datasets with several rows per person
+
+    parkinsons.csv holds six or seven recordings of each of 32 subjects and
+    `name` (phon_R01_S01_1) encodes the subject. Evaluation must keep a
+    subject's recordings on one side of a split, or it scores the model on
+    people it was trained on.
+    """
+    groups = {}
+    try:
+        names = pd.read_csv(Path(data_dir) / 'parkinsons.csv', usecols=['name'])['name']
+    except Exception:
+        return groups
+    groups['parkinsons'] = names.str.rsplit('_', n=1).str[0]
+    return groups
+
+
+def cv_splits(X, y, groups=None, folds=5, random_state=42):
+    """Stratified cross-validation folds as (train indices, test indices); with `groups`
+    no group spans train and test"""
+    if groups is None:
+        return list(StratifiedKFold(folds, shuffle=True, random_state=random_state).split(X, y))
+    return list(StratifiedGroupKFold(folds, shuffle=True, random_state=random_state).split(X, y, groups))
+
+
+def evaluation_splits(X, y, groups=None, test_size=0.2, folds=5, random_state=42):
+    """(train indices, test indices) pairs a model is evaluated on
+
+    One stratified holdout of `test_size` for independent rows. With `groups`
+    it is grouped cross-validation instead, so every row is scored once by a
+    model that never saw its subject: a single grouped holdout of a few
+    subjects is too noisy to compare models on.
+    """
+    if groups is not None:
+        return cv_splits(X, y, groups, folds, random_state)
+    indices = np.arange(len(y))
+    train, test = train_test_split(indices, test_size=test_size, random_state=random_state, stratify=y)
+    return [(train, test)]
+
+
+def held_out_proba(model, X, y, splits):
+    """(test indices, positive-class probabilities) of copies of `model` fitted on each split's training rows,
+    plus the last fitted copy"""
+    take = (lambda a, idx: a.iloc[idx]) if hasattr(X, 'iloc') else (lambda a, idx: a[idx])
+    indices, proba, fitted = [], [], None
+    for train, test in splits:
+        fitted = clone(model).fit(take(X, train), take(y, train))
+        indices.append(test)
+        proba.append(fitted.predict_proba(take(X, test))[:, 1])
+    return np.concatenate(indices), np.concatenate(proba), fitted
+
+
+def make_baseline_model(condition):
+    """The single model each condition has always used"""
+    if condition == 'diabetes':
+        return RandomForestClassifier(n_estimators=100, random_state=42)
+    if condition == 'parkinsons':
+        return KernelApproxClassifier()
+    return LogisticRegression(random_state=42, max_iter=1000)
+
+
+def build_model(spec):
+    """Build an unfitted estimator from a {"kind", "params"} spec"""
+    kind, params = spec['kind'], dict(spec.get('params', {}))
+    if kind == 'forest':
+        return RandomForestClassifier(random_state=42, **params)
+    if kind == 'hist_gb':
+        return HistGradientBoostingClassifier(random_state=42, **params)
+    if kind == 'logistic':
+        return make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000, **params))
+    if kind == 'kernel_approx':
+        return KernelApproxClassifier(**params)
+    raise ValueError(f"Unknown model kind: {kind}")
+
+
+def load_published_specs(path=SELECTION_FILE):
+    """Model specs chosen by select_models.py, or {} if none were published"""
+    import json
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            selection = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {condition: entry['spec'] for condition, entry in selection.get('conditions', {}).items()}
+
+
+def streamed_model_refs(directory=STREAMED_DIR):
+    """{condition: {"path", "sha256"}} of the models published by train_streaming.py, or {} if none were"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return {}
+    return {path.stem: {'path': str(path), 'sha256': hashlib.sha256(path.read_bytes()).hexdigest()[:16]}
+            for path in sorted(directory.glob('*.pkl'))}
+
+
+def load_streamed_model(ref):
+    """(model, features) of a published streamed model; the file must still match its fingerprint
+
+    These are pickles: only point the streamed models directory at files you control.
+    """
+    import pickle
+
+    blob = Path(ref['path']).read_bytes()
+    if hashlib.sha256(blob).hexdigest()[:16] != ref['sha256']:
+        raise ValueError(f"{ref['path']} changed after it was registered")
+    artifact = pickle.loads(blob)
+    return artifact['model'], artifact['features']
+
+
+def make_heavy_model(kind='forest'):
+    """Expensive cascade stage: the random forest, or a soft-voting forest + SVM ensemble"""
+    forest = RandomForestClassifier(n_estimators=100, random_state=42)
+    if kind == 'forest':
+        return forest
+    if kind == 'ensemble':
+        svm = make_pipeline(StandardScaler(), SVC(probability=True, random_state=42))
+        return VotingClassifier([('forest', forest), ('svm', svm)], voting='soft')
+    raise ValueError(f"Unknown heavy model: {kind}")
+
+
+class KernelApproxClassifier(BaseEstimator, ClassifierMixin):
+    """RBF-kernel classifier at linear-model cost: standard scaling, a Nystroem
+    feature map on `n_components` landmark rows and a logistic model on top
+
+    Unlike an exact RBF SVC, prediction cost does not grow with the training
+    set. After fitting, the three steps are folded into a few arrays and
+    predict_proba is plain numpy (tens of microseconds per call, batched rows
+    in one matrix product), so it skips the per-step checks of a Pipeline.
+    The defaults are tuned on subject-grouped cross-validation of
+    parkinsons.csv: a wide kernel and moderate regularization generalize to
+    new speakers, where narrower kernels memorize the training subjects.
+    `gamma=None` uses 1 / n_features.
+    """
+
+    def __init__(self, n_components=20, gamma=0.002, C=1.0):
+        self.n_components = n_components
+        self.gamma = gamma
+        self.C = C
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=float)
+        gamma = self.gamma if self.gamma is not None else 1.0 / X.shape[1]
+        pipeline = make_pipeline(
+            StandardScaler(),
+            Nystroem(gamma=gamma, n_components=min(self.n_components, len(X)), random_state=42),
+            LogisticRegression(C=self.C, random_state=42, max_iter=5000)
+        ).fit(X, y)
+        scaler, feature_map, linear = (step for _, step in pipeline.steps)
+        self.mean_ = scaler.mean_
+        self.scale_ = scaler.scale_
+        self.gamma_ = gamma
+        self.landmarks_ = feature_map.components_
+        self.landmark_norms_ = (self.landmarks_ ** 2).sum(axis=1)
+        # The feature map's normalization and the logistic weights collapse into one vector
+        self.weights_ = feature_map.normalization_.T @ linear.coef_.ravel()
+        self.intercept_ = float(linear.intercept_[0])
+        self.classes_ = linear.classes_
+        return self
+
+    def decision_function(self, X):
+        Z = (np.atleast_2d(np.asarray(X, dtype=float)) - self.mean_) / self.scale_
+        distances = (Z ** 2).sum(axis=1)[:, None] - 2 * Z @ self.landmarks_.T + self.landmark_norms_
+        return np.exp(-self.gamma_ * np.maximum(distances, 0.0)) @ self.weights_ + self.intercept_
+
+    def predict_proba(self, X):
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+class CascadeClassifier(BaseEstimator, ClassifierMixin):
+    """Cheap scaled logistic model first; only rows whose probability falls inside
+    `band` are escalated to the heavy model"""
+
+    def __init__(self, heavy='forest', band=DEFAULT_CASCADE_BAND):
+        self.heavy = heavy
+        self.band = band
+
+    def fit(self, X, y):
+        self.cheap_ = make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000))
+        self.heavy_ = clone(self.heavy) if isinstance(self.heavy, BaseEstimator) else make_heavy_model(self.heavy)
+        self.cheap_.fit(X, y)
+        self.heavy_.fit(X, y)
+        self.classes_ = self.cheap_.classes_
+        self.n_seen_ = 0
+        self.n_escalated_ = 0
+        self._lock = threading.Lock()
+        return self
+
+    def uncertain_mask(self, proba):
+        low, high = self.band
+        return (proba[:, 1] >= low) & (proba[:, 1] <= high)
+
+    def predict_proba(self, X):
+        proba = self.cheap_.predict_proba(X)
+        uncertain = self.uncertain_mask(proba)
+        if uncertain.any():
+            proba[uncertain] = self.heavy_.predict_proba(X[uncertain])
+        with self._lock:
+            self.n_seen_ += len(proba)
+            self.n_escalated_ += int(uncertain.sum())
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def feature_importances_(self):
+        return self.heavy_.feature_importances_
+
+    @property
+    def escalation_rate(self):
+        """Fraction of rows scored so far that needed the heavy model"""
+        return self.n_escalated_ / self.n_seen_ if self.n_seen_ else 0.0
+
+
+def train_ml_models(data, cascade=(), cascade_band=DEFAULT_CASCADE_BAND, cascade_heavy='forest', specs=None,
+                    streamed=None):
+    """Train the per-condition models; returns {condition: (model, feature_names)}
+
+    Conditions in `streamed` (see streamed_model_refs) serve the model published
+    by train_streaming.py as it is, trained on its own data. Conditions listed
+    in `cascade` get a CascadeClassifier; otherwise a published spec from
+    `specs` replaces the condition's baseline model.
+    """
+    models = {}
+    specs = specs or {}
+    streamed = streamed or {}
+
+    for condition in ('diabetes', 'heart', 'parkinsons'):
+        if condition not in data:
+            continue
+        X, y = data[condition]
+        if condition in streamed:
+            model, features = load_streamed_model(streamed[condition])
+            if features != X.columns.tolist():
+                raise ValueError(f"The streamed {condition} model was trained on other columns than {condition}.csv")
+            models[condition] = (model, features)
+            continue
+        if condition in cascade:
+            model = CascadeClassifier(heavy=cascade_heavy, band=tuple(cascade_band))
+        elif condition in specs:
+            model = build_model(specs[condition])
+        else:
+            model = make_baseline_model(condition)
+        model.fit(X, y)
+        models[condition] = (model, X.columns.tolist())
+
+    return models
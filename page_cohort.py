@@ -0,0 +1,107 @@
+"""AI Health Copilot - Cohort Screening page"""
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import charts
+import cohort
+from app_common import get_figure_cache, train_ml_models
+from panels import render_batch_scoring, render_download, render_score_histograms
+
+
+@st.fragment
+def render_explorer(path, assessments):
+    """Any input against any score over every scored row, aggregated before it reaches the browser"""
+    st.markdown("#### 🔎 Explore Scored Rows")
+    measures = cohort.numeric_columns(assessments)
+    scores = {}
+    for assessment in assessments:
+        column, low, high, bins = cohort.score_scale(assessment)
+        scores[column] = ((low, high), bins)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x = st.selectbox("Measure", list(measures), key="cohort_explore_x")
+    with col2:
+        y = st.selectbox("Against", list(scores), key="cohort_explore_y")
+    with col3:
+        view = st.radio("View", ["Density", "Points"], horizontal=True, key="cohort_explore_view",
+            help=f"Points shows every row up to {charts.MAX_POINTS:,}, then the highest and lowest "
+                 "rows in each range of the measure")
+    
+    fig = get_figure_cache().get_or_build(
+        ('cohort_explore', charts.file_version(path), x, y, view),
+        lambda: charts.scan_csv(path, x, y, measures[x], scores[y][0], view.lower(),
+                                bins=(charts.DENSITY_BINS[0], scores[y][1])).figure(f"{y} by {x}", x, y))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render():
+    models = train_ml_models()
+    if not models:
+        return
+    
+    st.markdown("### 📋 Cohort Screening")
+    st.markdown("*Upload a patient panel and screen everyone in one go*")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>How it works:</strong> each row is validated and scored with every assessment its columns support -
+        heart disease, diabetes and Parkinson's voice models (dataset column names and encodings) and the general
+        risk rules (lifestyle answers as shown on the General Health Analysis form, lists separated by <code>;</code>).
+        Rows with problems are kept and flagged in a <code>problems</code> column.
+    </div>
+    """, unsafe_allow_html=True)
+    st.download_button("⬇️ Download CSV template", cohort.template(models).to_csv(index=False),
+        file_name="cohort_template.csv", mime="text/csv")
+    
+    uploaded = st.file_uploader("Patient CSV", type=["csv"], help="Up to 200 MB")
+    
+    result = None
+    if uploaded is not None:
+        result = render_batch_scoring(uploaded, models, 'cohort', "🔍 Score Cohort", live_preview=True)
+    
+    if result:
+        summary = result['summary']
+        st.markdown("### 📊 Cohort Results")
+        
+        cols = st.columns(len(summary['assessments']) + 1)
+        with cols[0]:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea; margin: 0;">👥 Patients</h3>
+                <h2 style="margin: 0.5rem 0;">{summary['rows']:,}</h2>
+                <p style="margin: 0; color: #7f8c8d;">{summary['invalid_rows']:,} with problems</p>
+            </div>
+            """, unsafe_allow_html=True)
+        for col, assessment in zip(cols[1:], summary['assessments']):
+            with col:
+                high = summary['levels'][assessment]['High']
+                st.markdown(f"""
+                <div class="metric-card">
+                    <h3 style="color: #667eea; margin: 0;">🚨 {cohort.ASSESSMENT_LABELS[assessment]}</h3>
+                    <h2 style="margin: 0.5rem 0;">{high:,}</h2>
+                    <p style="margin: 0; color: #7f8c8d;">High risk</p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        levels = pd.DataFrame(summary['levels']).T.rename(index=cohort.ASSESSMENT_LABELS)
+        levels = levels.reset_index(names='assessment')
+        fig = px.bar(
+            levels.melt(id_vars='assessment', var_name='Risk Level', value_name='Patients'),
+            x='assessment', y='Patients', color='Risk Level', barmode='group',
+            color_discrete_map={'Low': '#27ae60', 'Moderate': '#f39c12', 'High': '#e74c3c'},
+            title="Patients by Risk Level"
+        )
+        fig.update_layout(height=350, font_family="Arial", xaxis_title="")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # The fragment gets the path, not the file: a stored fragment must not keep the file alive
+        path = str(result['file'])
+        render_score_histograms(summary, charts.file_version(path))
+        render_explorer(path, summary['assessments'])
+        
+        st.markdown(f"#### First {len(result['preview'])} scored rows")
+        st.dataframe(result['preview'], use_container_width=True, hide_index=True)
+        render_download(result['file'], "scored CSV", f"scored_{uploaded.name}")
@@ -0,0 +1,282 @@
+"""AI Health Copilot - Health Dashboard page"""
+
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import aggregates
+from app_common import (get_dashboard_aggregates, get_drift_monitors, get_model_registry, get_report_service,
+                        get_session_id, get_session_memory, is_operator, unlock_operator)
+
+DRIFT_COLORS = {'Collecting': '#95a5a6', 'Stable': '#27ae60', 'Moderate': '#f39c12', 'Significant': '#e74c3c'}
+
+
+@st.fragment
+def render_drift_monitor():
+    """Live model inputs compared with the training data (refreshes without rerunning the page)"""
+    import drift
+
+    st.markdown("### 🧭 Input Drift Monitor")
+    st.markdown("*Population stability index (PSI) of the inputs each model has scored since startup, "
+                "against its training data. PSI below 0.1 is stable, above 0.25 a significant shift.*")
+
+    monitors = get_drift_monitors()
+    if not monitors:
+        st.info("Drift monitoring needs the training datasets next to the app.")
+        return
+
+    columns = st.columns(len(monitors))
+    for column, (condition, monitor) in zip(columns, monitors.items()):
+        summary = monitor.summary()
+        with column:
+            st.metric(f"{condition.title()} model", summary['status'],
+                      f"max PSI {summary['max_psi']:.3f}" if summary['n'] else None, delta_color="off")
+            st.caption(f"{summary['n']:,} predictions observed"
+                       + (f" · most shifted: {summary['worst_feature']}" if summary['n'] else ""))
+
+    condition = st.radio("Model", list(monitors), horizontal=True, format_func=str.title, key="drift_model")
+    report = pd.DataFrame(monitors[condition].scores())
+    if not report['n'].iloc[0]:
+        st.info(f"No {condition} predictions yet - run an assessment or a cohort file to start collecting.")
+    else:
+        fig = px.bar(report, x='feature', y='psi', color='status', color_discrete_map=DRIFT_COLORS,
+                     title=f"PSI per feature - {condition} model", labels={'psi': 'PSI', 'feature': 'Feature'})
+        for threshold in drift.PSI_THRESHOLDS:
+            fig.add_hline(y=threshold, line_dash="dash", line_color="gray")
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            report[['feature', 'psi', 'mean', 'reference_mean', 'std', 'reference_std', 'mean_shift_sd', 'status']]
+            .round(3), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Drift metrics (Prometheus)", drift.prometheus_text(monitors),
+                           file_name="drift_metrics.prom", mime="text/plain")
+    with col2:
+        st.button("🔄 Refresh")  # any widget event reruns just this fragment
+
+
+@st.fragment
+def render_model_versions():
+    """Loaded model versions with their metrics; operators can retrain or switch versions"""
+    st.markdown("### 🗃️ Model Versions")
+    registry = get_model_registry()
+    rows = []
+    for meta in registry.history():
+        row = {'Version': meta['version'], 'Active': "✅" if meta['active'] else "", 'Created': meta['created_at'],
+               'Reason': meta['reason'], 'Data': meta['data_fingerprint']}
+        for condition, metrics in meta['metrics'].items():
+            row[f'{condition.title()} AUC'] = metrics['auc']
+            row[f'{condition.title()} p50/p99 ms'] = (f"{meta['latency'][condition]['p50_ms']:.2f} / "
+                                                     f"{meta['latency'][condition]['p99_ms']:.2f}")
+        row['Train s'] = meta['train_seconds']
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    if registry.building:
+        st.info("⏳ A new version is training in the background; the active one keeps serving until it is ready.")
+    if registry.last_error:
+        st.error(f"Last build failed - {registry.last_error}")
+
+    with st.expander("🔐 Operator controls"):
+        if not is_operator():
+            st.text_input("Operator token", type="password", key="operator_token")
+            st.button("Unlock", on_click=lambda: unlock_operator(st.session_state.get('operator_token', "")))
+            if 'operator' in st.session_state:
+                st.error("Invalid token (set [security] operator_token to enable operator controls).")
+            return
+
+        # Callbacks run before the fragment reruns, so the table above already shows the outcome
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.button("🔁 Retrain now", disabled=registry.building,
+                      on_click=lambda: registry.publish(reason="manual", force=True))
+        with col2:
+            st.selectbox("Version", [meta['version'] for meta in registry.history()], key="registry_version",
+                         label_visibility="collapsed")
+        with col3:
+            st.button("⏪ Activate version", on_click=lambda: registry.rollback(st.session_state['registry_version']))
+        st.button("🔄 Refresh status")
+
+        st.markdown("**⏱️ Profiling** - profiles this session's next full reruns (also `?profile=N` in the URL)")
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.number_input("Reruns", min_value=1, max_value=20, value=3, key="profile_count",
+                            label_visibility="collapsed")
+        with col2:
+            st.button("Profile next reruns", on_click=lambda: st.session_state.update(
+                profile_remaining=st.session_state['profile_count']))
+        remaining = st.session_state.get('profile_remaining', 0)
+        if remaining:
+            st.caption(f"{remaining} rerun(s) left to profile")
+        for result in reversed(st.session_state.get('profiles', [])):
+            files = ", ".join(f"`{Path(path).name}`" for path in result['files'])
+            if result.get('error'):
+                files = f"not written ({result['error']})"
+            st.caption(f"{result['label']} - {result['seconds']:.2f}s: {files}")
+
+
+@st.fragment
+def render_session_memory():
+    """Operator view of the sessions holding the most memory in this process"""
+    from process_stats import current_rss_mb, peak_rss_mb
+
+    st.markdown("### 🧠 Session Memory")
+    memory = get_session_memory()
+    top = memory.top(10)
+    mb = 1024 * 1024
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sessions tracked", f"{len(memory.sessions):,}")
+    col2.metric("Session state", f"{memory.total() / mb:.1f} MB")
+    col3.metric("Report cache", f"{get_report_service().cached_bytes() / mb:.1f} MB")
+    rss = current_rss_mb()
+    if rss is None:
+        col4.metric("Process peak RSS", f"{peak_rss_mb():.0f} MB", help="Highest since the process started")
+    else:
+        col4.metric("Process RSS now", f"{rss:.0f} MB", help=f"Whole process; peak so far {peak_rss_mb():.0f} MB")
+    st.caption(f"Budget {memory.session_limit / mb:.0f} MB per session, {memory.process_limit / mb:.0f} MB for "
+               f"all sessions. {memory.evictions:,} page results evicted so far "
+               f"({memory.evicted_bytes / mb:.1f} MB).")
+    if top:
+        current = get_session_id()
+        st.dataframe(pd.DataFrame([{
+            'Session': session_id[:8] + (" (you)" if session_id == current else ""),
+            'MB': round(record['bytes'] / mb, 2),
+            'Budget MB': round(record['limit'] / mb, 1),
+            'Largest key': record['largest'],
+            'Largest MB': round(record['largest_bytes'] / mb, 2),
+            'Page': record['page'],
+            'Evictions': record['evictions'],
+            'Last seen': pd.Timestamp(record['updated'], unit='s').strftime('%H:%M:%S')
+        } for session_id, record in top]), use_container_width=True, hide_index=True)
+    st.button("🔄 Refresh", key="session_memory_refresh")
+
+
+def metric_card(title, value, caption):
+    st.markdown(f"""
+    <div class="metric-card">
+        <h3 style="color: #667eea;">{title}</h3>
+        <h2>{value}</h2>
+        <p>{caption}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def render():
+    st.markdown("### 📊 Health Insights Dashboard")
+    st.markdown("*Assessments completed in this app, and the datasets behind its models*")
+    
+    stats = get_dashboard_aggregates()
+    try:
+        snapshot = stats.snapshot()
+    except Exception as e:
+        st.error(f"❌ Could not read the dashboard counters from the {stats.backend.name} store: {e}")
+        return
+    if stats.backend.error:
+        st.warning(f"⚠️ {stats.backend.error}")
+    levels = snapshot['levels']
+    totals = {kind: sum(counts.values()) for kind, counts in levels.items()}
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        metric_card("👥 Assessments", f"{sum(totals.values()):,}", "Health evaluations completed")
+    
+    with col2:
+        metric_card("🤖 AI Predictions", f"{totals['heart'] + totals['diabetes'] + totals['parkinsons']:,}", "ML-powered risk predictions")
+    
+    with col3:
+        last_day = sum(sum(counts.values()) for _, counts in snapshot['hourly'])
+        metric_card("⏱️ Last 24 Hours", f"{last_day:,}", "Assessments in the past day")
+    
+    with col4:
+        metric_card("🏥 Conditions", "4", "Major health areas covered")
+    
+    # Health Statistics Charts
+    st.markdown("### 📈 Health Assessment Statistics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        scope = st.selectbox("Assessment", ["All", "General", "Heart", "Diabetes", "Parkinson's"],
+                             key="dashboard_scope")
+        kinds = ['general', 'heart', 'diabetes', 'parkinsons'] if scope == "All" else [scope.lower().replace("'", "")]
+        risk_data = {f"{level} Risk": sum(levels[kind].get(level, 0) for kind in kinds)
+                     for level in aggregates.RISK_LEVELS}
+        if sum(risk_data.values()):
+            fig_pie = px.pie(
+                values=list(risk_data.values()),
+                names=list(risk_data.keys()),
+                title="Risk Level Distribution",
+                color=list(risk_data.keys()),
+                color_discrete_map={'Low Risk': '#27ae60', 'Moderate Risk': '#f39c12', 'High Risk': '#e74c3c'}
+            )
+            fig_pie.update_layout(height=350)
+            st.plotly_chart(fig_pie, use_container_width=True)
+        else:
+            st.info("No risk assessments yet - results appear here as soon as they are completed.")
+    
+    with col2:
+        age_data = {group: snapshot['age_groups'].get(group, 0) for group in aggregates.AGE_GROUPS}
+        if sum(age_data.values()):
+            fig_bar = px.bar(
+                x=list(age_data.keys()),
+                y=list(age_data.values()),
+                title="Users by Age Group",
+                labels={'x': 'Age Group', 'y': 'Assessments'},
+                color=list(age_data.values()),
+                color_continuous_scale="viridis"
+            )
+            fig_bar.update_layout(height=350, showlegend=False)
+            st.plotly_chart(fig_bar, use_container_width=True)
+        else:
+            st.info("Age groups are counted from individual assessments.")
+    
+    # Rolling activity window
+    activity = pd.DataFrame(
+        [{'hour': pd.Timestamp(start, unit='s'), 'assessment': kind.title(), 'count': counts.get(kind, 0)}
+         for start, counts in snapshot['hourly'] for kind in levels]
+    )
+    if activity['count'].sum():
+        fig_activity = px.bar(activity, x='hour', y='count', color='assessment',
+                              title="Assessments per Hour (last 24 hours, UTC)",
+                              labels={'hour': '', 'count': 'Assessments', 'assessment': 'Assessment'})
+        fig_activity.update_layout(height=300)
+        st.plotly_chart(fig_activity, use_container_width=True)
+    
+    # Training data vs what the models have actually been asked to score
+    if stats.reference:
+        st.markdown("### 🗂️ Model Inputs vs Training Data")
+        condition = st.radio("Model", list(stats.reference), horizontal=True, format_func=str.title,
+                             key="dashboard_model")
+        reference = stats.reference[condition]
+        st.caption(f"{reference['rows']:,} training records, {reference['positive_rate']:.0%} positive. "
+                   "Quantiles are estimated to within 1% from mergeable sketches.")
+        quantiles = pd.DataFrame(stats.feature_quantiles(condition))
+        st.dataframe(quantiles.round(2), use_container_width=True, hide_index=True)
+    
+    render_drift_monitor()
+    render_model_versions()
+    if is_operator():
+        render_session_memory()
+
+    # Health Tips Section
+    st.markdown("### 💡 Daily Health Tips")
+    
+    daily_tips = [
+        "🚶‍♀️ **Take 10,000 steps daily** - Use stairs instead of elevators when possible",
+        "🥗 **Eat the rainbow** - Include 5-7 different colored fruits and vegetables daily",
+        "💧 **Stay hydrated** - Drink water before you feel thirsty, aim for pale yellow urine",
+        "😴 **Prioritize sleep** - Maintain consistent sleep schedule even on weekends",
+        "🧘 **Practice mindfulness** - Take 5 deep breaths when feeling stressed",
+        "📱 **Limit screen time** - Take 20-20-20 breaks: every 20 min, look 20 feet away for 20 seconds"
+    ]
+    
+    for tip in daily_tips:
+        st.markdown(f"""
+        <div class="info-box">
+            <p style="margin: 0; font-size: 1rem;">{tip}</p>
+        </div>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,266 @@
+"""AI Health Copilot - Diabetes Risk Assessment page"""
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import reports
+from app_common import get_health_insights, record_model_inputs, train_ml_models
+from panels import record_assessment, render_report_panel, render_risk_path, render_what_if
+
+
+def render():
+    models = train_ml_models()
+    if not models:
+        return
+    
+    st.markdown("### 🧬 Diabetes Risk Prediction")
+    st.markdown("*Advanced metabolic analysis using clinical indicators*")
+    
+    with st.form("diabetes_prediction"):
+        st.markdown("#### 🩸 Metabolic Assessment Parameters")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**🤰 Medical History**")
+            pregnancies = st.number_input("Number of Pregnancies", 0, 15, 0, 
+                help="Total number of pregnancies (0 for males)")
+            age = st.number_input("Age", 18, 100, 35, help="Current age in years")
+            bmi = st.number_input("Body Mass Index (BMI)", 15.0, 50.0, 25.0, 0.1,
+                help="BMI = weight(kg) / height(m)²")
+            dpf = st.number_input("Diabetes Pedigree Function", 0.0, 3.0, 0.5, 0.01,
+                help="Genetic diabetes risk factor (family history score)")
+            
+        with col2:
+            st.markdown("**🩸 Laboratory Results**")
+            glucose = st.number_input("Plasma Glucose Concentration (mg/dL)", 50, 300, 120,
+                help="2-hour oral glucose tolerance test result")
+            bp = st.number_input("Diastolic Blood Pressure (mmHg)", 40, 200, 80,
+                help="Diastolic blood pressure measurement")
+            skin = st.number_input("Triceps Skin Fold Thickness (mm)", 0, 100, 20,
+                help="Measure of body fat distribution")
+            insulin = st.number_input("2-Hour Serum Insulin (μU/mL)", 0, 900, 80,
+                help="Insulin level after glucose challenge")
+        
+        # BMI Helper
+        st.markdown("#### 📏 BMI Calculator Helper")
+        col3, col4 = st.columns(2)
+        with col3:
+            height_cm = st.number_input("Height (cm)", 140, 220, 170, help="For BMI calculation")
+        with col4:
+            weight_kg = st.number_input("Weight (kg)", 40, 200, 70, help="For BMI calculation")
+            calculated_bmi = weight_kg / ((height_cm/100) ** 2)
+            st.info(f"Calculated BMI: {calculated_bmi:.1f}")
+        
+        submitted = st.form_submit_button("🔬 Analyze Diabetes Risk", use_container_width=True)
+    
+    if submitted:
+        # Use calculated BMI if not manually entered
+        if bmi == 25.0:  # Default value
+            bmi = calculated_bmi
+        
+        # Prepare input for model
+        input_data = np.array([[pregnancies, glucose, bp, skin, insulin, bmi, dpf, age]])
+        
+        st.session_state['diabetes_input'] = input_data[0].tolist()
+        record_model_inputs('diabetes', input_data)
+        
+        # Make prediction
+        model, features = models['diabetes']
+        prediction = model.predict(input_data)[0]
+        probability = model.predict_proba(input_data)[0]
+        st.session_state['diabetes_result'] = {
+            'form': (pregnancies, glucose, bp, skin, insulin, bmi, dpf, age),
+            'prediction': int(prediction), 'probability': probability.tolist(), 'advice': None
+        }
+    
+    result = st.session_state.get('diabetes_result')
+    if result:
+        pregnancies, glucose, bp, skin, insulin, bmi, dpf, age = result['form']
+        prediction, probability = result['prediction'], np.array(result['probability'])
+        model, features = models['diabetes']
+        
+        # Risk categorization
+        risk_prob = probability[1] * 100
+        if risk_prob < 25:
+            risk_category = "Low Risk"
+            risk_color = "green"
+            risk_icon = "✅"
+        elif risk_prob < 75:
+            risk_category = "Moderate Risk"
+            risk_color = "orange"
+            risk_icon = "⚠️"
+        else:
+            risk_category = "High Risk"
+            risk_color = "red"
+            risk_icon = "🚨"
+        
+        # BMI Category
+        if bmi < 18.5:
+            bmi_cat = "Underweight"
+        elif bmi < 25:
+            bmi_cat = "Normal"
+        elif bmi < 30:
+            bmi_cat = "Overweight"
+        else:
+            bmi_cat = "Obese"
+        
+        # Display Results
+        st.markdown("### 📊 Diabetes Risk Assessment Results")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🧬 Risk Status</h3>
+                <h2 style="color: {risk_color};">{risk_category}</h2>
+                <p>Diabetes Likelihood</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">📊 Probability</h3>
+                <h2>{risk_prob:.1f}%</h2>
+                <p>Risk Percentage</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🎯 Confidence</h3>
+                <h2>{max(probability)*100:.1f}%</h2>
+                <p>Model Certainty</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Risk Status Display
+        if prediction == 1:
+            st.markdown(f"""
+            <div class="error-box">
+                <h3>{risk_icon} <strong>Elevated Diabetes Risk Detected</strong></h3>
+                <p>The analysis indicates increased risk for Type 2 diabetes based on your metabolic profile. 
+                Consider consulting an endocrinologist for comprehensive diabetes screening and prevention planning.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-box">
+                <h3>{risk_icon} <strong>Low Diabetes Risk</strong></h3>
+                <p>Current metabolic indicators suggest lower diabetes risk. Continue maintaining healthy lifestyle 
+                habits and regular monitoring of blood glucose levels.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Metabolic Profile Analysis
+        st.markdown("#### 🔍 Metabolic Profile Analysis")
+        
+        # Create metabolic indicators chart
+        metabolic_data = {
+            'Glucose Level': glucose,
+            'BMI': bmi,
+            'Blood Pressure': bp,
+            'Insulin': insulin/10,  # Scale for visualization
+            'Age Factor': age,
+            'Family Risk': dpf * 100
+        }
+        
+        fig = px.bar(
+            x=list(metabolic_data.keys()),
+            y=list(metabolic_data.values()),
+            title="Metabolic Risk Factors Profile",
+            labels={'x': 'Risk Factors', 'y': 'Relative Values'},
+            color=list(metabolic_data.values()),
+            color_continuous_scale="RdYlBu_r"
+        )
+        fig.update_layout(height=350, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Risk factors identification
+        risk_factors = []
+        if glucose > 140: risk_factors.append(f"Elevated glucose ({glucose} mg/dL)")
+        if bmi > 30: risk_factors.append(f"Obesity (BMI {bmi:.1f})")
+        elif bmi > 25: risk_factors.append(f"Overweight (BMI {bmi:.1f})")
+        if bp > 90: risk_factors.append(f"High blood pressure ({bp} mmHg)")
+        if age > 45: risk_factors.append(f"Advanced age ({age} years)")
+        if dpf > 1.0: risk_factors.append(f"Strong family history (DPF {dpf:.2f})")
+        if insulin < 50: risk_factors.append(f"Low insulin response ({insulin} μU/mL)")
+        
+        if risk_factors:
+            st.markdown(f"""
+            <div class="warning-box">
+                <strong>🔍 Risk Factors Identified:</strong><br>
+                • {('<br>• ').join(risk_factors)}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Feature Importance Display
+        if hasattr(model, 'feature_importances_'):
+            feature_importance = dict(zip(features, model.feature_importances_))
+            sorted_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
+            
+            st.markdown("#### 📈 Most Important Risk Factors")
+            top_features = sorted_features[:5]
+            
+            fig_importance = px.bar(
+                x=[f[1] for f in top_features],
+                y=[f[0] for f in top_features],
+                orientation='h',
+                title="Top 5 Diabetes Risk Predictors",
+                labels={'x': 'Importance Score', 'y': 'Clinical Parameters'},
+                color=[f[1] for f in top_features],
+                color_continuous_scale="viridis"
+            )
+            fig_importance.update_layout(height=300, showlegend=False)
+            st.plotly_chart(fig_importance, use_container_width=True)
+        
+        # AI Diabetes Recommendations
+        health_data = {
+            'risk_level': 'high' if prediction == 1 else 'low',
+            'diabetes_risk': probability[1],
+            'glucose': glucose,
+            'bmi': bmi,
+            'age': age
+        }
+        
+        # Ask the LLM once per submission; later reruns reuse the stored answer
+        if result['advice'] is None:
+            with st.spinner("🤖 Generating diabetes prevention recommendations..."):
+                prompt = f"""Diabetes Risk Assessment:
+                Risk Level: {risk_category} ({risk_prob:.1f}% probability)
+                Patient Profile: {age}-year-old, BMI {bmi:.1f} ({bmi_cat})
+                Lab Results: Glucose {glucose} mg/dL, BP {bp} mmHg, Insulin {insulin} μU/mL
+                Risk Factors: {', '.join(risk_factors) if risk_factors else 'None major identified'}
+                Family History Score: {dpf:.2f}
+                
+                Provide comprehensive diabetes prevention/management recommendations with specific dietary and lifestyle interventions."""
+                
+                result['advice'] = get_health_insights(prompt, health_data)
+            
+            record_assessment('diabetes', reports.new_assessment(
+                'diabetes', "Diabetes Risk Assessment",
+                inputs={'Age': age, 'Pregnancies': pregnancies, 'Glucose (mg/dL)': glucose,
+                        'Diastolic BP (mmHg)': bp, 'Skin Thickness (mm)': skin, 'Insulin (μU/mL)': insulin,
+                        'BMI': f"{bmi:.1f}", 'Diabetes Pedigree Function': f"{dpf:.2f}"},
+                metrics={'Prediction': risk_category, 'Risk Probability': f"{risk_prob:.1f}%",
+                         'BMI Category': bmi_cat},
+                status=f"{risk_icon} {risk_category}",
+                risk_factors=risk_factors, advice=result['advice'], figures=[fig]
+            ), level=risk_category.removesuffix(" Risk"), age=age)
+        diabetes_advice = result['advice']
+        
+        st.markdown("### 💊 Diabetes Prevention & Management")
+        st.markdown(f"""
+        <div class="prediction-card">
+            <div style="font-size: 1.1rem; line-height: 1.6;">
+                {diabetes_advice}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    render_report_panel('diabetes')
+    render_what_if('diabetes', *models['diabetes'])
+    render_risk_path('diabetes', *models['diabetes'])
@@ -0,0 +1,301 @@
+"""AI Health Copilot - General Health Analysis page"""
+
+import plotly.graph_objects as go
+import streamlit as st
+
+import reports
+import risk_rules
+import simulation
+from app_common import get_health_insights, train_ml_models
+from panels import projection_chart, record_assessment, render_report_panel
+
+
+@st.fragment
+def render_general_projection():
+    """Monte Carlo projection of the last General Health submission under a lifestyle plan"""
+    profile = st.session_state.get('general_profile')
+    if profile is None:
+        return
+    
+    st.markdown("### 📈 Lifestyle Change Projection")
+    st.markdown("*Thousands of simulated futures with realistic adherence and measurement noise*")
+    
+    defaults = simulation.default_plan(profile)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        exercise_steps = st.slider("Exercise more (steps)", 0, 4, defaults['exercise_steps'], key="plan_exercise")
+        diet_steps = st.slider("Improve diet (steps)", 0, 3, defaults['diet_steps'], key="plan_diet")
+    with col2:
+        sleep_steps = st.slider("Sleep better (steps)", 0, 4, defaults['sleep_steps'], key="plan_sleep")
+        stress_steps = st.slider("Reduce stress (steps)", 0, 3, defaults['stress_steps'], key="plan_stress")
+    with col3:
+        alcohol_steps = st.slider("Drink less (steps)", 0, 3, defaults['alcohol_steps'], key="plan_alcohol")
+        weight_loss_kg = st.slider("Lose weight (kg)", 0.0, 30.0, float(defaults['weight_loss_kg']), 0.5,
+            key="plan_weight")
+    quit_smoking = st.checkbox("Quit smoking", defaults['quit_smoking'], key="plan_smoking",
+        disabled=profile['smoking'] != "Current")
+    plan = {
+        'exercise_steps': exercise_steps, 'diet_steps': diet_steps, 'sleep_steps': sleep_steps,
+        'stress_steps': stress_steps, 'alcohol_steps': alcohol_steps,
+        'weight_loss_kg': weight_loss_kg, 'quit_smoking': quit_smoking
+    }
+    
+    projection = simulation.project_general_risk(profile, plan, seed=42)
+    st.plotly_chart(projection_chart(projection, "Projected Overall Risk Score", "Risk Score (0-10)", [0, 10.5]),
+        use_container_width=True)
+    
+    low_now = projection['without_plan']['low_share'][-1] * 100
+    low_plan = projection['with_plan']['low_share'][-1] * 100
+    st.markdown(f"""
+    <div class="info-box">
+        <strong>In 12 months:</strong> median risk score {projection['with_plan']['p50'][-1]:.0f}/10 with the plan
+        vs {projection['without_plan']['p50'][-1]:.0f}/10 without;
+        {low_plan:.0f}% of simulated outcomes reach low risk (vs {low_now:.0f}%).
+        <p style="font-size: 0.85rem; margin: 0.5rem 0 0 0; opacity: 0.8;">
+        Based on {projection['samples']:,} simulated futures - an illustration, not a medical forecast.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # The same plan applied to the last heart/diabetes submissions in this session;
+    # the models are only needed (and loaded) when one of those pages was used
+    for condition, label in (('heart', "Heart Disease"), ('diabetes', "Diabetes")):
+        row = st.session_state.get(f'{condition}_input')
+        if row is None:
+            continue
+        models = train_ml_models()
+        if not models:
+            continue
+        model, features = models[condition]
+        model_projection = simulation.project_model_risk(model, row, features, plan,
+            height_cm=profile['height'], seed=42)
+        st.plotly_chart(projection_chart(model_projection, f"Projected {label} Risk (ML model)",
+            "Risk Probability (%)", [0, 100]), use_container_width=True)
+
+
+def render():
+    st.markdown("### 🩺 Comprehensive Health Risk Assessment")
+    st.markdown("*Complete lifestyle and health factor analysis*")
+    
+    with st.form("health_assessment"):
+        st.markdown("#### 📋 Personal & Lifestyle Information")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**👤 Personal Details**")
+            age = st.number_input("Age", 18, 100, 35, help="Your current age")
+            gender = st.selectbox("Gender", ["Male", "Female"], help="Biological sex")
+            height = st.number_input("Height (cm)", 140, 220, 170, help="Height in centimeters")
+            weight = st.number_input("Weight (kg)", 40, 200, 70, help="Current weight in kilograms")
+            
+        with col2:
+            st.markdown("**🏃‍♂️ Lifestyle Factors**")
+            exercise = st.selectbox("Exercise Frequency", 
+                risk_rules.EXERCISE_OPTIONS,
+                help="How often do you exercise?")
+            diet = st.selectbox("Diet Quality", 
+                risk_rules.DIET_OPTIONS,
+                help="Overall quality of your diet")
+            sleep = st.selectbox("Sleep Hours/Night", 
+                risk_rules.SLEEP_OPTIONS,
+                help="Average sleep duration")
+            stress = st.selectbox("Stress Level", 
+                risk_rules.STRESS_OPTIONS,
+                help="Your typical stress level")
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            st.markdown("**🚭 Health Habits**")
+            smoking = st.selectbox("Smoking Status", 
+                risk_rules.SMOKING_OPTIONS,
+                help="Smoking history")
+            alcohol = st.selectbox("Alcohol Consumption", 
+                risk_rules.ALCOHOL_OPTIONS,
+                help="Alcohol consumption pattern")
+            
+        with col4:
+            st.markdown("**🧬 Health History**")
+            family_history = st.multiselect("Family History", 
+                risk_rules.FAMILY_HISTORY_OPTIONS,
+                help="Family history of chronic diseases")
+            symptoms = st.multiselect("Current Symptoms", 
+                risk_rules.SYMPTOM_OPTIONS,
+                help="Any current health symptoms")
+        
+        submitted = st.form_submit_button("🔍 Analyze Health Status", use_container_width=True)
+    
+    if submitted:
+        profile = {
+            'age': age, 'height': height, 'weight': weight,
+            'exercise': exercise, 'diet': diet, 'sleep': sleep, 'stress': stress,
+            'smoking': smoking, 'alcohol': alcohol,
+            'family_history': family_history, 'symptoms': symptoms
+        }
+        st.session_state['general_profile'] = profile
+        st.session_state['general_result'] = {'gender': gender, 'insights': None}
+    
+    # Results live in session state, so reruns from other panels redraw them without resubmitting
+    result = st.session_state.get('general_result')
+    if result:
+        profile, gender = st.session_state['general_profile'], result['gender']
+        age, height, weight = profile['age'], profile['height'], profile['weight']
+        exercise, diet, sleep, stress = profile['exercise'], profile['diet'], profile['sleep'], profile['stress']
+        smoking, alcohol = profile['smoking'], profile['alcohol']
+        family_history, symptoms = profile['family_history'], profile['symptoms']
+        
+        # Advanced Risk Scoring Algorithm
+        scored = risk_rules.score_general_health(profile)
+        bmi, risk_score, risk_factors = scored['bmi'], scored['risk_score'], scored['risk_factors']
+        risk_level, status_class, icon = scored['risk_level'], scored['status_class'], scored['icon']
+        bmi_category = scored['bmi_category']
+        
+        # Display Results Section
+        st.markdown("### 📊 Health Assessment Results")
+        
+        # Metrics Row
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea; margin: 0;">🎯 Risk Score</h3>
+                <h2 style="margin: 0.5rem 0;">{risk_score}/10</h2>
+                <p style="margin: 0; color: #7f8c8d;">Overall Health Risk</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea; margin: 0;">📊 BMI</h3>
+                <h2 style="margin: 0.5rem 0;">{bmi:.1f}</h2>
+                <p style="margin: 0; color: #7f8c8d;">{bmi_category}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea; margin: 0;">⚖️ Risk Level</h3>
+                <h2 style="margin: 0.5rem 0;">{risk_level}</h2>
+                <p style="margin: 0; color: #7f8c8d;">Health Status</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col4:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea; margin: 0;">👤 Profile</h3>
+                <h2 style="margin: 0.5rem 0;">{age}yr</h2>
+                <p style="margin: 0; color: #7f8c8d;">{gender}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Risk Status Display
+        if status_class == "success":
+            st.markdown(f"""
+            <div class="success-box">
+                <h3>{icon} <strong>{risk_level} Risk</strong> - Excellent Health Indicators!</h3>
+                <p>Your health profile shows outstanding indicators. Continue maintaining your healthy lifestyle patterns.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        elif status_class == "warning":
+            st.markdown(f"""
+            <div class="warning-box">
+                <h3>{icon} <strong>{risk_level} Risk</strong> - Room for Improvement</h3>
+                <p>Your health profile shows some areas that could benefit from lifestyle modifications.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="error-box">
+                <h3>{icon} <strong>{risk_level} Risk</strong> - Action Required</h3>
+                <p>Your health profile indicates several risk factors that need attention. Consider consulting healthcare professionals.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Risk Factors Analysis
+        if risk_factors:
+            st.markdown("#### 🔍 Risk Factors Identified")
+            risk_factor_text = " • ".join(risk_factors)
+            st.markdown(f"""
+            <div class="info-box">
+                <strong>Key Areas for Attention:</strong><br>
+                • {risk_factor_text.replace(' • ', '<br>• ')}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Visual Risk Gauge
+        fig = go.Figure(go.Indicator(
+            mode = "gauge+number+delta",
+            value = risk_score,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "Health Risk Assessment", 'font_size': 20},
+            delta = {'reference': 5},
+            gauge = {
+                'axis': {'range': [None, 10], 'tickwidth': 1, 'tickcolor': "darkblue"},
+                'bar': {'color': "darkblue"},
+                'steps': [
+                    {'range': [0, 3], 'color': "lightgreen"},
+                    {'range': [3, 6], 'color': "yellow"},
+                    {'range': [6, 10], 'color': "red"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 8
+                }
+            }
+        ))
+        fig.update_layout(height=350, font={'color': "darkblue", 'family': "Arial"})
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Health Insights
+        health_data = {
+            'risk_level': risk_level.lower(),
+            'age': age,
+            'bmi': bmi,
+            'exercise': exercise,
+            'diet': diet,
+            'sleep': sleep,
+            'risk_factors': risk_factors
+        }
+        
+        # Ask the LLM once per submission; later reruns reuse the stored answer
+        if result['insights'] is None:
+            with st.spinner("🤖 Generating personalized health insights..."):
+                prompt = f"""Health Assessment Analysis:
+                Patient Profile: {age}-year-old {gender}, BMI {bmi:.1f} ({bmi_category})
+                Risk Assessment: {risk_level} risk (Score: {risk_score}/10)
+                Lifestyle: Exercise {exercise}, Diet {diet}, Sleep {sleep}
+                Risk Factors: {', '.join(risk_factors) if risk_factors else 'None identified'}
+                Family History: {', '.join(family_history) if family_history else 'None reported'}
+                
+                Provide comprehensive health recommendations with 4 specific actionable steps."""
+                
+                result['insights'] = get_health_insights(prompt, health_data)
+            
+            record_assessment('general', reports.new_assessment(
+                'general', "General Health Risk Assessment",
+                inputs={'Age': age, 'Gender': gender, 'Height (cm)': height, 'Weight (kg)': weight,
+                        'Exercise': exercise, 'Diet': diet, 'Sleep (hours)': sleep, 'Stress': stress,
+                        'Smoking': smoking, 'Alcohol': alcohol,
+                        'Family History': ', '.join(family_history) or 'None',
+                        'Symptoms': ', '.join(symptoms) or 'None'},
+                metrics={'Risk Score': f"{risk_score}/10", 'Risk Level': risk_level,
+                         'BMI': f"{bmi:.1f} ({bmi_category})"},
+                status=f"{icon} {risk_level} Risk",
+                risk_factors=risk_factors, advice=result['insights'], figures=[fig]
+            ), level=risk_level, age=age)
+        insights = result['insights']
+        
+        st.markdown("### 🤖 Personalized Health Insights")
+        st.markdown(f"""
+        <div class="prediction-card">
+            <div style="font-size: 1.1rem; line-height: 1.6;">
+                {insights}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    render_report_panel('general')
+    render_general_projection()
@@ -0,0 +1,245 @@
+"""AI Health Copilot - Heart Disease Prediction page"""
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import reports
+from app_common import get_health_insights, record_model_inputs, train_ml_models
+from panels import record_assessment, render_report_panel, render_risk_path, render_what_if
+
+
+def render():
+    models = train_ml_models()
+    if not models:
+        return
+    
+    st.markdown("### ❤️ Cardiovascular Risk Prediction")
+    st.markdown("*Advanced ML analysis using clinical parameters*")
+    
+    with st.form("heart_prediction"):
+        st.markdown("#### 🫀 Clinical Assessment Parameters")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**📊 Vital Signs & Demographics**")
+            age = st.number_input("Age", 20, 100, 50, help="Patient age in years")
+            sex = st.selectbox("Sex", ["Male", "Female"], help="Biological sex")
+            trestbps = st.number_input("Resting Blood Pressure (mmHg)", 80, 200, 120, help="Blood pressure at rest")
+            chol = st.number_input("Serum Cholesterol (mg/dL)", 100, 400, 200, help="Total cholesterol level")
+            thalach = st.number_input("Maximum Heart Rate Achieved", 60, 220, 150, help="Peak heart rate during exercise")
+            
+        with col2:
+            st.markdown("**🩺 Clinical Indicators**")
+            cp = st.selectbox("Chest Pain Type", 
+                ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"],
+                help="Type of chest pain experienced")
+            fbs = st.selectbox("Fasting Blood Sugar > 120 mg/dL", 
+                ["No", "Yes"], help="Elevated fasting glucose")
+            restecg = st.selectbox("Resting ECG Results", 
+                ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"],
+                help="Electrocardiogram findings")
+            exang = st.selectbox("Exercise Induced Angina", 
+                ["No", "Yes"], help="Chest pain during exercise")
+            oldpeak = st.number_input("ST Depression Induced by Exercise", 
+                0.0, 6.0, 1.0, 0.1, help="ST segment depression")
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            slope = st.selectbox("Slope of Peak Exercise ST Segment", 
+                ["Upsloping", "Flat", "Downsloping"],
+                help="ST segment slope pattern")
+            ca = st.selectbox("Number of Major Vessels Colored by Fluoroscopy", 
+                [0, 1, 2, 3], help="Coronary angiography results")
+        with col4:
+            thal = st.selectbox("Thalassemia Type", 
+                ["Normal", "Fixed Defect", "Reversible Defect"],
+                help="Thallium stress test results")
+        
+        submitted = st.form_submit_button("🔬 Predict Heart Disease Risk", use_container_width=True)
+    
+    if submitted:
+        # Prepare input data for model
+        input_data = np.array([[
+            age,
+            1 if sex == "Male" else 0,
+            ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"].index(cp),
+            trestbps,
+            chol,
+            1 if fbs == "Yes" else 0,
+            ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"].index(restecg),
+            thalach,
+            1 if exang == "Yes" else 0,
+            oldpeak,
+            ["Upsloping", "Flat", "Downsloping"].index(slope),
+            ca,
+            ["Normal", "Fixed Defect", "Reversible Defect"].index(thal) + 1
+        ]])
+        
+        st.session_state['heart_input'] = input_data[0].tolist()
+        record_model_inputs('heart', input_data)
+        
+        # Make prediction
+        model, features = models['heart']
+        prediction = model.predict(input_data)[0]
+        probability = model.predict_proba(input_data)[0]
+        st.session_state['heart_result'] = {
+            'form': (age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal),
+            'prediction': int(prediction), 'probability': probability.tolist(), 'advice': None
+        }
+    
+    result = st.session_state.get('heart_result')
+    if result:
+        age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal = result['form']
+        prediction, probability = result['prediction'], np.array(result['probability'])
+        
+        # Calculate risk category
+        risk_prob = probability[1] * 100
+        if risk_prob < 30:
+            risk_category = "Low Risk"
+            risk_color = "green"
+            risk_icon = "✅"
+        elif risk_prob < 70:
+            risk_category = "Moderate Risk"
+            risk_color = "orange"
+            risk_icon = "⚠️"
+        else:
+            risk_category = "High Risk"
+            risk_color = "red"
+            risk_icon = "🚨"
+        
+        # Display Results
+        st.markdown("### 📊 Cardiovascular Risk Assessment Results")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🫀 Prediction</h3>
+                <h2 style="color: {risk_color};">{risk_category}</h2>
+                <p>ML Model Assessment</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">📊 Risk Probability</h3>
+                <h2>{risk_prob:.1f}%</h2>
+                <p>Heart Disease Likelihood</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🎯 Confidence</h3>
+                <h2>{max(probability)*100:.1f}%</h2>
+                <p>Model Certainty</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Risk Status Display
+        if prediction == 1:
+            st.markdown(f"""
+            <div class="error-box">
+                <h3>{risk_icon} <strong>Elevated Heart Disease Risk Detected</strong></h3>
+                <p>The ML model indicates increased cardiovascular risk based on your clinical parameters. 
+                Immediate consultation with a cardiologist is recommended for comprehensive evaluation.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-box">
+                <h3>{risk_icon} <strong>Low Heart Disease Risk</strong></h3>
+                <p>The analysis suggests lower cardiovascular risk. Continue maintaining heart-healthy lifestyle habits 
+                and regular medical check-ups.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Risk Probability Visualization
+        fig = px.bar(
+            x=['Low Risk', 'High Risk'],
+            y=[probability[0]*100, probability[1]*100],
+            title="Heart Disease Risk Probability Distribution",
+            labels={'x': 'Risk Category', 'y': 'Probability (%)'},
+            color=['Low Risk', 'High Risk'],
+            color_discrete_map={'Low Risk': '#27ae60', 'High Risk': '#e74c3c'}
+        )
+        fig.update_layout(
+            height=400, 
+            showlegend=False,
+            title_font_size=16,
+            font_family="Arial"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Clinical Parameter Analysis
+        st.markdown("#### 🔍 Clinical Parameter Analysis")
+        
+        # Key risk factors identification
+        risk_factors = []
+        if age > 55: risk_factors.append(f"Advanced age ({age} years)")
+        if trestbps > 140: risk_factors.append(f"Elevated blood pressure ({trestbps} mmHg)")
+        if chol > 240: risk_factors.append(f"High cholesterol ({chol} mg/dL)")
+        if cp == "Typical Angina": risk_factors.append("Typical angina symptoms")
+        if exang == "Yes": risk_factors.append("Exercise-induced angina")
+        if thalach < 120: risk_factors.append(f"Reduced max heart rate ({thalach} bpm)")
+        
+        if risk_factors:
+            st.markdown(f"""
+            <div class="warning-box">
+                <strong>🔍 Key Risk Factors Identified:</strong><br>
+                • {('<br>• ').join(risk_factors)}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # AI Heart Health Recommendations
+        health_data = {
+            'risk_level': 'high' if prediction == 1 else 'low', 
+            'heart_risk': probability[1],
+            'age': age,
+            'bp': trestbps,
+            'cholesterol': chol
+        }
+        
+        # Ask the LLM once per submission; later reruns reuse the stored answer
+        if result['advice'] is None:
+            with st.spinner("🤖 Generating cardiovascular health recommendations..."):
+                prompt = f"""Cardiovascular Risk Analysis:
+                Assessment: {risk_category} ({risk_prob:.1f}% probability)
+                Patient: {age}-year-old {sex}
+                Clinical: BP {trestbps}, Cholesterol {chol}, Max HR {thalach}
+                Symptoms: {cp}, Exercise angina: {exang}
+                Risk factors: {', '.join(risk_factors) if risk_factors else 'None major'}
+                
+                Provide specific cardiovascular health recommendations and lifestyle modifications."""
+                
+                result['advice'] = get_health_insights(prompt, health_data)
+            
+            record_assessment('heart', reports.new_assessment(
+                'heart', "Cardiovascular Risk Assessment",
+                inputs={'Age': age, 'Sex': sex, 'Chest Pain Type': cp, 'Resting BP (mmHg)': trestbps,
+                        'Cholesterol (mg/dL)': chol, 'Fasting Blood Sugar > 120': fbs, 'Resting ECG': restecg,
+                        'Max Heart Rate': thalach, 'Exercise Angina': exang, 'ST Depression': oldpeak,
+                        'ST Slope': slope, 'Major Vessels': ca, 'Thalassemia': thal},
+                metrics={'Prediction': risk_category, 'Risk Probability': f"{risk_prob:.1f}%",
+                         'Model Certainty': f"{max(probability)*100:.1f}%"},
+                status=f"{risk_icon} {risk_category}",
+                risk_factors=risk_factors, advice=result['advice'], figures=[fig]
+            ), level=risk_category.removesuffix(" Risk"), age=age)
+        heart_advice = result['advice']
+        
+        st.markdown("### 🩺 Cardiovascular Health Recommendations")
+        st.markdown(f"""
+        <div class="prediction-card">
+            <div style="font-size: 1.1rem; line-height: 1.6;">
+                {heart_advice}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    render_report_panel('heart')
+    render_what_if('heart', *models['heart'])
+    render_risk_path('heart', *models['heart'])
@@ -0,0 +1,282 @@
+"""AI Health Copilot - Parkinson's Voice Screening page"""
+
+import math
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import charts
+import cohort
+import reports
+import scenarios
+from app_common import get_health_insights, load_health_datasets, record_model_inputs, train_ml_models
+from panels import (record_assessment, render_batch_scoring, render_download, render_report_panel,
+                    render_score_histograms)
+
+# Form sections: heading -> {dataset column: label}
+FEATURE_GROUPS = {
+    "**🎵 Pitch**": {
+        'MDVP:Fo(Hz)': "Average vocal fundamental frequency (Hz)",
+        'MDVP:Fhi(Hz)': "Maximum vocal fundamental frequency (Hz)",
+        'MDVP:Flo(Hz)': "Minimum vocal fundamental frequency (Hz)"
+    },
+    "**〰️ Jitter (frequency variation)**": {
+        'MDVP:Jitter(%)': "Jitter (%)",
+        'MDVP:Jitter(Abs)': "Absolute jitter (s)",
+        'MDVP:RAP': "Relative average perturbation",
+        'MDVP:PPQ': "Five-point period perturbation quotient",
+        'Jitter:DDP': "Average absolute difference of differences of periods"
+    },
+    "**📶 Shimmer (amplitude variation)**": {
+        'MDVP:Shimmer': "Local shimmer",
+        'MDVP:Shimmer(dB)': "Local shimmer (dB)",
+        'Shimmer:APQ3': "Three-point amplitude perturbation quotient",
+        'Shimmer:APQ5': "Five-point amplitude perturbation quotient",
+        'MDVP:APQ': "Eleven-point amplitude perturbation quotient",
+        'Shimmer:DDA': "Average absolute difference between consecutive amplitude differences"
+    },
+    "**🔊 Noise and Nonlinear Dynamics**": {
+        'NHR': "Noise-to-harmonics ratio",
+        'HNR': "Harmonics-to-noise ratio (dB)",
+        'RPDE': "Recurrence period density entropy",
+        'DFA': "Detrended fluctuation analysis exponent",
+        'spread1': "Fundamental frequency variation (spread1)",
+        'spread2': "Fundamental frequency variation (spread2)",
+        'D2': "Correlation dimension",
+        'PPE': "Pitch period entropy"
+    }
+}
+
+
+def _input_format(typical):
+    """(step, format) giving about three significant digits around a typical value"""
+    decimals = max(0, 2 - math.floor(math.log10(abs(typical)))) if typical else 2
+    return 10.0 ** -decimals, f"%.{decimals}f"
+
+
+def render():
+    models = train_ml_models()
+    if not models:
+        return
+    data = load_health_datasets()
+    if 'parkinsons' not in models or not data or 'parkinsons' not in data:
+        st.warning("⚠️ Parkinson's screening needs parkinsons.csv next to the app.")
+        return
+    model, features = models['parkinsons']
+    X_train, y_train = data['parkinsons']
+    ranges = cohort.VALID_RANGES['parkinsons']
+
+    st.markdown("### 🎙️ Parkinson's Voice Screening")
+    st.markdown("*Screening from 22 acoustic measures of a sustained vowel recording*")
+
+    st.markdown("""
+    <div class="info-box">
+        <strong>Where the numbers come from:</strong> voice analysis software (such as Praat or MDVP) reports these
+        measures for a sustained "aaah" phonation. Enter one recording below, or upload a file of many recordings
+        with the same column names as the training data (<code>name</code> is kept as the recording id).
+    </div>
+    """, unsafe_allow_html=True)
+
+    single, batch = st.tabs(["🎙️ One Recording", "📁 Batch Upload"])
+
+    with single:
+        render_single(model, features, X_train, y_train, ranges)
+
+    with batch:
+        render_batch(model, features)
+
+
+def render_single(model, features, X_train, y_train, ranges):
+    medians = X_train.median()
+
+    with st.form("parkinsons_prediction"):
+        st.markdown("#### 🎙️ Voice Measures (defaults are the training set medians)")
+        values = {}
+        for heading, group in FEATURE_GROUPS.items():
+            st.markdown(heading)
+            cols = st.columns(3)
+            for i, (feature, label) in enumerate(group.items()):
+                low, high = ranges[feature]
+                step, fmt = _input_format(medians[feature])
+                default = min(max(round(float(medians[feature]), 8), low), high)
+                with cols[i % 3]:
+                    values[feature] = st.number_input(label, float(low), float(high), default, step, format=fmt,
+                        help=feature)
+
+        submitted = st.form_submit_button("🔬 Screen Recording", use_container_width=True)
+
+    if submitted:
+        input_data = np.array([[values[feature] for feature in features]])
+
+        st.session_state['parkinsons_input'] = input_data[0].tolist()
+        record_model_inputs('parkinsons', input_data)
+
+        prediction = model.predict(input_data)[0]
+        probability = model.predict_proba(input_data)[0]
+        st.session_state['parkinsons_result'] = {
+            'form': input_data[0].tolist(),
+            'prediction': int(prediction), 'probability': probability.tolist(), 'advice': None
+        }
+
+    result = st.session_state.get('parkinsons_result')
+    if result:
+        row = dict(zip(features, result['form']))
+        prediction, probability = result['prediction'], np.array(result['probability'])
+
+        risk_prob = probability[1] * 100
+        low_threshold, high_threshold = scenarios.RISK_THRESHOLDS['parkinsons']
+        if risk_prob < low_threshold:
+            risk_category, risk_color, risk_icon = "Low Risk", "green", "✅"
+        elif risk_prob < high_threshold:
+            risk_category, risk_color, risk_icon = "Moderate Risk", "orange", "⚠️"
+        else:
+            risk_category, risk_color, risk_icon = "High Risk", "red", "🚨"
+
+        st.markdown("### 📊 Voice Screening Results")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🎙️ Screening</h3>
+                <h2 style="color: {risk_color};">{risk_category}</h2>
+                <p>ML Model Assessment</p>
+            </div>
+            """, unsafe_allow_html=True)
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">📊 Probability</h3>
+                <h2>{risk_prob:.1f}%</h2>
+                <p>Parkinsonian Voice Pattern</p>
+            </div>
+            """, unsafe_allow_html=True)
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3 style="color: #667eea;">🎯 Confidence</h3>
+                <h2>{max(probability)*100:.1f}%</h2>
+                <p>Model Certainty</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        if prediction == 1:
+            st.markdown(f"""
+            <div class="error-box">
+                <h3>{risk_icon} <strong>Voice Pattern Similar to Parkinson's Disease</strong></h3>
+                <p>The acoustic measures resemble recordings of people with Parkinson's disease. This is a screening
+                signal, not a diagnosis - a neurologist can assess it properly.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-box">
+                <h3>{risk_icon} <strong>Voice Pattern Within the Typical Range</strong></h3>
+                <p>The acoustic measures resemble recordings of people without Parkinson's disease. Mention any new
+                tremor, stiffness or changes in speech to your doctor regardless.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        fig = px.bar(
+            x=['Typical', "Parkinsonian"],
+            y=[probability[0]*100, probability[1]*100],
+            title="Voice Pattern Probability Distribution",
+            labels={'x': 'Voice Pattern', 'y': 'Probability (%)'},
+            color=['Typical', "Parkinsonian"],
+            color_discrete_map={'Typical': '#27ae60', "Parkinsonian": '#e74c3c'}
+        )
+        fig.update_layout(height=400, showlegend=False, title_font_size=16, font_family="Arial")
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Measures outside the middle 90% of the healthy recordings in the training data
+        healthy = X_train[y_train == 0].quantile([0.05, 0.95])
+        labels = {feature: label for group in FEATURE_GROUPS.values() for feature, label in group.items()}
+        risk_factors = []
+        for feature in features:
+            low, high = healthy.at[0.05, feature], healthy.at[0.95, feature]
+            if row[feature] > high:
+                risk_factors.append(f"High {labels.get(feature, feature).lower()} ({row[feature]:.4g})")
+            elif row[feature] < low:
+                risk_factors.append(f"Low {labels.get(feature, feature).lower()} ({row[feature]:.4g})")
+
+        if risk_factors:
+            st.markdown(f"""
+            <div class="warning-box">
+                <strong>🔍 Measures Outside the Range of Healthy Voices:</strong><br>
+                • {('<br>• ').join(risk_factors)}
+            </div>
+            """, unsafe_allow_html=True)
+
+        health_data = {
+            'risk_level': 'high' if prediction == 1 else 'low',
+            'parkinsons_risk': probability[1]
+        }
+
+        # Ask the LLM once per submission; later reruns reuse the stored answer
+        if result['advice'] is None:
+            with st.spinner("🤖 Generating voice and movement health recommendations..."):
+                prompt = f"""Parkinson's Voice Screening:
+                Result: {risk_category} ({risk_prob:.1f}% probability of a parkinsonian voice pattern)
+                Measures outside the healthy range: {', '.join(risk_factors) if risk_factors else 'None'}
+
+                Explain what this screening result means, when to see a neurologist, and practical voice,
+                exercise and daily-living recommendations."""
+
+                result['advice'] = get_health_insights(prompt, health_data)
+
+            record_assessment('parkinsons', reports.new_assessment(
+                'parkinsons', "Parkinson's Voice Screening",
+                inputs={feature: f"{value:.6g}" for feature, value in row.items()},
+                metrics={'Screening': risk_category, 'Probability': f"{risk_prob:.1f}%",
+                         'Model Certainty': f"{max(probability)*100:.1f}%"},
+                status=f"{risk_icon} {risk_category}",
+                risk_factors=risk_factors, advice=result['advice'], figures=[fig]
+            ), level=risk_category.removesuffix(" Risk"))
+
+        st.markdown("### 🧠 Recommendations")
+        st.markdown(f"""
+        <div class="prediction-card">
+            <div style="font-size: 1.1rem; line-height: 1.6;">
+                {result['advice']}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    render_report_panel('parkinsons')
+
+
+def render_batch(model, features):
+    st.markdown("#### 📁 Screen Many Recordings")
+    st.markdown("One row per recording, with the 22 measure columns; other columns (such as `name`) are kept.")
+    st.download_button("⬇️ Download CSV template", ",".join(['name'] + features) + "\n",
+        file_name="voice_features_template.csv", mime="text/csv")
+
+    uploaded = st.file_uploader("Voice features CSV", type=["csv"], key="parkinsons_upload")
+    if uploaded is None:
+        return
+
+    batch = render_batch_scoring(uploaded, {'parkinsons': (model, features)}, 'parkinsons',
+                                 "🔍 Screen Recordings", noun="recordings")
+    if batch:
+        summary = batch['summary']
+        levels = summary['levels']['parkinsons']
+        cols = st.columns(4)
+        for col, (title, value) in zip(cols, [("🎙️ Recordings", summary['rows']),
+                                              ("✅ Low", levels['Low']), ("⚠️ Moderate", levels['Moderate']),
+                                              ("🚨 High", levels['High'])]):
+            with col:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <h3 style="color: #667eea; margin: 0;">{title}</h3>
+                    <h2 style="margin: 0.5rem 0;">{value:,}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+        render_score_histograms(summary, charts.file_version(str(batch['file'])))
+        if summary['invalid_rows']:
+            st.warning(f"⚠️ {summary['invalid_rows']:,} rows have missing or out-of-range measures - "
+                       "see the `problems` column.")
+
+        st.markdown(f"#### First {len(batch['preview'])} screened recordings")
+        st.dataframe(batch['preview'], use_container_width=True, hide_index=True)
+        render_download(batch['file'], "screened CSV", f"screened_{uploaded.name}")
@@ -0,0 +1,284 @@
+"""AI Health Copilot - Smart Health Tips page"""
+
+import streamlit as st
+
+import health_tips as tips
+import reports
+import simulation
+from app_common import get_advice_index, get_health_insights
+from panels import projection_chart, record_assessment, render_report_panel
+
+
+@st.fragment
+def render_tips_projection():
+    """Monte Carlo projection of the last Smart Health Tips health score under a plan"""
+    profile = st.session_state.get('tips_profile')
+    if profile is None:
+        return
+    
+    st.markdown("### 📈 Health Score Projection")
+    defaults = simulation.default_tips_plan(profile)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        activity_steps = st.slider("More active (steps)", 0, 4, defaults['activity_steps'], key="tips_plan_activity")
+    with col2:
+        sleep_steps = st.slider("Better sleep (steps)", 0, 3, defaults['sleep_steps'], key="tips_plan_sleep")
+    with col3:
+        stress_steps = st.slider("Less stress (steps)", 0, 3, defaults['stress_steps'], key="tips_plan_stress")
+    with col4:
+        healthy_diet = st.checkbox("Heart-healthy diet", defaults['healthy_diet'], key="tips_plan_diet")
+    plan = {'activity_steps': activity_steps, 'sleep_steps': sleep_steps,
+            'stress_steps': stress_steps, 'healthy_diet': healthy_diet}
+    
+    projection = simulation.project_health_score(profile, plan, seed=42)
+    st.plotly_chart(projection_chart(projection, "Projected Health Score", "Health Score (3-10)", [2.5, 10.5]),
+        use_container_width=True)
+    st.caption(f"Based on {projection['samples']:,} simulated futures with realistic adherence.")
+
+
+def render():
+    st.markdown("### 💡 Personalized Health & Wellness Guide")
+    st.markdown("*Evidence-based recommendations tailored to your profile*")
+    
+    with st.form("health_tips"):
+        st.markdown("#### 👤 Personal Health Profile")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**🎯 Health Goals & Demographics**")
+            age_group = st.selectbox("Age Group", 
+                tips.AGE_GROUPS,
+                help="Your age category")
+            health_goal = st.selectbox("Primary Health Goal", tips.HEALTH_GOALS,
+                help="Main health objective")
+            activity_level = st.selectbox("Current Activity Level", 
+                tips.ACTIVITY_LEVELS,
+                help="Your typical daily activity")
+            fitness_goal = st.selectbox("Fitness Focus", 
+                tips.FITNESS_GOALS,
+                help="Specific fitness objective")
+            
+        with col2:
+            st.markdown("**⏰ Lifestyle & Preferences**")
+            time_available = st.selectbox("Daily Time for Health Activities", 
+                tips.TIME_AVAILABLE,
+                help="Time you can dedicate daily")
+            dietary_preference = st.selectbox("Dietary Approach", tips.DIETARY_PREFERENCES,
+                help="Preferred eating pattern")
+            sleep_quality = st.selectbox("Sleep Quality", 
+                tips.SLEEP_QUALITY,
+                help="How well do you sleep?")
+            stress_level = st.selectbox("Current Stress Level", 
+                tips.STRESS_LEVELS,
+                help="Your typical stress level")
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            st.markdown("**🏥 Health Status**")
+            health_conditions = st.multiselect("Current Health Conditions", tips.HEALTH_CONDITIONS,
+                help="Any diagnosed conditions")
+            medications = st.selectbox("Taking Medications", 
+                tips.MEDICATIONS,
+                help="Current medication count")
+            
+        with col4:
+            st.markdown("**🎯 Specific Interests**")
+            wellness_focus = st.multiselect("Wellness Areas of Interest", tips.WELLNESS_FOCUS,
+                help="Areas you want to focus on")
+            technology_comfort = st.selectbox("Technology Comfort Level", 
+                tips.TECHNOLOGY_COMFORT,
+                help="Your preference for health technology")
+        
+        submitted = st.form_submit_button("💡 Generate Personalized Health Plan", use_container_width=True)
+    
+    if submitted:
+        profile = {
+            'age_group': age_group,
+            'health_goal': health_goal,
+            'activity_level': activity_level,
+            'time_available': time_available,
+            'dietary_preference': dietary_preference,
+            'sleep_quality': sleep_quality,
+            'stress_level': stress_level,
+            'health_conditions': health_conditions,
+            'wellness_focus': wellness_focus
+        }
+        
+        st.session_state['tips_profile'] = profile
+        st.session_state['tips_result'] = {
+            'extra': (fitness_goal, medications, technology_comfort), 'plan': None
+        }
+    
+    result = st.session_state.get('tips_result')
+    if result:
+        profile = st.session_state['tips_profile']
+        age_group, health_goal, activity_level = profile['age_group'], profile['health_goal'], profile['activity_level']
+        time_available, dietary_preference = profile['time_available'], profile['dietary_preference']
+        sleep_quality, stress_level = profile['sleep_quality'], profile['stress_level']
+        health_conditions, wellness_focus = profile['health_conditions'], profile['wellness_focus']
+        fitness_goal, medications, technology_comfort = result['extra']
+        
+        # Calculate comprehensive health score
+        health_score, health_status, status_color, status_icon = tips.profile_score(profile)
+        
+        # Display Health Dashboard
+        st.markdown("### 📊 Your Personal Health Dashboard")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown(f"""
+            <div class="health-stats">
+                <h3>🎯 Health Score</h3>
+                <h2 style="color: {status_color};">{health_score:.1f}/10</h2>
+                <p>{health_status}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown(f"""
+            <div class="health-stats">
+                <h3>📅 Age Group</h3>
+                <h2>{age_group}</h2>
+                <p>Life Stage</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col3:
+            st.markdown(f"""
+            <div class="health-stats">
+                <h3>🏃‍♂️ Activity Level</h3>
+                <h2>{activity_level}</h2>
+                <p>Current Status</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col4:
+            st.markdown(f"""
+            <div class="health-stats">
+                <h3>⏱️ Daily Commitment</h3>
+                <h2>{time_available.split()[0]}</h2>
+                <p>Available Time</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Health Status Display
+        st.markdown(f"""
+        <div class="{'success-box' if health_score >= 7 else 'warning-box' if health_score >= 5 else 'error-box'}">
+            <h3>{status_icon} <strong>Health Status: {health_status}</strong></h3>
+            <p>Your overall health profile shows a score of {health_score:.1f}/10 based on lifestyle factors, 
+            activity level, sleep quality, and health conditions.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Personalized Health Plan Generation
+        health_data = {
+            'age_group': age_group,
+            'goal': health_goal,
+            'activity_level': activity_level,
+            'conditions': health_conditions,
+            'health_score': health_score,
+            'time_available': time_available,
+            'dietary_preference': dietary_preference,
+            'wellness_focus': wellness_focus
+        }
+        
+        # Pre-generated plans cover the common profiles; only the rest go to the LLM.
+        # Either way the plan is fetched once per submission and reused on later reruns
+        if result['plan'] is None:
+            advice_index = get_advice_index()
+            indexed_plan = advice_index.get(profile) if advice_index else None
+            
+            with st.spinner("🤖 Creating your comprehensive health plan..."):
+                if indexed_plan:
+                    result['plan'] = "🤖 " + indexed_plan
+                else:
+                    result['plan'] = get_health_insights(tips.build_health_plan_prompt(profile), health_data)
+            
+            record_assessment('tips', reports.new_assessment(
+                'tips', "Personal Health & Wellness Plan",
+                inputs={'Age Group': age_group, 'Primary Goal': health_goal, 'Activity Level': activity_level,
+                        'Fitness Focus': fitness_goal, 'Available Time': time_available,
+                        'Dietary Preference': dietary_preference, 'Sleep Quality': sleep_quality,
+                        'Stress Level': stress_level,
+                        'Health Conditions': ', '.join(health_conditions) or 'None',
+                        'Focus Areas': ', '.join(wellness_focus) or 'General wellness'},
+                metrics={'Health Score': f"{health_score:.1f}/10", 'Health Status': health_status},
+                status=f"{status_icon} Health Status: {health_status}",
+                advice=result['plan']
+            ), age=age_group)
+        health_plan = result['plan']
+        
+        st.markdown("### 🎯 Your Comprehensive Health Plan")
+        st.markdown(f"""
+        <div class="prediction-card">
+            <div style="font-size: 1.1rem; line-height: 1.7;">
+                {health_plan}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Quick Daily Tips Section
+        st.markdown("### ⚡ Quick Daily Health Tips")
+        
+        # Generate specific tips based on profile
+        if "15-30" in time_available:
+            time_tips = "🕐 **15-Minute Power Sessions:** Focus on high-intensity, short-duration activities"
+            water_goal = "6-8 glasses"
+        elif "30-60" in time_available:
+            time_tips = "🕑 **45-Minute Wellness Window:** Perfect for comprehensive workout + meditation"
+            water_goal = "8-10 glasses"
+        else:
+            time_tips = "🕕 **Extended Health Time:** Opportunity for detailed meal prep and longer workouts"
+            water_goal = "10-12 glasses"
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"""
+            <div class="info-box">
+                <h4>💧 Hydration Goal</h4>
+                <p>Drink {water_goal} of water daily. Add lemon or cucumber for variety.</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.markdown(f"""
+            <div class="info-box">
+                <h4>😴 Sleep Optimization</h4>
+                <p>{"Maintain your excellent sleep habits!" if sleep_quality == "Excellent" 
+                   else "Aim for 7-9 hours with consistent bedtime routine."}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown(f"""
+            <div class="info-box">
+                <h4>🚶‍♂️ Movement Breaks</h4>
+                <p>{time_tips}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.markdown(f"""
+            <div class="info-box">
+                <h4>🧘 Stress Management</h4>
+                <p>{"Continue your stress management techniques" if stress_level == "Low"
+                   else "Practice 5-10 minutes of deep breathing or meditation daily"}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Technology Recommendations
+        if technology_comfort != "Prefer simple tools":
+            st.markdown("### 📱 Recommended Health Apps & Tools")
+            
+            app_recommendations = {
+                "Nutrition": "MyFitnessPal, Cronometer, or Lose It! for food tracking",
+                "Exercise": "Nike Training Club, Strava, or Apple Fitness+ for workouts",
+                "Sleep": "Sleep Cycle, Headspace, or Calm for sleep optimization",
+                "Mindfulness": "Insight Timer, Waking Up, or Ten Percent Happier for meditation"
+            }
+            
+            for category, apps in app_recommendations.items():
+                if category.lower() in [f.lower() for f in wellness_focus]:
+                    st.markdown(f"**{category}:** {apps}")
+    
+    render_report_panel('tips')
+    render_tips_projection()
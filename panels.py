@@ -0,0 +1,249 @@
+"""AI Health Copilot - Result panels shared by the assessment pages"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import charts
+import cohort
+import scenarios
+from app_common import (download_limit_bytes, get_cohort_gate, get_dashboard_aggregates, get_figure_cache,
+                        get_report_service, new_result_file, record_model_inputs)
+
+
+@st.fragment
+def render_what_if(condition, model, features):
+    """What-if explorer: sweep one or two features of the last submitted row in one batched call"""
+    row = st.session_state.get(f'{condition}_input')
+    if row is None:
+        return
+    
+    st.markdown("### 🔮 What-If Explorer")
+    st.markdown("*See how the predicted risk would change if a measurement were different*")
+    
+    options = list(scenarios.FEATURE_RANGES[condition])
+    low_threshold, high_threshold = scenarios.RISK_THRESHOLDS[condition]
+    col1, col2 = st.columns(2)
+    with col1:
+        x_feature = st.selectbox("Vary", options, format_func=scenarios.FEATURE_LABELS.get,
+            key=f"{condition}_what_if_x")
+    with col2:
+        y_feature = st.selectbox("Against (optional)", ["None"] + [f for f in options if f != x_feature],
+            format_func=lambda f: "Nothing - single curve" if f == "None" else scenarios.FEATURE_LABELS[f],
+            key=f"{condition}_what_if_y")
+    
+    current_x = row[features.index(x_feature)]
+    if y_feature == "None":
+        values, risk = scenarios.risk_curve(model, row, features, condition, x_feature)
+        fig = px.line(
+            x=values, y=risk,
+            title=f"Predicted Risk vs {scenarios.FEATURE_LABELS[x_feature]}",
+            labels={'x': scenarios.FEATURE_LABELS[x_feature], 'y': 'Risk Probability (%)'}
+        )
+        fig.add_hrect(y0=0, y1=low_threshold, fillcolor="#27ae60", opacity=0.1, line_width=0)
+        fig.add_hrect(y0=high_threshold, y1=100, fillcolor="#e74c3c", opacity=0.1, line_width=0)
+        fig.add_vline(x=current_x, line_dash="dash", line_color="#764ba2",
+            annotation_text="Your value")
+        fig.update_yaxes(range=[0, 100])
+    else:
+        x_values, y_values, risk = scenarios.risk_surface(model, row, features, condition, x_feature, y_feature)
+        fig = go.Figure(go.Heatmap(
+            x=x_values, y=y_values, z=risk, zmin=0, zmax=100,
+            colorscale="RdYlGn_r", colorbar={'title': 'Risk %'}
+        ))
+        fig.add_trace(go.Scatter(
+            x=[current_x], y=[row[features.index(y_feature)]], mode="markers",
+            marker={'size': 14, 'color': 'white', 'line': {'color': 'black', 'width': 2}},
+            name="Your values"
+        ))
+        fig.update_layout(
+            title=f"Predicted Risk: {scenarios.FEATURE_LABELS[x_feature]} vs {scenarios.FEATURE_LABELS[y_feature]}",
+            xaxis_title=scenarios.FEATURE_LABELS[x_feature],
+            yaxis_title=scenarios.FEATURE_LABELS[y_feature]
+        )
+    fig.update_layout(height=400, font_family="Arial")
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_risk_path(condition, model, features):
+    """Smallest change to modifiable factors that brings the last submitted row to low risk"""
+    row = st.session_state.get(f'{condition}_input')
+    if row is None:
+        return
+    
+    # Same row, same answer: keep the search result for reruns of this session
+    cache_key = (condition, tuple(row))
+    if st.session_state.get(f'{condition}_risk_path_key') != cache_key:
+        st.session_state[f'{condition}_risk_path'] = scenarios.path_to_lower_risk(model, row, features, condition)
+        st.session_state[f'{condition}_risk_path_key'] = cache_key
+    path = st.session_state[f'{condition}_risk_path']
+    
+    st.markdown("### 🛤️ Path to Lower Risk")
+    if path['status'] == 'already_low':
+        st.markdown(f"""
+        <div class="success-box">
+            <strong>✅ Already in the low-risk range</strong> ({path['current_risk']:.1f}% &lt; {path['threshold']}%).
+            Keep maintaining your current habits.
+        </div>
+        """, unsafe_allow_html=True)
+    elif path['status'] == 'found':
+        steps = "<br>".join(
+            f"• <strong>{scenarios.FEATURE_LABELS[feature]}:</strong> {before:g} → {after:g}"
+            for feature, (before, after) in path['changes'].items()
+        )
+        st.markdown(f"""
+        <div class="info-box">
+            <strong>Smallest change found in modifiable factors</strong>
+            ({path['current_risk']:.1f}% → {path['new_risk']:.1f}%, below the {path['threshold']}% low-risk threshold):<br>
+            {steps}
+            <p style="font-size: 0.85rem; margin: 0.5rem 0 0 0; opacity: 0.8;">
+            Model-based estimate from {path['evaluated']:,} scenarios - discuss realistic targets with your doctor.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="warning-box">
+            <strong>No realistic change to modifiable factors brings the predicted risk below {path['threshold']}%.</strong>
+            Non-modifiable factors dominate this prediction - a clinician can advise on further options.
+        </div>
+        """, unsafe_allow_html=True)
+
+def record_assessment(page_key, assessment, level=None, age=None):
+    """Keep the latest result object for a page, count it on the dashboard and start rendering its report"""
+    st.session_state[f'{page_key}_assessment'] = assessment
+    try:
+        get_dashboard_aggregates().record(page_key, level, age)
+    except Exception:
+        pass  # dashboard counters never fail an assessment (e.g. shared store unreachable)
+    get_report_service().submit(assessment)
+
+@st.fragment
+def render_report_panel(page_key):
+    """Download buttons for the report of the page's latest assessment, once rendered"""
+    assessment = st.session_state.get(f'{page_key}_assessment')
+    if assessment is None:
+        return
+    
+    service = get_report_service()
+    service.submit(assessment)  # no-op unless evicted from the cache
+    st.markdown("### 📄 Assessment Report")
+    cols = st.columns(len(service.formats) + 1)
+    pending = False
+    for col, fmt in zip(cols, service.formats):
+        with col:
+            data = service.get(assessment['id'], fmt)
+            if data is not None:
+                st.download_button(f"⬇️ Download {fmt.upper()}", data,
+                    file_name=f"{assessment['kind']}_report_{assessment['id'][:8]}.{fmt}",
+                    mime="text/html" if fmt == 'html' else "application/pdf",
+                    key=f"{page_key}_report_{fmt}", use_container_width=True)
+            elif service.status(assessment['id'], fmt) == 'failed':
+                st.caption(f"{fmt.upper()} report could not be generated")
+            else:
+                pending = True
+                st.caption(f"⏳ Preparing {fmt.upper()} report...")
+    if pending:
+        with cols[-1]:
+            st.button("🔄 Check again", key=f"{page_key}_report_refresh")
+
+def projection_chart(projection, title, y_label, y_range):
+    """Median line with a 10-90th percentile band, with and without the plan"""
+    fig = go.Figure()
+    for key, name, color, fill in (('without_plan', 'No change', '#e74c3c', 'rgba(231, 76, 60, 0.15)'),
+                                   ('with_plan', 'With plan', '#27ae60', 'rgba(39, 174, 96, 0.2)')):
+        summary = projection[key]
+        months = summary['horizons']
+        fig.add_trace(go.Scatter(
+            x=months + months[::-1], y=list(summary['p90']) + list(summary['p10'])[::-1],
+            fill='toself', fillcolor=fill, line={'width': 0}, hoverinfo='skip',
+            name=f"{name} (10-90%)"
+        ))
+        fig.add_trace(go.Scatter(x=months, y=summary['p50'], mode='lines+markers',
+            line={'color': color, 'width': 3}, name=f"{name} (median)"))
+    fig.update_layout(title=title, xaxis_title="Months from now", yaxis_title=y_label,
+        height=380, font_family="Arial")
+    fig.update_yaxes(range=y_range)
+    return fig
+
+def render_score_histograms(summary, version):
+    """Score distribution per assessment of a scored file, from the histogram counts kept in its summary"""
+    assessments = summary['assessments']
+    cols = st.columns(len(assessments))
+    for col, assessment in zip(cols, assessments):
+        column, low, high, bins = cohort.score_scale(assessment)
+        label = "Risk Score (0-10)" if assessment == 'general' else "Risk Probability (%)"
+        histogram = charts.Histogram.from_counts(np.linspace(low, high, bins + 1), summary['histograms'][assessment])
+        fig = get_figure_cache().get_or_build(
+            ('score_histogram', version, assessment),
+            lambda: histogram.figure(f"{cohort.ASSESSMENT_LABELS[assessment]} Score Distribution", label, "Rows"))
+        with col:
+            st.plotly_chart(fig, use_container_width=True)
+
+def render_batch_scoring(uploaded, models, page_key, button, noun="rows", live_preview=False):
+    """Score an uploaded CSV with cohort.score_csv under the cohort gate; returns the stored result or None
+
+    The result, {'key', 'summary', 'preview', 'file'}, stays in
+    st.session_state[f"{page_key}_batch"] until another file is uploaded;
+    its scored file is deleted along with it.
+    """
+    state_key = f"{page_key}_batch"
+    upload_key = (uploaded.name, uploaded.size)
+    result = st.session_state.get(state_key)
+    if result and result['key'] != upload_key:
+        st.session_state.pop(state_key)['file'].delete()
+        result = None
+
+    if result is None and st.button(button, use_container_width=True):
+        gate = get_cohort_gate()
+        if not gate.acquire():
+            st.warning("⏳ Other files are being screened right now - please try again in a minute.")
+            return None
+        output = new_result_file(page_key)
+        progress = st.progress(0.0, text="Scoring...")
+        counts = st.empty()
+        preview_table = st.empty()
+        try:
+            uploaded.seek(0)
+            for summary, preview in cohort.score_csv(uploaded, output.path, models, observe=record_model_inputs):
+                progress.progress(min(summary.get('bytes_read', 0) / max(uploaded.size, 1), 1.0),
+                    text=f"Scored {summary['rows']:,} {noun}...")
+                if live_preview:
+                    counts.markdown(" • ".join(
+                        f"**{cohort.ASSESSMENT_LABELS[assessment]}:** "
+                        + ", ".join(f"{n:,} {level}" for level, n in levels.items())
+                        for assessment, levels in summary['levels'].items()
+                    ))
+                    preview_table.dataframe(preview, use_container_width=True, hide_index=True)
+            result = {'key': upload_key, 'summary': summary, 'preview': preview, 'file': output}
+            st.session_state[state_key] = result
+            try:
+                aggregates = get_dashboard_aggregates()
+                for assessment, levels in summary['levels'].items():
+                    aggregates.record_levels(assessment, levels)
+            except Exception:
+                pass  # dashboard counters never fail a batch
+        except ValueError as e:
+            output.delete()
+            st.error(f"❌ {e}")
+        except Exception as e:
+            output.delete()
+            st.error(f"❌ Could not read this file as CSV: {e}")
+        finally:
+            # The caller's results panel replaces the progressive view
+            progress.empty()
+            counts.empty()
+            preview_table.empty()
+            gate.release()
+
+    return result if result and result['file'].exists() else None
+
+def render_download(result_file, label, file_name):
+    """Download of a scored file, read into memory only when asked for and only up to the size limit"""
+    size_mb, limit_mb = result_file.size() / (1024 * 1024), download_limit_bytes() / (1024 * 1024)
+    if size_mb > limit_mb:
+        st.info(f"ℹ️ The {label} is {size_mb:,.0f} MB, more than the {limit_mb:,.0f} MB that can be downloaded "
+                "here - split the upload into smaller files to download the results.")
+    elif st.button(f"📦 Prepare {label} download ({size_mb:,.1f} MB)", use_container_width=True):
+        with open(result_file, 'rb') as f:
+            st.download_button(f"⬇️ Download {label}", f.read(), file_name=file_name, mime="text/csv",
+                use_container_width=True)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Offline pre-generation of Smart Health Tips plans
+
+Generates health plans for the most common Smart Health Tips profiles and stores
+them in the advice index the page reads before calling the LLM. Runs are
+resumable: profiles already in the index are skipped.
+
+    python pregenerate_tips.py --max-distance 1 --workers 4 --rate-per-minute 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import load_secrets, get_setting
+from health_tips import (AdviceIndex, build_health_plan_prompt, iter_profiles_by_distance,
+                         profile_key, sample_profiles)
+from rate_limit import TokenBucket
+
+DEFAULT_INDEX_PATH = "advice_index.sqlite"
+
+
+def select_profiles(args):
+    """Candidate profiles in priority order, without duplicates"""
+    if args.sample:
+        candidates = sample_profiles(args.sample, seed=args.seed)
+    else:
+        candidates = iter_profiles_by_distance(args.max_distance)
+
+    seen = set()
+    for profile in candidates:
+        key = profile_key(profile)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield key, profile
+        if args.limit and len(seen) >= args.limit:
+            return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--index", default=None, help="advice index path (default: [app] advice_index or advice_index.sqlite)")
+    parser.add_argument("--max-distance", type=int, default=1, help="max fields changed from the form defaults")
+    parser.add_argument("--sample", type=int, default=0, help="sample N random profiles instead of enumerating")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--limit", type=int, default=0, help="stop after N candidate profiles")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent LLM requests")
+    parser.add_argument("--rate-per-minute", type=float, default=20.0, help="upstream request budget")
+    parser.add_argument("--dry-run", action="store_true", help="only report how many profiles are missing")
+    args = parser.parse_args(argv)
+
+    secrets = load_secrets()
+    index_path = args.index or get_setting('app', 'advice_index', DEFAULT_INDEX_PATH,
+                                           env='ADVICE_INDEX_PATH', secrets=secrets)
+    index = AdviceIndex(index_path)
+
+    candidates = list(select_profiles(args))
+    done = index.contains_keys(key for key, _ in candidates)
+    todo = [profile for key, profile in candidates if key not in done]
+    print(f"📚 {len(candidates)} candidate profiles, {len(done)} already indexed, {len(todo)} to generate")
+    if args.dry_run or not todo:
+        return 0
+
+    api_key = os.environ.get("OPENROUTER_API_KEY") or secrets.get("OPENROUTER_API_KEY", "")
+    from llm_router import router_from_config
+    router = router_from_config(secrets, api_key)
+    bucket = TokenBucket(args.rate_per_minute / 60.0, max(1, args.workers))
+
+    def generate(profile):
+        while not bucket.try_acquire():
+            time.sleep(0.05)
+        advice, target = router.complete(build_health_plan_prompt(profile))
+        if advice:
+            # Only real LLM output is stored; failures are retried on the next run
+            index.put(profile, advice, model=target)
+        return advice is not None
+
+    generated = failed = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(generate, profile) for profile in todo]
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                try:
+                    ok = future.result()
+                except Exception:
+                    ok = False
+                generated += ok
+                failed += not ok
+                if i % 10 == 0 or i == len(futures):
+                    rate = i / max(time.monotonic() - started, 1e-9)
+                    print(f"  {i}/{len(futures)} done ({generated} stored, {failed} failed, {rate:.1f}/s)")
+        except KeyboardInterrupt:
+            print("⏹️ Interrupted - progress is saved, re-run to resume")
+            for future in futures:
+                future.cancel()
+            return 1
+
+    print(f"✅ Index now holds {len(index)} plans")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""AI Health Copilot - On-demand profiling of single script reruns
+
+capture() wraps one rerun and writes, under one file stem:
+
+- <stem>.prof       cProfile stats of the script thread (open with snakeviz or pstats)
+- <stem>.txt        the top functions by cumulative time
+- <stem>.collapsed  sampled stacks of the script thread in the collapsed format
+                    read by flamegraph.pl, speedscope and inferno
+- <stem>.alloc.txt  tracemalloc allocation hot spots, by line
+
+cProfile and the stack sampler only observe the thread running the rerun, so
+other sessions are not instrumented. tracemalloc is process-wide and adds
+allocation overhead to every thread while a capture runs, which is why callers
+take CAPTURE_LOCK and skip profiling while another capture is in progress.
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+# tracemalloc is process-wide, so only one capture runs at a time
+CAPTURE_LOCK = threading.Lock()
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer, aggregating collapsed stacks"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _allocation_report(after, baseline, peak, limit=TOP_ALLOCATIONS):
+    # Leave out the profiler's own bookkeeping
+    filters = [tracemalloc.Filter(False, path) for path in (__file__, tracemalloc.__file__, cProfile.__file__,
+                                                            pstats.__file__)]
+    diffs = after.filter_traces(filters).compare_to(baseline.filter_traces(filters), 'lineno')
+    lines = [f"Peak traced memory during the rerun: {peak / (1024 * 1024):.1f} MiB",
+             f"Still allocated at the end: {sum(d.size_diff for d in diffs) / 1024:+.1f} KiB",
+             "", "Top lines by memory still allocated at the end:"]
+    for diff in diffs[:limit]:
+        frame = diff.traceback[0]
+        lines.append(f"{diff.size_diff / 1024:+10.1f} KiB {diff.count_diff:+8d} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "run"
+
+
+@contextmanager
+def capture(out_dir, label, interval=SAMPLE_INTERVAL, trace_allocations=True):
+    """Profile the enclosed block; yields a dict that gets 'files' and 'seconds' once it exits"""
+    out_dir = Path(out_dir)
+    stem = out_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{_slug(label)}"
+    result = {'label': label, 'files': [], 'seconds': None}
+
+    started_tracing = trace_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    if trace_allocations:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.take_snapshot() if trace_allocations else None
+    sampler = StackSampler(threading.get_ident(), interval)
+    profiler = cProfile.Profile()
+
+    sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        result['seconds'] = time.perf_counter() - started
+        sampler.stop()
+
+        try:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(f"{stem}.prof")
+            summary = io.StringIO()
+            summary.write(f"{label}: {result['seconds']:.3f}s wall\n\n")
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+            Path(f"{stem}.txt").write_text(summary.getvalue(), encoding='utf-8')
+            Path(f"{stem}.collapsed").write_text(sampler.collapsed(), encoding='utf-8')
+            result['files'] = [f"{stem}.prof", f"{stem}.txt", f"{stem}.collapsed"]
+
+            if trace_allocations:
+                report = _allocation_report(tracemalloc.take_snapshot(), baseline, tracemalloc.get_traced_memory()[1])
+                Path(f"{stem}.alloc.txt").write_text(report, encoding='utf-8')
+                result['files'].append(f"{stem}.alloc.txt")
+        except OSError as e:
+            result['error'] = str(e)  # never turn a profiled rerun into a failed one
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,196 @@
+"""AI Health Copilot - Rate limiting and admission control for LLM calls"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens refill per second up to `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self):
+        """Tokens currently available"""
+        with self.lock:
+            self._refill()
+            return self.tokens
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available, never blocking"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def refund(self, tokens=1):
+        """Give back tokens taken for a request that never went upstream"""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class SharedTokenBucket:
+    """Token bucket kept in a shared_state backend, so every replica draws from the same budget"""
+
+    def __init__(self, backend, key, rate, capacity):
+        self.backend = backend
+        self.key = key
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; an unreachable store denies, which means the fallback advice"""
+        try:
+            return self.backend.take(self.key, self.rate, self.capacity, tokens)
+        except Exception:
+            return False
+
+    def refund(self, tokens=1):
+        try:
+            self.backend.take(self.key, self.rate, self.capacity, -tokens)
+        except Exception:
+            pass
+
+
+class RateLimiter:
+    """Per-session and global token buckets checked together
+
+    With a shared `backend` the buckets live there (see shared_state.py), so the
+    global limit holds across replicas instead of being multiplied by them.
+    """
+
+    def __init__(self, per_session_per_hour=100, global_per_hour=1000,
+                 session_burst=5, global_burst=20, max_sessions=10000, backend=None):
+        self.per_session_rate = per_session_per_hour / 3600.0
+        self.session_burst = session_burst
+        self.backend = backend
+        self.global_bucket = self._bucket("ratelimit:global", global_per_hour / 3600.0, global_burst)
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _bucket(self, key, rate, capacity):
+        if self.backend is None:
+            return TokenBucket(rate, capacity)
+        return SharedTokenBucket(self.backend, key, rate, capacity)
+
+    def _session_bucket(self, session_id):
+        with self.lock:
+            bucket = self.sessions.get(session_id)
+            if bucket is None:
+                bucket = self._bucket(f"ratelimit:session:{session_id}", self.per_session_rate, self.session_burst)
+                self.sessions[session_id] = bucket
+                # Forget the least recently seen sessions so memory stays bounded
+                while len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(session_id)
+            return bucket
+
+    def try_acquire(self, session_id):
+        """Consume one request from both the session and the global budget"""
+        bucket = self._session_bucket(session_id)
+        if not bucket.try_acquire():
+            return False
+        if not self.global_bucket.try_acquire():
+            bucket.refund()
+            return False
+        return True
+
+    def refund(self, session_id):
+        """Return a request that was admitted but never sent"""
+        self._session_bucket(session_id).refund()
+        self.global_bucket.refund()
+
+
+class ConcurrencyGate:
+    """Bounded concurrency with a short, bounded wait queue"""
+
+    def __init__(self, max_concurrent=4, max_queue=8, queue_timeout=2.0):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Acquire a slot, waiting at most `queue_timeout` if the queue has room"""
+        if self.semaphore.acquire(blocking=False):
+            return True
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                return False
+            self.waiting += 1
+        try:
+            return self.semaphore.acquire(timeout=self.queue_timeout)
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+
+class AdmissionController:
+    """Decides whether an LLM request may go upstream right now"""
+
+    def __init__(self, limiter=None, gate=None):
+        self.limiter = limiter or RateLimiter()
+        self.gate = gate or ConcurrencyGate()
+        self.blocked_until = 0.0
+        self.stats = {'admitted': 0, 'rate_limited': 0, 'queue_rejected': 0, 'backoff_rejected': 0}
+        self.lock = threading.Lock()
+
+    def _count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def backoff(self, seconds):
+        """Stop admitting requests for a while after an upstream 429"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    @contextmanager
+    def admit(self, session_id):
+        """Context manager yielding True if the caller may call the LLM"""
+        if time.monotonic() < self.blocked_until:
+            self._count('backoff_rejected')
+            yield False
+            return
+        if not self.limiter.try_acquire(session_id):
+            self._count('rate_limited')
+            yield False
+            return
+        if not self.gate.acquire():
+            self.limiter.refund(session_id)
+            self._count('queue_rejected')
+            yield False
+            return
+
+        self._count('admitted')
+        try:
+            yield True
+        finally:
+            self.gate.release()
+
+
+def retry_after_seconds(response, default=30.0):
+    """Parse a Retry-After header (seconds form) from an HTTP response"""
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,326 @@
+"""AI Health Copilot - Versioned model registry with background hot swap
+
+Each model version records the fingerprint of the data and training settings
+it was built from, held-out metrics and a single-row latency profile. New
+versions are trained, evaluated and warmed on a background thread and only
+then swapped in with one reference assignment, so reruns in flight keep the
+models they started with and nobody waits for a retrain. The last few
+versions stay loaded for instant rollback and are saved to disk, so a restart
+with unchanged data loads the saved models instead of training again.
+
+The training settings are re-read for every new version, so a published
+model selection, a changed cascade or a new streamed model is picked up by
+the next retrain, or by the watcher, without a restart.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+import ml_models
+
+DATASET_FILES = ('diabetes.csv', 'heart.csv', 'parkinsons.csv')
+LATENCY_ROWS = 200
+
+
+def data_fingerprint(data_dir=ml_models.DATA_DIR, files=DATASET_FILES):
+    """Short SHA-256 over the dataset files ('missing' marks a file that is not there)"""
+    digest = hashlib.sha256()
+    for name in files:
+        path = Path(data_dir) / name
+        digest.update(name.encode())
+        digest.update(path.read_bytes() if path.exists() else b'missing')
+    return digest.hexdigest()[:16]
+
+
+def build_fingerprint(data_fp, settings):
+    key = f"{data_fp}:{ml_models.TRAINING_VERSION}:{json.dumps(settings, sort_keys=True)}"
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def config_paths(secrets):
+    """The model selection file and streamed models directory named in `[models]`"""
+    from config import get_setting
+
+    return (Path(get_setting('models', 'selection_file', ml_models.SELECTION_FILE, secrets=secrets)),
+            Path(get_setting('models', 'streamed_dir', ml_models.STREAMED_DIR, secrets=secrets)))
+
+
+def settings_from_config(secrets):
+    """Training settings of the served models from the `[models]` section (what train_ml_models gets)"""
+    from config import get_setting
+
+    selection_file, streamed_dir = config_paths(secrets)
+    return {
+        'cascade': list(get_setting('models', 'cascade', [], secrets=secrets)),
+        'cascade_band': list(get_setting('models', 'cascade_band', ml_models.DEFAULT_CASCADE_BAND, secrets=secrets)),
+        'cascade_heavy': get_setting('models', 'cascade_heavy', 'forest', secrets=secrets),
+        'specs': ml_models.load_published_specs(selection_file),
+        'streamed': ml_models.streamed_model_refs(streamed_dir)
+    }
+
+
+def evaluate(models, data, prefit=(), groups=None):
+    """Held-out AUC/accuracy per condition
+
+    A copy of the model is refit on 80% of the rows and scored on the rest.
+    Conditions in `groups` (ml_models.load_dataset_groups) are scored by
+    subject-grouped 5-fold cross-validation instead, so no subject is in
+    both the training and the test rows. Models in `prefit` were trained
+    elsewhere (train_streaming.py) and are scored as they are on every row
+    of the bundled data, which they never saw.
+    """
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    groups = groups or {}
+    metrics = {}
+    for condition, (model, _) in models.items():
+        X, y = data[condition]
+        if condition in prefit:
+            y_test, proba = y, model.predict_proba(X.to_numpy(dtype=float))[:, 1]
+        else:
+            splits = ml_models.evaluation_splits(X, y, groups.get(condition))
+            test, proba, _ = ml_models.held_out_proba(model, X, y, splits)
+            y_test = y.iloc[test]
+        metrics[condition] = {
+            'auc': round(float(roc_auc_score(y_test, proba)), 4),
+            'accuracy': round(float(accuracy_score(y_test, proba >= 0.5)), 4),
+            'rows': len(X)
+        }
+    return metrics
+
+
+def latency_profile(models, data, rows=LATENCY_ROWS):
+    """Single-row predict_proba p50/p99 per condition; doubles as the warm-up before a swap"""
+    profile = {}
+    for condition, (model, _) in models.items():
+        X = data[condition][0].to_numpy(dtype=float)
+        samples = [X[i % len(X)].reshape(1, -1) for i in range(rows)]
+        model.predict_proba(samples[0])
+        timings = []
+        for row in samples:
+            started = time.perf_counter()
+            model.predict_proba(row)
+            timings.append((time.perf_counter() - started) * 1000)
+        profile[condition] = {'p50_ms': round(float(np.percentile(timings, 50)), 3),
+                              'p99_ms': round(float(np.percentile(timings, 99)), 3)}
+    return profile
+
+
+class ModelRegistry:
+    """Holds the active model version plus a few previous ones for rollback
+
+    `train(data, **settings)` builds {condition: (model, features)} from the
+    JSON-serializable training configuration `settings`. `load_settings()`,
+    when given, returns the current configuration and is called again for
+    every publish; `watch_paths` are files or directories (any file in them)
+    the watcher polls alongside the datasets. With `store_dir` set, versions
+    are pickled there and reused on startup when nothing changed.
+    """
+
+    def __init__(self, train, settings, data_dir=ml_models.DATA_DIR, store_dir=None, keep=3,
+                 load_settings=None, watch_paths=()):
+        self.train = train
+        self.settings = settings
+        self.load_settings = load_settings
+        self.watch_paths = [Path(path) for path in watch_paths]
+        self.data_dir = Path(data_dir)
+        self.store_dir = Path(store_dir) if store_dir else None
+        self.keep = keep
+        self.versions = []  # newest last; each {'meta': {...}, 'models': {...}}
+        self.active = None
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-build")
+        self.pending = None
+        self.last_error = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    # -- reading -----------------------------------------------------------
+
+    def current(self):
+        """Models of the active version (a plain reference read, safe from any thread)"""
+        active = self.active
+        return active['models'] if active else None
+
+    def history(self):
+        """Metadata of the loaded versions, newest first, with the active one flagged"""
+        with self.lock:
+            active_id = self.active['meta']['version'] if self.active else None
+            return [{**v['meta'], 'active': v['meta']['version'] == active_id} for v in reversed(self.versions)]
+
+    @property
+    def building(self):
+        return self.pending is not None and not self.pending.done()
+
+    # -- building ----------------------------------------------------------
+
+    def _next_version(self):
+        known = [v['meta']['version'] for v in self.versions]
+        if self.store_dir and self.store_dir.exists():
+            known += [int(p.stem.split('-')[1]) for p in self.store_dir.glob('v-*.pkl')]
+        return max(known, default=0) + 1
+
+    def _build(self, reason, settings):
+        data_fp = data_fingerprint(self.data_dir)
+        build_fp = build_fingerprint(data_fp, settings)
+        data = ml_models.load_health_datasets(self.data_dir)
+
+        started = time.perf_counter()
+        models = self.train(data, **settings)
+        train_seconds = time.perf_counter() - started
+
+        meta = {
+            'version': None,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'reason': reason,
+            'data_fingerprint': data_fp,
+            'build_fingerprint': build_fp,
+            'settings': settings,
+            'train_seconds': round(train_seconds, 3),
+            'metrics': evaluate(models, data, prefit=settings.get('streamed', {}),
+                                groups=ml_models.load_dataset_groups(self.data_dir)),
+            'latency': latency_profile(models, data)
+        }
+        return {'meta': meta, 'models': models}
+
+    def _install(self, version):
+        with self.lock:
+            if version['meta']['version'] is None:
+                version['meta']['version'] = self._next_version()
+            self.versions = [v for v in self.versions if v['meta']['version'] != version['meta']['version']]
+            self.versions.append(version)
+            self.versions = self.versions[-self.keep:]
+            self.active = version
+        self._save(version)
+
+    def load_or_build(self):
+        """Load the saved versions and activate the newest one matching the current data and settings,
+        else train a new one (blocking)"""
+        saved = sorted(self._saved(), key=lambda v: v['meta']['version'])[-self.keep:]
+        build_fp = build_fingerprint(data_fingerprint(self.data_dir), self.settings)
+        matching = [v for v in saved if v['meta']['build_fingerprint'] == build_fp]
+        with self.lock:
+            self.versions = saved
+            if matching:
+                self.active = matching[-1]
+                return self.active['meta']
+        self._install(self._build("startup", self.settings))
+        return self.active['meta']
+
+    def publish(self, reason="manual", force=False):
+        """Train, evaluate and warm a new version in the background, then swap it in
+
+        The settings are re-read first. Returns the Future, or None when a
+        build is already running, the settings cannot be read or (unless
+        `force`) the data and settings are unchanged since the active version.
+        """
+        with self.lock:
+            if self.building:
+                return None
+            if self.load_settings is not None:
+                try:
+                    self.settings = self.load_settings()
+                except Exception as e:
+                    self.last_error = f"{datetime.now().isoformat(timespec='seconds')}: settings: {e}"
+                    return None
+            if not force and self.active:
+                current_fp = build_fingerprint(data_fingerprint(self.data_dir), self.settings)
+                if current_fp == self.active['meta']['build_fingerprint']:
+                    return None
+            self.pending = self.executor.submit(self._publish, reason, self.settings)
+            return self.pending
+
+    def _publish(self, reason, settings):
+        try:
+            version = self._build(reason, settings)
+        except Exception as e:
+            self.last_error = f"{datetime.now().isoformat(timespec='seconds')}: {e}"
+            raise
+        self.last_error = None
+        self._install(version)
+        return version['meta']
+
+    def rollback(self, version=None):
+        """Re-activate a loaded version (default: the one before the active one); returns its metadata"""
+        with self.lock:
+            ids = [v['meta']['version'] for v in self.versions]
+            if version is None:
+                position = ids.index(self.active['meta']['version']) if self.active else len(ids)
+                if position == 0:
+                    raise ValueError("No earlier version is loaded")
+                version = ids[position - 1]
+            if version not in ids:
+                raise ValueError(f"Version {version} is not loaded")
+            self.active = self.versions[ids.index(version)]
+            return self.active['meta']
+
+    # -- watching the dataset and model files --------------------------------
+
+    def watch(self, interval=30.0):
+        """Poll the dataset files and `watch_paths` and publish a new version whenever they change"""
+        if self._watcher is not None:
+            return
+
+        seen = self._mtimes()
+
+        def poll():
+            nonlocal seen
+            while not self._stop.wait(interval):
+                mtimes = self._mtimes()
+                if mtimes != seen:
+                    seen = mtimes
+                    self.publish(reason="files changed")
+
+        self._watcher = threading.Thread(target=poll, name="model-watch", daemon=True)
+        self._watcher.start()
+
+    def _mtimes(self):
+        paths = [self.data_dir / name for name in DATASET_FILES]
+        for path in self.watch_paths:
+            paths += sorted(p for p in path.iterdir() if p.is_file()) if path.is_dir() else [path]
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append((str(path), path.stat().st_mtime_ns))
+            except OSError:
+                mtimes.append((str(path), None))
+        return tuple(mtimes)
+
+    def stop(self):
+        self._stop.set()
+        self.executor.shutdown(wait=False)
+
+    # -- persistence ----------------------------------------------------------
+
+    def _save(self, version):
+        if not self.store_dir:
+            return
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            path = self.store_dir / f"v-{version['meta']['version']}.pkl"
+            if not path.exists():
+                tmp = path.with_suffix('.tmp')
+                tmp.write_bytes(pickle.dumps(version))
+                tmp.replace(path)
+            for old in sorted(self.store_dir.glob('v-*.pkl'), key=lambda p: int(p.stem.split('-')[1]))[:-self.keep]:
+                old.unlink(missing_ok=True)
+        except OSError:
+            pass  # the in-memory registry keeps working without a writable store
+
+    def _saved(self):
+        """Saved versions (only point `store_dir` at a directory you control: these are pickles)"""
+        if not self.store_dir or not self.store_dir.exists():
+            return
+        for path in self.store_dir.glob('v-*.pkl'):
+            try:
+                yield pickle.loads(path.read_bytes())
+            except Exception:
+                continue
@@ -0,0 +1,177 @@
+"""AI Health Copilot - Downloadable assessment reports rendered off the script thread
+
+Result pages store a plain assessment dict (inputs, metrics, risk factors,
+advice text and Plotly figure JSON). ReportService renders it to HTML - and to
+PDF when WeasyPrint or wkhtmltopdf is installed - on a small worker pool and
+caches the bytes by assessment id, so reruns only ever check a future.
+"""
+
+import html
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+REPORT_CSS = """
+body { font-family: Arial, sans-serif; color: #2c3e50; max-width: 900px; margin: 2rem auto; padding: 0 1rem; }
+h1 { color: #667eea; border-bottom: 3px solid #764ba2; padding-bottom: 0.5rem; }
+h2 { color: #764ba2; margin-top: 2rem; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid #e0e0e0; padding: 0.4rem 0.6rem; text-align: left; }
+th { background: #f0f2f6; width: 40%; }
+.status { padding: 1rem; border-radius: 8px; background: #f8f9fa; border-left: 5px solid #667eea; }
+.advice { line-height: 1.6; }
+.disclaimer { font-size: 0.85rem; color: #7f8c8d; margin-top: 3rem; }
+"""
+
+DISCLAIMER = ("This report is for educational purposes only and is not a substitute for professional "
+              "medical advice, diagnosis or treatment. Always consult a qualified healthcare provider.")
+
+
+def new_assessment(kind, title, inputs, metrics, status, risk_factors=(), advice="", figures=()):
+    """Self-contained result object for one submitted assessment
+
+    `figures` are Plotly figures; only their JSON is kept so the object stays
+    small and safe to hand to another thread.
+    """
+    return {
+        'id': uuid.uuid4().hex,
+        'kind': kind,
+        'title': title,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'inputs': dict(inputs),
+        'metrics': dict(metrics),
+        'status': status,
+        'risk_factors': list(risk_factors),
+        'advice': advice or "",
+        'figures': [fig.to_json() for fig in figures]
+    }
+
+
+def _advice_html(text):
+    """LLM/fallback advice as escaped HTML, keeping **bold** and line breaks"""
+    text = re.sub(r"<[^>]+>", "", text)  # fallback advice carries inline markup
+    text = html.escape(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return text.replace("\n", "<br>")
+
+
+def _table(values):
+    rows = "".join(f"<tr><th>{html.escape(str(k))}</th><td>{html.escape(str(v))}</td></tr>" for k, v in values.items())
+    return f"<table>{rows}</table>"
+
+
+def render_html(assessment, interactive=True):
+    """Full HTML report; `interactive=False` leaves out the Plotly charts (for PDF)"""
+    parts = [
+        f"<h1>{html.escape(assessment['title'])}</h1>",
+        f"<p>Generated {html.escape(assessment['created_at'])} · Assessment {assessment['id'][:12]}</p>",
+        f"<div class='status'><strong>{html.escape(assessment['status'])}</strong></div>",
+        "<h2>Results</h2>", _table(assessment['metrics']),
+    ]
+    if assessment['risk_factors']:
+        items = "".join(f"<li>{html.escape(f)}</li>" for f in assessment['risk_factors'])
+        parts += ["<h2>Risk Factors Identified</h2>", f"<ul>{items}</ul>"]
+
+    if assessment['figures'] and interactive:
+        import plotly.io as pio
+
+        parts.append("<h2>Charts</h2>")
+        for i, fig_json in enumerate(assessment['figures']):
+            parts.append(pio.from_json(fig_json).to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False))
+    elif assessment['figures']:
+        parts.append("<p><em>Interactive charts are included in the HTML version of this report.</em></p>")
+
+    parts += ["<h2>Your Inputs</h2>", _table(assessment['inputs'])]
+    if assessment['advice']:
+        parts += ["<h2>Recommendations</h2>", f"<div class='advice'>{_advice_html(assessment['advice'])}</div>"]
+    parts.append(f"<p class='disclaimer'>{DISCLAIMER}</p>")
+
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(assessment['title'])}</title>"
+            f"<style>{REPORT_CSS}</style></head><body>{''.join(parts)}</body></html>")
+
+
+def pdf_renderer():
+    """Callable turning HTML into PDF bytes with whatever is installed locally, or None"""
+    try:
+        import weasyprint
+
+        return lambda document: weasyprint.HTML(string=document).write_pdf()
+    except ImportError:
+        pass
+
+    binary = shutil.which('wkhtmltopdf')
+    if binary:
+        def wkhtmltopdf(document):
+            with tempfile.TemporaryDirectory() as workdir:
+                source, target = Path(workdir) / 'report.html', Path(workdir) / 'report.pdf'
+                source.write_text(document, encoding='utf-8')
+                subprocess.run([binary, '--quiet', '--encoding', 'utf-8', str(source), str(target)],
+                               check=True, timeout=60)
+                return target.read_bytes()
+        return wkhtmltopdf
+    return None
+
+
+class ReportService:
+    """Renders reports on a worker pool and keeps the latest ones in an LRU cache"""
+
+    def __init__(self, max_workers=2, max_cached=200):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self.max_cached = max_cached
+        self.pdf = pdf_renderer()
+        self.jobs = OrderedDict()  # (assessment id, format) -> Future
+        self.lock = threading.Lock()
+
+    @property
+    def formats(self):
+        return ('html', 'pdf') if self.pdf else ('html',)
+
+    def _render(self, assessment, fmt):
+        if fmt == 'pdf':
+            return self.pdf(render_html(assessment, interactive=False))
+        return render_html(assessment).encode('utf-8')
+
+    def submit(self, assessment):
+        """Queue every available format; already known assessments are not rendered again"""
+        with self.lock:
+            for fmt in self.formats:
+                key = (assessment['id'], fmt)
+                if key in self.jobs:
+                    self.jobs.move_to_end(key)
+                    continue
+                self.jobs[key] = self.executor.submit(self._render, assessment, fmt)
+            while len(self.jobs) > self.max_cached:
+                _, future = self.jobs.popitem(last=False)
+                future.cancel()
+
+    def status(self, assessment_id, fmt='html'):
+        """'missing', 'pending', 'ready' or 'failed'"""
+        with self.lock:
+            future = self.jobs.get((assessment_id, fmt))
+        if future is None:
+            return 'missing'
+        if not future.done():
+            return 'pending'
+        return 'failed' if future.cancelled() or future.exception() else 'ready'
+
+    def get(self, assessment_id, fmt='html'):
+        """Rendered bytes if ready, else None (never blocks)"""
+        with self.lock:
+            future = self.jobs.get((assessment_id, fmt))
+            if future is None or not future.done() or future.cancelled() or future.exception():
+                return None
+            self.jobs.move_to_end((assessment_id, fmt))
+        return future.result()
+
+    def cached_bytes(self):
+        """Size of the rendered reports held in the cache"""
+        with self.lock:
+            futures = list(self.jobs.values())
+        return sum(len(f.result()) for f in futures if f.done() and not f.cancelled() and not f.exception())
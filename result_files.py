@@ -0,0 +1,84 @@
+"""AI Health Copilot - Scored result files on disk
+
+Cohort and batch screening append their scored rows to a CSV in the system
+temp directory rather than keeping them in session state. A ResultFile owns
+one such file and deletes it when the result holding it is replaced, when it
+is garbage collected (its session state evicted or the session discarded)
+and when the worker exits. File names carry the worker's process id, so a
+worker starting up can sweep what crashed or restarted workers left behind.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+import weakref
+from pathlib import Path
+
+RESULTS_DIR = Path(tempfile.gettempdir()) / "health_copilot_results"
+STALE_SECONDS = 24 * 3600  # files older than this go whichever worker wrote them
+_STARTED = time.time()
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _running(pid):
+    if os.name == 'nt':
+        return True  # os.kill would terminate the process; the age limit still applies
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class ResultFile:
+    """A new, uniquely named CSV path in `directory`, deleted with this object"""
+
+    def __init__(self, prefix, directory=RESULTS_DIR):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{prefix}_{os.getpid()}_{uuid.uuid4().hex[:12]}.csv"
+        self._finalizer = weakref.finalize(self, _remove, str(self.path))
+
+    def __fspath__(self):
+        return str(self.path)
+
+    def __str__(self):
+        return str(self.path)
+
+    def exists(self):
+        return self.path.exists()
+
+    def size(self):
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def delete(self):
+        self._finalizer()
+
+
+def sweep(directory=RESULTS_DIR, stale_seconds=STALE_SECONDS):
+    """Delete result files no live worker owns; returns how many were removed
+
+    That is files of processes that are gone, this process's files from
+    before it started (a restarted container reuses its pid) and anything
+    older than `stale_seconds`.
+    """
+    removed, now, own = 0, time.time(), os.getpid()
+    for path in Path(directory).glob('*.csv'):
+        try:
+            pid = int(path.stem.split('_')[-2])
+            modified = path.stat().st_mtime
+        except (IndexError, ValueError, OSError):
+            continue
+        if now - modified > stale_seconds or (modified < _STARTED if pid == own else not _running(pid)):
+            _remove(path)
+            removed += 1
+    return removed
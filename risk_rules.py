@@ -0,0 +1,132 @@
+"""AI Health Copilot - General health risk scoring rules (scalar and vectorized)"""
+
+import numpy as np
+
+EXERCISE_OPTIONS = ["Daily", "4-6x/week", "2-3x/week", "1x/week", "Never"]
+DIET_OPTIONS = ["Excellent", "Good", "Fair", "Poor"]
+SLEEP_OPTIONS = ["8-9", "7-8", "6-7", "5-6", "<5"]
+STRESS_OPTIONS = ["Low", "Moderate", "High", "Very High"]
+SMOKING_OPTIONS = ["Never", "Former (>2yr)", "Former (<2yr)", "Current"]
+ALCOHOL_OPTIONS = ["None", "Light (1-3/week)", "Moderate (4-10/week)", "Heavy (>10/week)"]
+FAMILY_HISTORY_OPTIONS = ["Diabetes", "Heart Disease", "Cancer", "Hypertension", "Stroke"]
+SYMPTOM_OPTIONS = ["Fatigue", "Chest Pain", "Shortness of Breath", "Headaches", "Joint Pain", "None"]
+
+# Points per answer, in option order (negative values never add risk)
+EXERCISE_POINTS = np.array([-1, 0, 1, 2, 3])
+DIET_POINTS = np.array([-1, 0, 1, 2])
+SLEEP_POINTS = np.array([0, 0, 1, 2, 3])
+STRESS_POINTS = np.array([0, 0, 1, 2])
+SMOKING_POINTS = np.array([0, 1, 2, 3])
+ALCOHOL_POINTS = np.array([0, 0, 1, 2])
+
+
+def age_points(age):
+    age = np.asarray(age)
+    return np.select([age > 65, age > 50, age > 35], [3, 2, 1], 0)
+
+
+def bmi_points(bmi):
+    bmi = np.asarray(bmi)
+    return np.select([bmi < 18.5, bmi > 30, bmi > 25], [2, 3, 1], 0)
+
+
+def risk_score_batch(age, bmi, exercise, diet, sleep, stress, smoking, alcohol, family_count, symptom_count):
+    """Vectorized 0-10 risk score; lifestyle answers are option indices (arrays broadcast)"""
+    score = (
+        age_points(age)
+        + bmi_points(bmi)
+        + np.maximum(0, EXERCISE_POINTS[exercise])
+        + np.maximum(0, DIET_POINTS[diet])
+        + SLEEP_POINTS[sleep]
+        + STRESS_POINTS[stress]
+        + SMOKING_POINTS[smoking]
+        + ALCOHOL_POINTS[alcohol]
+        + np.asarray(family_count)
+        + np.asarray(symptom_count)
+    )
+    return np.clip(score, 0, 10)
+
+
+def classify_risk(risk_score):
+    """Return (risk_level, status_class, icon)"""
+    if risk_score <= 3:
+        return "Low", "success", "✅"
+    elif risk_score <= 6:
+        return "Moderate", "warning", "⚠️"
+    return "High", "error", "🚨"
+
+
+def bmi_category(bmi):
+    if bmi < 18.5:
+        return "Underweight"
+    elif bmi < 25:
+        return "Normal"
+    elif bmi < 30:
+        return "Overweight"
+    return "Obese"
+
+
+def profile_indices(profile):
+    """Option indices and counts used by risk_score_batch for a form profile"""
+    return {
+        'age': profile['age'],
+        'bmi': profile['weight'] / ((profile['height'] / 100) ** 2),
+        'exercise': EXERCISE_OPTIONS.index(profile['exercise']),
+        'diet': DIET_OPTIONS.index(profile['diet']),
+        'sleep': SLEEP_OPTIONS.index(profile['sleep']),
+        'stress': STRESS_OPTIONS.index(profile['stress']),
+        'smoking': SMOKING_OPTIONS.index(profile['smoking']),
+        'alcohol': ALCOHOL_OPTIONS.index(profile['alcohol']),
+        'family_count': len(profile['family_history']),
+        'symptom_count': len([s for s in profile['symptoms'] if s != "None"])
+    }
+
+
+def score_general_health(profile):
+    """Score a General Health Analysis form submission
+
+    Returns a dict with bmi, risk_score, risk_factors, risk_level, status_class,
+    icon and bmi_category.
+    """
+    indices = profile_indices(profile)
+    bmi, age = indices['bmi'], profile['age']
+    risk_score = int(risk_score_batch(**indices))
+
+    risk_factors = []
+    if age > 65:
+        risk_factors.append("Advanced age")
+    elif age > 50:
+        risk_factors.append("Middle age")
+    if bmi < 18.5:
+        risk_factors.append("Underweight")
+    elif bmi > 30:
+        risk_factors.append("Obesity")
+    elif bmi > 25:
+        risk_factors.append("Overweight")
+    if EXERCISE_POINTS[indices['exercise']] > 1:
+        risk_factors.append("Sedentary lifestyle")
+    if DIET_POINTS[indices['diet']] > 0:
+        risk_factors.append("Poor nutrition")
+    if SLEEP_POINTS[indices['sleep']] > 1:
+        risk_factors.append("Sleep deprivation")
+    if STRESS_POINTS[indices['stress']] > 0:
+        risk_factors.append("Elevated stress")
+    if SMOKING_POINTS[indices['smoking']] > 0:
+        risk_factors.append("Smoking history")
+    if ALCOHOL_POINTS[indices['alcohol']] > 0:
+        risk_factors.append("Heavy drinking")
+    if indices['family_count'] > 0:
+        risk_factors.append("Genetic predisposition")
+    if indices['symptom_count'] > 0:
+        risk_factors.append("Active symptoms")
+
+    risk_level, status_class, icon = classify_risk(risk_score)
+    return {
+        'bmi': bmi,
+        'risk_score': risk_score,
+        'risk_factors': risk_factors,
+        'risk_level': risk_level,
+        'status_class': status_class,
+        'icon': icon,
+        'bmi_category': bmi_category(bmi)
+    }
@@ -0,0 +1,185 @@
+"""AI Health Copilot - Batched what-if scoring for the heart and diabetes models"""
+
+import numpy as np
+
+# Clinically valid ranges, matching the form input bounds
+FEATURE_RANGES = {
+    'heart': {
+        'age': (20, 100),
+        'trestbps': (80, 200),
+        'chol': (100, 400),
+        'thalach': (60, 220),
+        'oldpeak': (0.0, 6.0)
+    },
+    'diabetes': {
+        'Glucose': (50, 300),
+        'BloodPressure': (40, 200),
+        'BMI': (15.0, 50.0),
+        'Insulin': (0, 900),
+        'Age': (18, 100)
+    }
+}
+
+FEATURE_LABELS = {
+    'age': "Age (years)",
+    'trestbps': "Resting Blood Pressure (mmHg)",
+    'chol': "Serum Cholesterol (mg/dL)",
+    'thalach': "Maximum Heart Rate",
+    'oldpeak': "ST Depression",
+    'fbs': "Fasting Blood Sugar > 120 mg/dL",
+    'Glucose': "Plasma Glucose (mg/dL)",
+    'BloodPressure': "Diastolic Blood Pressure (mmHg)",
+    'BMI': "Body Mass Index",
+    'Insulin': "2-Hour Serum Insulin (μU/mL)",
+    'Age': "Age (years)"
+}
+
+# (low/moderate, moderate/high) risk boundaries in percent, as used on the result pages
+RISK_THRESHOLDS = {'heart': (30, 70), 'diabetes': (25, 75), 'parkinsons': (30, 70)}
+
+
+def sweep_values(condition, feature, steps):
+    low, high = FEATURE_RANGES[condition][feature]
+    return np.linspace(low, high, steps)
+
+
+def perturbation_grid(row, feature_names, sweeps):
+    """Copies of `row` with each swept feature replaced, covering the full cartesian grid
+
+    `sweeps` maps feature name -> 1D array of values; the result has one row per
+    grid point, with the first feature varying slowest.
+    """
+    row = np.asarray(row, dtype=float)
+    axes = list(sweeps.values())
+    mesh = np.meshgrid(*axes, indexing='ij')
+    grid = np.tile(row, (mesh[0].size, 1))
+    for feature, values in zip(sweeps, mesh):
+        grid[:, feature_names.index(feature)] = values.ravel()
+    return grid
+
+
+def risk_curve(model, row, feature_names, condition, feature, steps=60):
+    """Risk (%) as one feature sweeps its range, scored in a single predict_proba call"""
+    values = sweep_values(condition, feature, steps)
+    grid = perturbation_grid(row, feature_names, {feature: values})
+    return values, model.predict_proba(grid)[:, 1] * 100
+
+
+def risk_surface(model, row, feature_names, condition, x_feature, y_feature, steps=30):
+    """Risk (%) over a two-feature grid; returns (x_values, y_values, Z[y, x])"""
+    x_values = sweep_values(condition, x_feature, steps)
+    y_values = sweep_values(condition, y_feature, steps)
+    grid = perturbation_grid(row, feature_names, {y_feature: y_values, x_feature: x_values})
+    risk = model.predict_proba(grid)[:, 1] * 100
+    return x_values, y_values, risk.reshape(len(y_values), len(x_values))
+
+
+# Features a person can realistically change, with the direction of improvement,
+# search step, largest change considered, a healthy bound never crossed, and how
+# many units count as one unit of effort when comparing changes across features
+MODIFIABLE_FEATURES = {
+    'heart': {
+        'trestbps': {'direction': -1, 'step': 5, 'max_change': 60, 'bound': 90, 'effort': 10},
+        'chol': {'direction': -1, 'step': 10, 'max_change': 150, 'bound': 120, 'effort': 20},
+        'thalach': {'direction': 1, 'step': 5, 'max_change': 50, 'bound': 200, 'effort': 10},
+        'fbs': {'direction': -1, 'step': 1, 'max_change': 1, 'bound': 0, 'effort': 1.5}
+    },
+    'diabetes': {
+        'Glucose': {'direction': -1, 'step': 5, 'max_change': 100, 'bound': 80, 'effort': 10},
+        'BMI': {'direction': -1, 'step': 0.5, 'max_change': 15, 'bound': 18.5, 'effort': 1},
+        'BloodPressure': {'direction': -1, 'step': 2, 'max_change': 30, 'bound': 60, 'effort': 5}
+    }
+}
+
+
+def _candidate_deltas(row, feature_names, condition, max_candidates):
+    """Per-feature change levels, coarsened until the full grid fits `max_candidates`"""
+    features, levels = [], []
+    for feature, spec in MODIFIABLE_FEATURES[condition].items():
+        current = row[feature_names.index(feature)]
+        room = (current - spec['bound']) if spec['direction'] < 0 else (spec['bound'] - current)
+        room = min(max(room, 0), spec['max_change'])
+        if room >= spec['step']:
+            features.append(feature)
+            levels.append(spec['step'] * np.arange(int(room // spec['step']) + 1) * spec['direction'])
+
+    while levels and np.prod([len(lv) for lv in levels]) > max_candidates:
+        # Keep the zero level and the extreme, drop every other step in the longest axis
+        longest = int(np.argmax([len(lv) for lv in levels]))
+        levels[longest] = np.unique(np.append(levels[longest][::2], levels[longest][-1]))
+    return features, levels
+
+
+def path_to_lower_risk(model, row, feature_names, condition, threshold=None,
+                       time_budget=0.5, batch_size=4096, max_candidates=200000):
+    """Smallest change to modifiable features that brings risk under the low-risk threshold
+
+    Candidates are scored in cost-ordered vectorized batches; the first batch with
+    a success contains the cheapest one, so the search stops there. Returns a dict
+    with `status` of "already_low", "found", "unreachable" or "timeout".
+    """
+    import time
+
+    started = time.perf_counter()
+    threshold = RISK_THRESHOLDS[condition][0] if threshold is None else threshold
+    row = np.asarray(row, dtype=float)
+    current_risk = float(model.predict_proba(row.reshape(1, -1))[0, 1] * 100)
+    result = {'threshold': threshold, 'current_risk': current_risk, 'changes': {}, 'evaluated': 1}
+
+    if current_risk < threshold:
+        return {**result, 'status': 'already_low', 'seconds': time.perf_counter() - started}
+
+    features, levels = _candidate_deltas(row, feature_names, condition, max_candidates)
+    if not features:
+        return {**result, 'status': 'unreachable', 'seconds': time.perf_counter() - started}
+    columns = [feature_names.index(f) for f in features]
+
+    # Prune: one batch of single-feature sweeps; features that never lower the risk
+    # on their own are dropped from the joint grid
+    singles = np.tile(row, (sum(len(lv) for lv in levels), 1))
+    offset = 0
+    for column, lv in zip(columns, levels):
+        singles[offset:offset + len(lv), column] += lv
+        offset += len(lv)
+    single_risk = model.predict_proba(singles)[:, 1] * 100
+    result['evaluated'] += len(singles)
+
+    keep, offset = [], 0
+    for i, lv in enumerate(levels):
+        if single_risk[offset:offset + len(lv)].min() < current_risk:
+            keep.append(i)
+        offset += len(lv)
+    if not keep:
+        return {**result, 'status': 'unreachable', 'seconds': time.perf_counter() - started}
+    features = [features[i] for i in keep]
+    columns = [columns[i] for i in keep]
+    levels = [levels[i] for i in keep]
+
+    mesh = np.meshgrid(*levels, indexing='ij')
+    deltas = np.stack([m.ravel() for m in mesh], axis=1)
+    efforts = np.array([MODIFIABLE_FEATURES[condition][f]['effort'] for f in features])
+    costs = (np.abs(deltas) / efforts).sum(axis=1)
+    order = np.argsort(costs, kind='stable')
+    deltas, costs = deltas[order], costs[order]
+
+    for start in range(1, len(deltas), batch_size):  # index 0 is "no change"
+        batch = deltas[start:start + batch_size]
+        grid = np.tile(row, (len(batch), 1))
+        grid[:, columns] += batch
+        risk = model.predict_proba(grid)[:, 1] * 100
+        result['evaluated'] += len(batch)
+
+        hits = np.flatnonzero(risk < threshold)
+        if hits.size:
+            best = hits[np.argmin(costs[start + hits])]
+            changes = {
+                feature: (float(row[column]), float(row[column] + batch[best, i]))
+                for i, (feature, column) in enumerate(zip(features, columns)) if batch[best, i] != 0
+            }
+            return {**result, 'status': 'found', 'changes': changes, 'new_risk': float(risk[best]),
+                    'effort': float(costs[start + best]), 'seconds': time.perf_counter() - started}
+
+        if time.perf_counter() - started > time_budget:
+            return {**result, 'status': 'timeout', 'seconds': time.perf_counter() - started}
+
+    return {**result, 'status': 'unreachable', 'seconds': time.perf_counter() - started}
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Latency-budgeted model selection
+
+Trains candidate variants per condition (smaller/shallower/pruned forests,
+histogram gradient boosting, logistic and kernel-approximation models),
+measures held-out AUC, single-row latency, batch throughput and serialized
+size, prints the accuracy-vs-latency Pareto set and picks the most accurate
+model within the declared budget. Datasets with several rows per subject
+(Parkinson's) are scored with subject-grouped cross-validation.
+
+    python select_models.py --latency-budget-ms 2 --size-budget-kb 2048 --publish
+"""
+
+import argparse
+import json
+import pickle
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+import ml_models
+
+CANDIDATE_SPECS = (
+    [{'kind': 'forest', 'params': {'n_estimators': n, 'max_depth': depth}}
+     for n in (10, 25, 50, 100) for depth in (None, 4, 8)]
+    + [{'kind': 'forest', 'params': {'n_estimators': 100, 'ccp_alpha': alpha}} for alpha in (0.002, 0.005)]
+    + [{'kind': 'forest', 'params': {'n_estimators': 50, 'min_samples_leaf': leaf}} for leaf in (5, 20)]
+    + [{'kind': 'hist_gb', 'params': {'max_iter': n, 'max_depth': depth}} for n in (50, 100) for depth in (3, None)]
+    + [{'kind': 'logistic', 'params': {'C': c}} for c in (0.1, 1.0)]
+    + [{'kind': 'kernel_approx', 'params': {'n_components': n, 'gamma': gamma, 'C': c}}
+       for n in (20, 50) for gamma in (0.002, 0.01) for c in (1.0, 10.0)]
+)
+
+
+def spec_label(spec):
+    params = ", ".join(f"{k}={v}" for k, v in spec['params'].items())
+    return f"{spec['kind']}({params})"
+
+
+def measure(spec, X, y, splits, latency_rows=200, batch_rows=10000):
+    """Fit one candidate on each split (ml_models.evaluation_splits) and measure quality and serving cost"""
+    test, proba, model = ml_models.held_out_proba(ml_models.build_model(spec), X, y, splits)
+    auc = roc_auc_score(y[test], proba)
+    X_test = X[splits[-1][1]]
+
+    rows = [X_test[i % len(X_test)].reshape(1, -1) for i in range(latency_rows)]
+    model.predict_proba(rows[0])  # warm-up
+    timings = []
+    for row in rows:
+        started = time.perf_counter()
+        model.predict_proba(row)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    batch = np.resize(X_test, (batch_rows, X_test.shape[1]))
+    started = time.perf_counter()
+    model.predict_proba(batch)
+    throughput = batch_rows / (time.perf_counter() - started)
+
+    return {
+        'spec': spec,
+        'auc': round(float(auc), 4),
+        'p50_ms': round(timings[len(timings) // 2], 4),
+        'p99_ms': round(timings[int(0.99 * (len(timings) - 1))], 4),
+        'rows_per_second': round(throughput),
+        'size_kb': round(len(pickle.dumps(model)) / 1024, 1)
+    }
+
+
+def pareto_front(results):
+    """Candidates no other candidate beats on both AUC and p50 latency"""
+    front, best_auc = [], -1.0
+    for result in sorted(results, key=lambda r: (r['p50_ms'], -r['auc'])):
+        if result['auc'] > best_auc:
+            front.append(result)
+            best_auc = result['auc']
+    return front
+
+
+def choose(results, latency_budget_ms=None, size_budget_kb=None):
+    """Most accurate candidate within the budgets (faster wins ties)
+
+    Filters every candidate, not just the Pareto set: that set ignores size, so
+    a small model beaten only by one over the size budget must stay eligible.
+    """
+    eligible = [
+        r for r in results
+        if (latency_budget_ms is None or r['p50_ms'] <= latency_budget_ms)
+        and (size_budget_kb is None or r['size_kb'] <= size_budget_kb)
+    ]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r['auc'], -r['p50_ms']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pick the most accurate model under a latency/memory budget")
+    parser.add_argument('--condition', choices=['heart', 'diabetes', 'parkinsons'], action='append',
+                        help="condition to select for (default: all)")
+    parser.add_argument('--latency-budget-ms', type=float, default=None, help="max p50 single-row latency")
+    parser.add_argument('--size-budget-kb', type=float, default=None, help="max serialized model size")
+    parser.add_argument('--test-size', type=float, default=0.25)
+    parser.add_argument('--publish', action='store_true', help=f"write the choice to {ml_models.SELECTION_FILE.name}")
+    parser.add_argument('--output', default=str(ml_models.SELECTION_FILE))
+    args = parser.parse_args(argv)
+
+    data = ml_models.load_health_datasets()
+    groups = ml_models.load_dataset_groups()
+    conditions = args.condition or [c for c in ('heart', 'diabetes', 'parkinsons') if c in data]
+    selection = {'selected_at': datetime.now().isoformat(timespec='seconds'),
+                 'budget': {'latency_ms': args.latency_budget_ms, 'size_kb': args.size_budget_kb},
+                 'conditions': {}}
+
+    print("🎯 Latency-budgeted model selection")
+    print("=" * 88)
+    for condition in conditions:
+        X, y = data[condition]
+        X, y = X.to_numpy(dtype=float), y.to_numpy()
+        splits = ml_models.evaluation_splits(X, y, groups.get(condition), test_size=args.test_size)
+
+        results = [measure(spec, X, y, splits) for spec in CANDIDATE_SPECS]
+        front = pareto_front(results)
+        chosen = choose(results, args.latency_budget_ms, args.size_budget_kb)
+
+        scoring = f"subject-grouped {len(splits)}-fold CV" if condition in groups else f"{args.test_size:.0%} holdout"
+        print(f"\n{condition.title()}  (★ Pareto-optimal, ✅ chosen; AUC from {scoring})")
+        print(f"{'candidate':<52}{'AUC':>7}{'p50 ms':>9}{'p99 ms':>9}{'rows/s':>10}{'KB':>9}")
+        for result in sorted(results, key=lambda r: r['p50_ms']):
+            mark = "✅" if result is chosen else ("★ " if result in front else "  ")
+            print(f"{mark}{spec_label(result['spec']):<50}{result['auc']:>7.3f}{result['p50_ms']:>9.3f}"
+                  f"{result['p99_ms']:>9.3f}{result['rows_per_second']:>10}{result['size_kb']:>9.1f}")
+
+        if chosen is None:
+            print("❌ No candidate fits the budget - keeping the current model")
+            continue
+        selection['conditions'][condition] = {**chosen, 'selected_at': selection['selected_at'],
+                                              'budget': selection['budget'], 'pareto': front}
+
+    if args.publish and selection['conditions']:
+        # Conditions not selected in this run keep their published choice
+        try:
+            with open(args.output, encoding='utf-8') as f:
+                published = json.load(f).get('conditions', {})
+        except (OSError, ValueError):
+            published = {}
+        selection['conditions'] = {**published, **selection['conditions']}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(selection, f, indent=2)
+        print(f"\n📝 Published to {args.output} - the app trains these models on its next retrain")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
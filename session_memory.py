@@ -0,0 +1,136 @@
+"""AI Health Copilot - Per-session memory accounting and eviction of stored results
+
+After every full rerun the session's st.session_state is measured key by key
+and recorded in a process-wide SessionMemory, which backs the operator's
+"top sessions" table. When a session is over its budget, the stored results
+of the pages it used least recently are dropped - LLM advice, report figures,
+cohort previews - until it fits again. Results go page by page so no page is
+left half-populated; widget values, identifiers and the page being shown are
+never touched.
+
+Budgets apply when a session reruns: Streamlit gives no safe way to reach
+into another session's state, so an idle session keeps what it has until
+its next rerun or until Streamlit discards it.
+"""
+
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+# Keys holding a page's stored results: f"{page}{suffix}"
+STORED_SUFFIXES = ('_input', '_profile', '_result', '_assessment', '_risk_path', '_risk_path_key', '_key', '_batch')
+PAGES = ('general', 'heart', 'diabetes', 'parkinsons', 'tips', 'cohort')
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by `obj` and what it references; objects in `seen` are not counted again"""
+    seen = set() if seen is None else seen
+    total, stack = 0, [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            continue
+        seen.add(id(item))
+        if hasattr(item, 'memory_usage') and hasattr(item, 'columns'):  # pandas DataFrame
+            total += int(item.memory_usage(deep=True).sum())
+            continue
+        total += sys.getsizeof(item)  # numpy arrays owning their data include it here
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__') and not isinstance(item, (str, bytes)):
+            stack.append(vars(item))
+    return total
+
+
+def stored_keys(state, page):
+    return [page + suffix for suffix in STORED_SUFFIXES if page + suffix in state]
+
+
+class SessionMemory:
+    """Process-wide record of what each session keeps, with the budget each one gets
+
+    A session may hold `session_limit` bytes, or its fair share of
+    `process_limit` when the tracked sessions together are over that.
+    Sessions not seen for `idle_seconds` are forgotten.
+    """
+
+    def __init__(self, session_limit=16 * 1024 * 1024, process_limit=512 * 1024 * 1024,
+                 idle_seconds=3600, max_sessions=10000):
+        self.session_limit = session_limit
+        self.process_limit = process_limit
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()  # session id -> record, least recently seen first
+        self.total_bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.lock = threading.Lock()
+
+    def _forget_idle(self, now):
+        while self.sessions:
+            session_id, record = next(iter(self.sessions.items()))
+            if record['updated'] > now - self.idle_seconds and len(self.sessions) <= self.max_sessions:
+                break
+            self.total_bytes -= self.sessions.pop(session_id)['bytes']
+
+    def limit(self, session_id):
+        """Bytes this session may keep right now"""
+        with self.lock:
+            own = self.sessions[session_id]['bytes'] if session_id in self.sessions else 0
+            others = self.total_bytes - own
+            if others + self.session_limit <= self.process_limit:
+                return self.session_limit
+            return min(self.session_limit, self.process_limit // (len(self.sessions) + 1))
+
+    def account(self, session_id, state, page):
+        """Measure `state` after a rerun of `page`, evicting least recently used page results if over budget
+
+        Returns the pages whose results were dropped.
+        """
+        now = time.time()
+        with self.lock:
+            record = self.sessions.get(session_id) or {'pages': {}, 'evictions': 0}
+            record['pages'][page] = now
+        seen = set()
+        sizes = {key: deep_size(state[key], seen) for key in list(state.keys())}
+        limit = self.limit(session_id)
+
+        evicted = []
+        candidates = sorted((p for p in PAGES if p != page and stored_keys(state, p)),
+                            key=lambda p: record['pages'].get(p, 0))
+        for victim in candidates:
+            if sum(sizes.values()) <= limit:
+                break
+            freed = 0
+            for key in stored_keys(state, victim):
+                del state[key]
+                freed += sizes.pop(key, 0)
+            evicted.append(victim)
+            with self.lock:
+                self.evictions += 1
+                self.evicted_bytes += freed
+            record['evictions'] += 1
+
+        largest = max(sizes, key=sizes.get, default=None)
+        with self.lock:
+            self.total_bytes += sum(sizes.values()) - record.get('bytes', 0)
+            record.update(bytes=sum(sizes.values()), keys=len(sizes), largest=largest,
+                          largest_bytes=sizes.get(largest, 0), page=page, updated=now, limit=limit)
+            self.sessions[session_id] = record
+            self.sessions.move_to_end(session_id)
+            self._forget_idle(now)
+        return evicted
+
+    def total(self):
+        return self.total_bytes
+
+    def top(self, n=10):
+        """The `n` largest sessions: [(session id, record)], largest first"""
+        with self.lock:
+            ranked = sorted(self.sessions.items(), key=lambda item: item[1]['bytes'], reverse=True)[:n]
+            return [(session_id, dict(record, pages=dict(record['pages']))) for session_id, record in ranked]
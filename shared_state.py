@@ -0,0 +1,310 @@
+"""AI Health Copilot - Cache and counter backends shared between app replicas
+
+Three operations cover everything the app shares: a key/value cache with
+expiry (LLM responses), atomic counter increments grouped in hashes
+(dashboard aggregates) and an atomic token bucket (rate limits). Backends:
+
+- MemoryBackend: this process only (the default, same as before)
+- SQLiteBackend: one database file, shared by every replica that can reach it
+  (same host or a shared volume)
+- RedisBackend: any Redis-protocol server (needs the `redis` package)
+
+Values must be JSON-serializable. Time is wall-clock so replicas agree.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+PURGE_PROBABILITY = 0.01  # expired rows are cleaned up on about 1 in 100 writes
+
+
+def _refill(tokens, updated, rate, capacity, now):
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _take(tokens, requested, capacity):
+    """(allowed, tokens left); a negative request is a refund"""
+    if requested <= 0:
+        return True, min(capacity, tokens - requested)
+    if tokens >= requested:
+        return True, tokens - requested
+    return False, tokens
+
+
+class MemoryBackend:
+    """In-process backend: nothing is shared with other replicas"""
+
+    shared = False
+    name = "memory"
+    error = None  # why a configured shared backend could not be used
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.values = OrderedDict()  # key -> (value, expires)
+        self.hashes = {}  # key -> [Counter, expires]
+        self.buckets = {}  # key -> [tokens, updated]
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.values.get(key)
+            if item is None:
+                return None
+            if item[1] is not None and item[1] <= time.time():
+                del self.values[key]
+                return None
+            self.values.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.values[key] = (value, time.time() + ttl if ttl else None)
+            self.values.move_to_end(key)
+            while len(self.values) > self.max_entries:
+                self.values.popitem(last=False)
+
+    def increment(self, updates):
+        """Atomically add to counters: `updates` is [(key, {field: amount}, ttl or None)]"""
+        now = time.time()
+        with self.lock:
+            for key, amounts, ttl in updates:
+                entry = self.hashes.setdefault(key, [Counter(), None])
+                entry[0].update(amounts)
+                entry[1] = now + ttl if ttl else None
+            if random.random() < PURGE_PROBABILITY:
+                for key in [k for k, (_, expires) in self.hashes.items() if expires and expires <= now]:
+                    del self.hashes[key]
+
+    def counters(self, keys):
+        """{key: {field: value}} for the requested keys (missing or expired keys are empty)"""
+        now = time.time()
+        with self.lock:
+            result = {}
+            for key in keys:
+                entry = self.hashes.get(key)
+                result[key] = dict(entry[0]) if entry and not (entry[1] and entry[1] <= now) else {}
+            return result
+
+    def take(self, key, rate, capacity, tokens=1):
+        """Token bucket: take `tokens` if available (negative refunds); returns whether it was allowed"""
+        now = time.time()
+        with self.lock:
+            state = self.buckets.get(key)
+            current = capacity if state is None else _refill(state[0], state[1], rate, capacity, now)
+            allowed, left = _take(current, tokens, capacity)
+            self.buckets[key] = [left, now]
+            if random.random() < PURGE_PROBABILITY:
+                # A bucket untouched for a day is full again; forgetting it changes nothing
+                for old in [k for k, (_, updated) in self.buckets.items() if updated <= now - 86400]:
+                    del self.buckets[old]
+            return allowed
+
+
+class SQLiteBackend:
+    """Backend in one SQLite file (WAL mode); every process opening the file shares it"""
+
+    shared = True
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL);
+        CREATE TABLE IF NOT EXISTS counters (key TEXT NOT NULL, field TEXT NOT NULL, value REAL NOT NULL,
+                                             expires REAL, PRIMARY KEY (key, field));
+        CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL);
+    """
+
+    def __init__(self, path, timeout=5.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self.local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        """This thread's connection, in autocommit mode"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value FROM kv WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                                   (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                         (key, json.dumps(value), now + ttl if ttl else None))
+            if random.random() < PURGE_PROBABILITY:
+                conn.execute("DELETE FROM kv WHERE expires <= ?", (now,))
+
+    def increment(self, updates):
+        now = time.time()
+        rows = [(key, str(field), amount, now + ttl if ttl else None)
+                for key, amounts, ttl in updates for field, amount in amounts.items()]
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO counters (key, field, value, expires) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key, field) DO UPDATE SET value = value + excluded.value, expires = excluded.expires",
+                rows)
+            if random.random() < PURGE_PROBABILITY:
+                conn.execute("DELETE FROM counters WHERE expires <= ?", (now,))
+
+    def counters(self, keys):
+        keys = list(keys)
+        result = {key: {} for key in keys}
+        for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            batch = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT key, field, value FROM counters WHERE key IN ({','.join('?' * len(batch))}) "
+                "AND (expires IS NULL OR expires > ?)", (*batch, time.time()))
+            for key, field, value in rows:
+                result[key][field] = value
+        return result
+
+    def take(self, key, rate, capacity, tokens=1):
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            current = capacity if row is None else _refill(row[0], row[1], rate, capacity, now)
+            allowed, left = _take(current, tokens, capacity)
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, left, now))
+            if random.random() < PURGE_PROBABILITY:
+                # A bucket untouched for a day is full again; forgetting it changes nothing
+                conn.execute("DELETE FROM buckets WHERE updated <= ?", (now - 86400,))
+        return allowed
+
+
+class _Transaction:
+    """`with` block running as one IMMEDIATE transaction (writers serialize, readers never block)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class RedisBackend:
+    """Backend on a Redis-protocol server; the token bucket runs as a Lua script"""
+
+    shared = True
+    name = "redis"
+
+    TAKE_SCRIPT = """
+        local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local rate, capacity, requested, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+        local tokens = tonumber(state[1]) or capacity
+        local updated = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        local allowed = 0
+        if requested <= 0 then
+            tokens = math.min(capacity, tokens - requested)
+            allowed = 1
+        elseif tokens >= requested then
+            tokens = tokens - requested
+            allowed = 1
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+        redis.call('EXPIRE', KEYS[1], 86400)
+        return allowed
+    """
+
+    def __init__(self, url, timeout=2.0):
+        import redis  # optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.client.ping()
+        self._take = self.client.register_script(self.TAKE_SCRIPT)
+
+    def get(self, key):
+        value = self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, json.dumps(value), ex=int(ttl) if ttl else None)
+
+    def increment(self, updates):
+        pipe = self.client.pipeline(transaction=True)
+        for key, amounts, ttl in updates:
+            for field, amount in amounts.items():
+                pipe.hincrbyfloat(key, str(field), amount)
+            if ttl:
+                pipe.expire(key, int(ttl))
+        pipe.execute()
+
+    def counters(self, keys):
+        keys = list(keys)
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return {key: {field.decode(): float(value) for field, value in values.items()}
+                for key, values in zip(keys, pipe.execute())}
+
+    def take(self, key, rate, capacity, tokens=1):
+        return bool(self._take(keys=[key], args=[rate, capacity, tokens, time.time()]))
+
+
+class Namespaced:
+    """Prefixes every key, so several apps or environments can share one store"""
+
+    def __init__(self, backend, prefix):
+        self.backend = backend
+        self.prefix = prefix
+        self.shared = backend.shared
+        self.name = backend.name
+        self.error = None
+
+    def get(self, key):
+        return self.backend.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(self.prefix + key, value, ttl)
+
+    def increment(self, updates):
+        self.backend.increment([(self.prefix + key, amounts, ttl) for key, amounts, ttl in updates])
+
+    def counters(self, keys):
+        keys = list(keys)
+        found = self.backend.counters([self.prefix + key for key in keys])
+        return {key: found[self.prefix + key] for key in keys}
+
+    def take(self, key, rate, capacity, tokens=1):
+        return self.backend.take(self.prefix + key, rate, capacity, tokens)
+
+
+def backend_from_config(secrets):
+    """Backend chosen by `[cache] backend`; falls back to memory (with `error` set) when the store is unusable"""
+    from config import get_setting
+
+    kind = get_setting('cache', 'backend', 'memory', env='CACHE_BACKEND', secrets=secrets)
+    prefix = get_setting('cache', 'namespace', 'health_copilot:', secrets=secrets)
+    try:
+        if kind == 'sqlite':
+            backend = SQLiteBackend(get_setting('cache', 'path', 'shared_cache.sqlite', env='CACHE_PATH',
+                                                secrets=secrets))
+        elif kind == 'redis':
+            backend = RedisBackend(get_setting('cache', 'url', 'redis://localhost:6379/0', env='CACHE_URL',
+                                               secrets=secrets))
+        else:
+            return MemoryBackend()
+    except Exception as e:
+        fallback = MemoryBackend()
+        fallback.error = f"{kind} backend unavailable ({e}); using in-process caches"
+        return fallback
+    return Namespaced(backend, prefix)
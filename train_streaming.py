@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""AI Health Copilot - Out-of-core training for labeled sets larger than memory
+
+Streams a CSV or Parquet file in fixed-size chunks, so memory is bounded by
+the chunk size (plus a fixed-size sample for the gradient boosting mode)
+whatever the file size:
+
+- logistic: StandardScaler and SGD logistic regression fitted with
+  partial_fit, one pass for the scaler and `--epochs` passes for the model
+- naive_bayes: GaussianNB fitted with partial_fit in one pass
+- hist_gb: HistGradientBoostingClassifier on a uniform reservoir sample of
+  at most `--sample-rows` rows
+
+Every `--validation-every`-th row is held out and scored with a streaming,
+histogram-based AUC. Reports throughput and peak RSS. `--publish CONDITION`
+hands the model to the serving registry: it is written to the streamed
+models directory and replaces that condition's model on the app's next
+start, as a new registry version evaluated on the bundled dataset.
+
+    python train_streaming.py big_diabetes.csv --target Outcome --kind logistic --output diabetes_sgd.pkl
+    python train_streaming.py big_diabetes.csv --target Outcome --kind logistic --publish diabetes
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import ml_models
+from process_stats import peak_rss_mb
+
+CHUNK_ROWS = 50_000
+SAMPLE_ROWS = 200_000
+KINDS = ('logistic', 'naive_bayes', 'hist_gb')
+
+
+def iter_chunks(path, target, chunk_rows=CHUNK_ROWS, drop=()):
+    """Yield (X, y, feature names) per chunk of a CSV or Parquet file; X is float64"""
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Reading Parquet files needs pyarrow (pip install pyarrow)") from None
+        frames = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows))
+    else:
+        frames = pd.read_csv(path, chunksize=chunk_rows)
+
+    for frame in frames:
+        if target not in frame:
+            raise ValueError(f"Target column '{target}' not found")
+        features = [c for c in frame.columns if c != target and c not in drop]
+        yield frame[features].to_numpy(dtype=float), frame[target].to_numpy(), features
+
+
+class StreamingAUC:
+    """ROC AUC from fixed-width score histograms per class (exact up to the bin width)"""
+
+    def __init__(self, bins=1000):
+        self.bins = bins
+        self.positive = np.zeros(bins, dtype=np.int64)
+        self.negative = np.zeros(bins, dtype=np.int64)
+        self.correct = 0
+
+    def update(self, y_true, proba):
+        index = np.minimum((proba * self.bins).astype(int), self.bins - 1)
+        self.positive += np.bincount(index[y_true == 1], minlength=self.bins)
+        self.negative += np.bincount(index[y_true != 1], minlength=self.bins)
+        self.correct += int(((proba >= 0.5) == (y_true == 1)).sum())
+
+    @property
+    def count(self):
+        return int(self.positive.sum() + self.negative.sum())
+
+    def auc(self):
+        n_pos, n_neg = self.positive.sum(), self.negative.sum()
+        if not n_pos or not n_neg:
+            return None
+        # Negatives ranked below each positive bin, ties counted half
+        below = np.cumsum(self.negative) - self.negative
+        return float((self.positive * (below + 0.5 * self.negative)).sum() / (n_pos * n_neg))
+
+    def accuracy(self):
+        return self.correct / self.count if self.count else None
+
+
+def _split(y, offset, validation_every):
+    """Boolean mask of held-out rows, decided by global row number so every pass agrees"""
+    return (np.arange(offset, offset + len(y)) % validation_every) == 0
+
+
+def _reservoir_update(reservoir, seen, X, y, rng):
+    """Algorithm R over a chunk: keep a uniform sample of everything seen so far"""
+    X_res, y_res = reservoir
+    size = len(X_res)
+    filled = min(max(size - seen, 0), len(X))  # rows that still fit while the reservoir fills up
+    if filled and seen < size:
+        X_res[seen:seen + filled], y_res[seen:seen + filled] = X[:filled], y[:filled]
+    positions = rng.integers(0, np.arange(seen + filled, seen + len(X)) + 1)
+    keep = positions < size
+    X_res[positions[keep]], y_res[positions[keep]] = X[filled:][keep], y[filled:][keep]
+
+
+def train_streaming(path, target, kind='logistic', chunk_rows=CHUNK_ROWS, epochs=3, validation_every=10,
+                    sample_rows=SAMPLE_ROWS, drop=(), progress=None):
+    """Fit a model without loading the file; returns (model, features, report)"""
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind: {kind}")
+    rng = np.random.default_rng(42)
+    started = time.perf_counter()
+    rows_processed = 0  # over all passes, for throughput
+
+    def passes():
+        """One pass over the file: (features, training X, training y, held-out X, held-out y) per chunk"""
+        nonlocal rows_processed
+        offset = 0
+        for number, (X, y, features) in enumerate(iter_chunks(path, target, chunk_rows, drop)):
+            held_out = _split(y, offset, validation_every)
+            offset += len(y)
+            rows_processed += len(y)
+            if progress:
+                progress(number, offset)
+            yield features, X[~held_out], y[~held_out], X[held_out], y[held_out]
+
+    # Pass 1: feature scaling, class labels, row counts (and the whole fit for naive Bayes / the sample)
+    scaler = StandardScaler()
+    classes, total_rows, features, seen = set(), 0, None, 0
+    nb = GaussianNB() if kind == 'naive_bayes' else None
+    reservoir = None
+    for features, X, y, X_held, _ in passes():
+        total_rows += len(y) + len(X_held)
+        if not len(y):
+            continue
+        scaler.partial_fit(X)
+        classes.update(np.unique(y).tolist())
+        if nb is not None:
+            nb.partial_fit(X, y, classes=[0, 1])
+        if kind == 'hist_gb':
+            if reservoir is None:
+                reservoir = (np.empty((sample_rows, X.shape[1])), np.empty(sample_rows, dtype=y.dtype))
+            _reservoir_update(reservoir, seen, X, y, rng)
+        seen += len(y)
+    if seen == 0:
+        raise ValueError("The file has no training rows")
+    if not classes <= {0, 1}:
+        raise ValueError(f"Target must be 0/1, found {sorted(classes)}")
+
+    if kind == 'logistic':
+        sgd = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42)
+        for _ in range(epochs):
+            for _, X, y, _, _ in passes():
+                if len(y):
+                    order = rng.permutation(len(y))
+                    sgd.partial_fit(scaler.transform(X[order]), y[order], classes=[0, 1])
+        model = Pipeline([('scale', scaler), ('model', sgd)])
+    elif kind == 'naive_bayes':
+        model = nb
+    else:
+        kept = min(seen, sample_rows)
+        model = HistGradientBoostingClassifier(random_state=42).fit(reservoir[0][:kept], reservoir[1][:kept])
+
+    # Final pass: streaming validation on the held-out rows
+    validation = StreamingAUC()
+    for _, _, _, X, y in passes():
+        if len(y):
+            validation.update(y, model.predict_proba(X)[:, 1])
+
+    seconds = time.perf_counter() - started
+    report = {
+        'kind': kind,
+        'rows': total_rows,
+        'train_rows': seen,
+        'validation_rows': validation.count,
+        'sample_rows': min(seen, sample_rows) if kind == 'hist_gb' else None,
+        'auc': validation.auc(),
+        'accuracy': validation.accuracy(),
+        'seconds': round(seconds, 2),
+        'rows_per_second': round(rows_processed / seconds),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'size_kb': round(len(pickle.dumps(model)) / 1024, 1)
+    }
+    return model, features, report
+
+
+def publish(model, features, report, condition, directory=ml_models.STREAMED_DIR):
+    """Write the model where the registry serves it for `condition`; returns the path
+
+    The app's forms and the bundled dataset fix the column order, so the
+    model must have been trained on exactly those columns.
+    """
+    data = ml_models.load_health_datasets()
+    if condition not in data:
+        raise ValueError(f"No {condition} dataset next to the app to serve this model against")
+    expected = data[condition][0].columns.tolist()
+    if features != expected:
+        raise ValueError(f"A {condition} model must use the columns {', '.join(expected)} in this order "
+                         f"(use --drop for any others); this one has {', '.join(features)}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{condition}.pkl"
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(pickle.dumps({'model': model, 'features': features, 'report': report}))
+    tmp.replace(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train a risk model by streaming a labeled file in chunks")
+    parser.add_argument('path', help="CSV or Parquet file with feature columns and a 0/1 target column")
+    parser.add_argument('--target', required=True, help="label column, e.g. Outcome or target")
+    parser.add_argument('--kind', choices=KINDS, default='logistic')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--epochs', type=int, default=3, help="SGD passes over the file (logistic)")
+    parser.add_argument('--sample-rows', type=int, default=SAMPLE_ROWS, help="reservoir size (hist_gb)")
+    parser.add_argument('--validation-every', type=int, default=10, help="hold out every N-th row")
+    parser.add_argument('--drop', action='append', default=[], help="non-feature column to ignore (repeatable)")
+    parser.add_argument('--output', help="pickle {'model', 'features', 'report'} here")
+    parser.add_argument('--publish', choices=('diabetes', 'heart', 'parkinsons'), metavar='CONDITION',
+                        help="serve the model for this condition (diabetes, heart or parkinsons) from the next retrain")
+    parser.add_argument('--streamed-dir', default=str(ml_models.STREAMED_DIR),
+                        help="where published models go (the app's [models] streamed_dir)")
+    args = parser.parse_args(argv)
+
+    print(f"🌊 Streaming {args.kind} training on {args.path} ({args.chunk_rows:,}-row chunks)")
+    try:
+        model, features, report = train_streaming(
+            args.path, args.target, args.kind, args.chunk_rows, args.epochs, args.validation_every,
+            args.sample_rows, tuple(args.drop),
+            progress=lambda number, rows: print(f"\r   {rows:,} rows", end="", flush=True))
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return 1
+
+    print(f"\n\n{'features':<18}{len(features)}")
+    for key, value in report.items():
+        if isinstance(value, float):
+            print(f"{key:<18}{value:,.4g}")
+        elif value is not None:
+            print(f"{key:<18}{value:,}" if isinstance(value, int) else f"{key:<18}{value}")
+    if args.output:
+        with open(args.output, 'wb') as f:
+            pickle.dump({'model': model, 'features': features, 'report': report}, f)
+        print(f"\n📝 Saved to {args.output}")
+    if args.publish:
+        try:
+            path = publish(model, features, report, args.publish, args.streamed_dir)
+        except ValueError as e:
+            print(f"\n❌ Not published: {e}")
+            return 1
+        print(f"\n🚀 Published to {path} - the app serves it for {args.publish} from its next retrain")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())